@@ -0,0 +1,49 @@
+"""Run the benchmark suite, or compare two result files.
+
+    python -m benchmarks [-o results.json] [-k model.] [--compare baseline.json] [--threshold 0.1]
+    python -m benchmarks compare baseline.json results.json [--threshold 0.1]
+"""
+import argparse
+import sys
+
+from benchmarks import harness
+
+
+def report_regressions(baseline, current, threshold):
+    regressions = harness.compare(baseline, current, threshold)
+    for r in regressions:
+        print(f"REGRESSION {r.name}: {r.baseline:.4g} -> {r.current:.4g} (+{r.change:.1%})")
+    if not regressions:
+        print(f"no regressions over {threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['compare']:
+        parser = argparse.ArgumentParser(prog='python -m benchmarks compare')
+        parser.add_argument('baseline')
+        parser.add_argument('current')
+        parser.add_argument('--threshold', type=float, default=0.10, help="allowed slowdown ratio (default 0.10)")
+        args = parser.parse_args(argv[1:])
+        return report_regressions(harness.load(args.baseline), harness.load(args.current), args.threshold)
+
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__.splitlines()[0])
+    parser.add_argument('-o', '--output', help="write results as JSON")
+    parser.add_argument('-k', dest='pattern', help="only run benchmarks whose name contains this text")
+    parser.add_argument('--compare', metavar='BASELINE', help="flag regressions against a previous result file")
+    parser.add_argument('--threshold', type=float, default=0.10, help="allowed slowdown ratio (default 0.10)")
+    args = parser.parse_args(argv)
+
+    for suite, error in harness.load_suites().items():
+        print(f"skipping {suite}: {error}", file=sys.stderr)
+    report = harness.run(args.pattern, log=print)
+    if args.output:
+        harness.save(report, args.output)
+    if args.compare:
+        return report_regressions(harness.load(args.compare), report, args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""Batch evaluation time per row with one worker and with one worker per core."""
+import atexit
+import io
+import os
+import random
+import tempfile
+
+from benchmarks.harness import benchmark
+from src.batch import evaluate_file
+
+ROWS = 200_000
+CHUNK_SIZE = 256 << 10
+
+_path = None
+
+
+def _input():
+    # A CSV of ROWS distinct expressions, written once per run
+    global _path
+    if _path is None:
+        rng = random.Random(1)
+        fd, _path = tempfile.mkstemp(suffix='.csv')
+        atexit.register(os.remove, _path)
+        with os.fdopen(fd, 'w') as f:
+            f.write("id,expression\n")
+            for i in range(ROWS):
+                f.write(f"{i},{rng.randrange(10**6)} × {rng.randrange(1000)} + {rng.randrange(10**4)}.5 =\n")
+    return _path
+
+
+class _Null(io.RawIOBase):
+    def write(self, data):
+        return len(data)
+
+
+def _seconds_per_row(workers):
+    stats = evaluate_file(_input(), _Null(), workers=workers, chunk_size=CHUNK_SIZE)
+    return stats.elapsed / stats.rows
+
+
+@benchmark('batch.row_1_worker')
+def one_worker():
+    return _seconds_per_row(1)
+
+
+@benchmark('batch.row_all_cores')
+def all_cores():
+    # Scales with the core count when each worker gets several chunks
+    return _seconds_per_row(os.cpu_count() or 1)
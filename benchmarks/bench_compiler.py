@@ -0,0 +1,45 @@
+"""Repeated evaluation of the same keystroke sequences, interpreted vs compiled.
+
+    python -m benchmarks.bench_compiler [--runs 200000]
+"""
+import argparse
+import time
+
+from src.logic import CalculatorModel
+from src.keys import apply_keys, tokenize
+from src.compiler import KeystrokeCompiler
+
+SEQUENCES = ["12 × 3 + 4 =", "2 + 3 × 4 =", "1234.5 ÷ 7 − 0.25 =", "99 +/- × 3 % =", "5 + + × 8 = = AC 7 × 6 ="]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    tokenized = [tokenize(s) for s in SEQUENCES]
+    start = time.perf_counter()
+    for i in range(args.runs):
+        apply_keys(CalculatorModel(), tokenized[i % len(tokenized)])
+    interpreted = time.perf_counter() - start
+
+    compiler = KeystrokeCompiler()
+    start = time.perf_counter()
+    for i in range(args.runs):
+        compiler.compile(SEQUENCES[i % len(SEQUENCES)]).run(CalculatorModel())
+    executed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(args.runs):
+        compiler.evaluate(SEQUENCES[i % len(SEQUENCES)])
+    compiled = time.perf_counter() - start
+
+    print(f"{args.runs} evaluations of {len(SEQUENCES)} sequences")
+    print(f"  per-key model calls   {interpreted / args.runs * 1e6:7.2f} us/sequence")
+    print(f"  compiled program run  {executed / args.runs * 1e6:7.2f} us/sequence  ({interpreted / executed:.1f}x)")
+    print(f"  cached fresh result   {compiled / args.runs * 1e6:7.2f} us/sequence  ({interpreted / compiled:.1f}x)")
+    print(f"  {compiler.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""How long an expensive operation blocks the caller inline and when sent to a worker."""
+import threading
+import time
+
+from benchmarks.harness import benchmark, measure
+from src.evaluator import WorkerProcess, run_job
+from src.logic import CalculatorModel, Operation
+from src.precision import FractionEngine
+
+DIGITS = 60_000  # about 200k bits, styles.WORKER_MIN_BITS
+
+
+def _model():
+    # A pending huge fraction times another: DIGITS digits ÷ 7 × the same entry
+    model = CalculatorModel(FractionEngine())
+    model.input_digits("9876543210" * (DIGITS // 10))
+    model.set_operation(Operation.DIVIDE)
+    model.input_digit("7")
+    model.set_operation(Operation.MULTIPLY)
+    model.input_digits("1234567890" * (DIGITS // 10))
+    return model
+
+
+@benchmark('evaluator.inline_block')
+def inline_block():
+    # The whole operation, including formatting the result, on the calling thread
+    model = _model()
+    state = model.snapshot()
+    return measure(lambda: run_job(model.engine, state, 'calculate', ()), repeat=3, min_time=0)
+
+
+class _Roundtrip:
+    def __init__(self):
+        self.done = threading.Event()
+        self.worker = WorkerProcess(lambda job_id, result: self.done.set())
+
+
+@benchmark('evaluator.offload_block')
+def offload_block():
+    # Time the caller spends submitting the same operation to a running worker
+    model = _model()
+    roundtrip = _Roundtrip()
+    try:
+        roundtrip.worker.submit(0, model.engine, CalculatorModel().snapshot(), 'reset')  # start it
+        roundtrip.done.wait()
+        timings = []
+        for job_id in range(1, 4):
+            roundtrip.done.clear()
+            start = time.perf_counter()
+            roundtrip.worker.submit(job_id, model.engine, model.snapshot(), 'calculate')
+            timings.append(time.perf_counter() - start)
+            roundtrip.done.wait()
+        return min(timings)
+    finally:
+        roundtrip.worker.close()
+
+
+@benchmark('evaluator.cancel')
+def cancel():
+    # AC while a job runs: kill the worker and reap it
+    model = _model()
+    roundtrip = _Roundtrip()
+    timings = []
+    for job_id in range(3):
+        roundtrip.worker.submit(job_id, model.engine, model.snapshot(), 'calculate')
+        start = time.perf_counter()
+        roundtrip.worker.cancel()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
@@ -0,0 +1,31 @@
+"""Per-key dispatch: the transition-table state machine against CalculatorModel."""
+from benchmarks.harness import benchmark, measure
+from src.fsm import StateMachineCalculator
+from src.fuzz import fuzz
+from src.keys import key_actions, tokenize
+from src.logic import CalculatorModel
+
+KEYS = tokenize("1234 × 56 + 7.5 ÷ 3 − 12 +/- % = AC")
+
+
+@benchmark('fsm.model_key')
+def model_key():
+    actions = key_actions(CalculatorModel())
+    keys = [actions[key] for key in KEYS]
+
+    def press():
+        for action in keys:
+            action()
+    return measure(press) / len(KEYS)
+
+
+@benchmark('fsm.machine_key')
+def machine_key():
+    machine = StateMachineCalculator()
+    return measure(lambda: machine.press_keys(KEYS)) / len(KEYS)
+
+
+@benchmark('fsm.fuzz_sequence')
+def fuzz_sequence():
+    stats = fuzz(seconds=1.0, seed=0)
+    return stats.elapsed / stats.sequences
@@ -0,0 +1,53 @@
+"""History tape append, random read and reopen costs on a 1M-record tape."""
+import atexit
+import os
+import random
+import shutil
+import tempfile
+
+from benchmarks.harness import benchmark, measure
+from src.history import HistoryTape
+from src.logic import Operation
+
+RECORDS = 1_000_000
+
+_dir = tempfile.mkdtemp(prefix='bench_history')
+atexit.register(shutil.rmtree, _dir, True)
+_path = os.path.join(_dir, 'history.tape')
+_tape = None
+
+
+def full_tape():
+    global _tape
+    if _tape is None:
+        _tape = HistoryTape(_path, capacity=RECORDS)
+        for i in range(RECORDS):
+            _tape.append(str(i), Operation.MULTIPLY, "1.5", str(i * 1.5), 1.7e9 + i)
+        atexit.register(_tape.close)
+    return _tape
+
+
+@benchmark('history.append')
+def append():
+    tape = full_tape()
+    return measure(lambda: tape.append("123.45", Operation.ADD, "6", "129.45"))
+
+
+@benchmark('history.read_random')
+def read_random():
+    tape = full_tape()
+    rows = [random.randrange(len(tape)) for _ in range(1000)]
+
+    def read():
+        for row in rows:
+            tape[row]
+    return measure(read) / len(rows)
+
+
+@benchmark('history.reopen')
+def reopen():
+    full_tape().flush()
+
+    def open_close():
+        HistoryTape(_path).close()
+    return measure(open_close)
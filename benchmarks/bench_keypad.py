@@ -0,0 +1,148 @@
+"""Button-per-key keypad against the painted keypad: construction, input events, memory.
+
+QT_QPA_PLATFORM defaults to 'offscreen'.
+"""
+import functools
+import os
+import subprocess
+import sys
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import Qt, QEvent, QPoint
+from PyQt6.QtTest import QTest
+
+from benchmarks.harness import benchmark, measure
+from src.ui import styles
+from src.ui.mainwindow import MainWindow
+
+app = QApplication.instance() or QApplication([])
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'main.py')
+
+
+def _window(mode):
+    saved, styles.KEYPAD_MODE = styles.KEYPAD_MODE, mode
+    try:
+        return MainWindow()
+    finally:
+        styles.KEYPAD_MODE = saved
+
+
+def _construct(mode):
+    def build():
+        _window(mode).deleteLater()
+        QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    return measure(build)
+
+
+def _click(mode):
+    # A press and release delivered through the window system to the '5' key, as a
+    # real click is: Qt finds the target widget, then the key handles it
+    window = _window(mode)
+    window.show()
+    app.processEvents()
+    target = window.buttons['5']
+    rect = target.geometry() if mode == "widgets" else target.rect
+    pos = window.keypad.mapTo(window, rect.center())
+    handle = window.windowHandle()
+
+    def click():
+        QTest.mouseClick(handle, Qt.MouseButton.LeftButton, pos=pos)
+        window.model.reset()
+    try:
+        return measure(click)
+    finally:
+        window.close()
+
+
+def _hit_points(window):
+    keypad = window.keypad
+    return [(x, y) for y in range(0, keypad.height(), 7) for x in range(0, keypad.width(), 7)]
+
+
+@functools.lru_cache(maxsize=None)
+def _launch(mode, runs=5):
+    # Best 'widgets' phase and peak RSS of fresh `main.py --startup-profile` processes
+    env = dict(os.environ)
+    widgets = rss = None
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, MAIN, '--startup-profile', '--keypad', mode, '--history', '',
+                                 '--session', ''],
+                                env=env, capture_output=True, text=True, check=True).stderr
+        for line in output.splitlines():
+            if line.startswith('widgets '):
+                seconds = float(line.split()[-2]) / 1000
+                widgets = seconds if widgets is None else min(widgets, seconds)
+            elif line.startswith('peak RSS '):
+                size = float(line.split()[-2]) * 2**20
+                rss = size if rss is None else min(rss, size)
+    return widgets, rss
+
+
+@benchmark('keypad.construct_window_widgets')
+def construct_widgets():
+    return _construct("widgets")
+
+
+@benchmark('keypad.construct_window_painted')
+def construct_painted():
+    return _construct("painted")
+
+
+@benchmark('keypad.click_widgets')
+def click_widgets():
+    return _click("widgets")
+
+
+@benchmark('keypad.click_painted')
+def click_painted():
+    return _click("painted")
+
+
+@benchmark('keypad.hit_test_widgets')
+def hit_test_widgets():
+    # What Qt does per button press: find the child under the point, then ask hitButton
+    window = _window("widgets")
+    keypad = window.keypad
+    points = [QPoint(x, y) for x, y in _hit_points(window)]
+
+    def hit_all():
+        for point in points:
+            child = keypad.childAt(point)
+            if child is not None:
+                child.hitButton(child.mapFromParent(point))
+    return measure(hit_all) / len(points)
+
+
+@benchmark('keypad.hit_test_painted')
+def hit_test_painted():
+    window = _window("painted")
+    key_at = window.keypad.key_at
+    points = _hit_points(window)
+
+    def hit_all():
+        for x, y in points:
+            key_at(x, y)
+    return measure(hit_all) / len(points)
+
+
+@benchmark('keypad.startup_widgets_phase_widgets')
+def startup_widgets():
+    return _launch("widgets")[0]
+
+
+@benchmark('keypad.startup_widgets_phase_painted')
+def startup_painted():
+    return _launch("painted")[0]
+
+
+@benchmark('keypad.peak_rss_widgets', unit='B')
+def peak_rss_widgets():
+    return _launch("widgets")[1]
+
+
+@benchmark('keypad.peak_rss_painted', unit='B')
+def peak_rss_painted():
+    return _launch("painted")[1]
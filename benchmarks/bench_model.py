@@ -0,0 +1,131 @@
+"""CalculatorModel cost per key, per expression and per session."""
+import time
+import tracemalloc
+
+from benchmarks.harness import benchmark, measure
+from src.logic import CalculatorModel, Operation
+from src.keys import key_actions, tokenize
+from src.compiler import run_text
+
+EXPRESSION = tokenize("1234 × 56 + 7.5 ÷ 3 − 12 +/- % =")
+PASTE = ("1234*56+7.5/3-12" * 6250)[:100_000] + "="
+
+
+@benchmark('model.input_digit')
+def input_digit():
+    model = CalculatorModel()
+
+    def press():
+        model.new_entry = True
+        model.input_digit('7')
+        model.input_digit('3')
+    return measure(press) / 2
+
+
+@benchmark('model.set_operation')
+def set_operation():
+    model = CalculatorModel()
+    model.input_digit('8')
+    return measure(lambda: model.set_operation(Operation.MULTIPLY))
+
+
+@benchmark('model.calculate')
+def calculate():
+    model = CalculatorModel()
+    model.input_digit('8')
+
+    def equals():
+        model.pending_value = 6
+        model.pending_operation = Operation.MULTIPLY
+        model.calculate()
+    return measure(equals)
+
+
+@benchmark('model.toggle_sign')
+def toggle_sign():
+    model = CalculatorModel()
+    for digit in '12.5':
+        model.input_digit(digit)
+    return measure(model.toggle_sign)
+
+
+@benchmark('model.percentage')
+def percentage():
+    model = CalculatorModel()
+    model.input_digit('5')
+    return measure(model.percentage)
+
+
+@benchmark('model.get_display')
+def get_display():
+    model = CalculatorModel()
+    for digit in '1234.5':
+        model.input_digit(digit)
+
+    def display():
+        model._display = None  # force the formatting path
+        model.get_display()
+    return measure(display)
+
+
+@benchmark('model.expression')
+def expression():
+    def run():
+        actions = key_actions(CalculatorModel())
+        for key in EXPRESSION:
+            actions[key]()
+    return measure(run)
+
+
+@benchmark('model.expression_per_key')
+def expression_per_key():
+    model = CalculatorModel()
+    actions = key_actions(model)
+
+    def run():
+        for key in EXPRESSION:
+            actions[key]()
+            model.get_display()
+    return measure(run) / len(EXPRESSION)
+
+
+@benchmark('model.paste_100k')
+def paste_100k():
+    # A 100,000-character pasted expression, all batches (the app runs them between events)
+    def paste():
+        for _ in run_text(PASTE, CalculatorModel()):
+            pass
+    return measure(paste, repeat=3)
+
+
+@benchmark('model.paste_100k_batch')
+def paste_100k_batch():
+    # The longest single batch of the paste above, i.e. how long the event loop is held
+    done = object()
+    best = float('inf')
+    for _ in range(5):
+        batches = run_text(PASTE, CalculatorModel())
+        longest = 0.0
+        while True:
+            start = time.perf_counter()
+            if next(batches, done) is done:
+                break
+            longest = max(longest, time.perf_counter() - start)
+        best = min(best, longest)
+    return best
+
+
+@benchmark('model.memory_per_session', unit='B')
+def memory_per_session(sessions=10_000):
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        models = [CalculatorModel() for _ in range(sessions)]
+        for model in models:
+            actions = key_actions(model)
+            for key in EXPRESSION:
+                actions[key]()
+        del actions
+        return (tracemalloc.get_traced_memory()[0] - before) / sessions
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,66 @@
+"""Digit entry and arithmetic cost for very long operands in each number engine.
+
+    python -m benchmarks.bench_precision [--sizes 10000 100000 1000000]
+"""
+import argparse
+import time
+
+from src.logic import CalculatorModel, Operation
+from src.precision import get_engine
+
+
+class StringEntry:
+    # The original entry strategy: the whole entry string is copied on every digit
+    def __init__(self):
+        self.current_value = "0"
+
+    def input_digit(self, digit):
+        if self.current_value == "0":
+            self.current_value = digit
+        else:
+            self.current_value += digit
+
+
+def time_entry(model, digits):
+    start = time.perf_counter()
+    input_digit = model.input_digit
+    for digit in digits:
+        input_digit(digit)
+    return time.perf_counter() - start
+
+
+def time_operation(engine, digits):
+    model = CalculatorModel(engine)
+    for digit in digits:
+        model.input_digit(digit)
+    model.set_operation(Operation.MULTIPLY)
+    for digit in "3.7":
+        model.input_digit(digit)
+    start = time.perf_counter()
+    model.calculate()
+    model.get_display()
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--fraction-max', type=int, default=100_000,
+                        help="largest entry given to the fraction engine (its conversions are quadratic)")
+    args = parser.parse_args(argv)
+
+    for size in args.sizes:
+        digits = ("7312945806" * (size // 10 + 1))[:size]
+        entry = time_entry(CalculatorModel(), digits)
+        legacy = time_entry(StringEntry(), digits)
+        print(f"{size:>9} digits  entry {entry / size * 1e9:7.0f} ns/digit"
+              f"  (string copy {legacy / size * 1e9:9.0f} ns/digit)")
+        for name, options in (('float', {}), ('decimal', {'precision': size + 10}), ('fraction', {})):
+            if name == 'fraction' and size > args.fraction_max:
+                continue
+            elapsed = time_operation(get_engine(name, **options), digits)
+            print(f"{'':>17}{name:>9} × 3.7 + display  {elapsed * 1e3:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Offscreen Qt paint and display-update costs.
+
+Widgets are rendered into a reused QPixmap, which runs their paintEvent without a
+window system. QT_QPA_PLATFORM defaults to 'offscreen' so this also runs headless.
+"""
+import os
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtWidgets import QApplication, QWidget
+from PyQt6.QtGui import QPixmap, QFontMetricsF
+
+from benchmarks.harness import benchmark, measure
+from src.ui import styles, render_cache
+from src.ui.repaint_stats import repaint_stats
+from src.ui.mainwindow import MainWindow
+from src.ui.widgets import CalculatorButton, DisplayLabel
+from src.ui.text_fit import TextFitter
+
+app = QApplication.instance() or QApplication([])
+
+_OWN_PAINT = QWidget.RenderFlag.DrawWindowBackground  # paint the widget itself, not its children
+
+
+def _render(widget):
+    target = QPixmap(widget.size())
+    return lambda: widget.render(target, flags=_OWN_PAINT)
+
+
+@benchmark('render.button_circle')
+def button_circle():
+    button = CalculatorButton('7', styles.COLOR_BTN_NUM, styles.COLOR_TEXT_WHITE)
+    return measure(_render(button))
+
+
+@benchmark('render.button_lozenge')
+def button_lozenge():
+    button = CalculatorButton('0', styles.COLOR_BTN_NUM, styles.COLOR_TEXT_WHITE)
+    button.setFixedSize(styles.BUTTON_SIZE * 2 + styles.GRID_SPACING, styles.BUTTON_SIZE)
+    return measure(_render(button))
+
+
+@benchmark('render.button_animation_frame')
+def button_animation_frame():
+    button = CalculatorButton('×', styles.COLOR_BTN_OP, styles.COLOR_TEXT_WHITE)
+    paint = _render(button)
+    frames = [1.0 - 0.05 * i / 10 for i in range(10)]
+
+    def animate():
+        for scale in frames:
+            button.scale_factor = scale
+            paint()
+    return measure(animate) / len(frames)
+
+
+@benchmark('render.button_face_uncached')
+def button_face_uncached():
+    button = CalculatorButton('7', styles.COLOR_BTN_NUM, styles.COLOR_TEXT_WHITE)
+    return measure(lambda: button._render_face(1.0, 1.0))
+
+
+@benchmark('render.button_cache_miss_rate', unit='ratio')
+def button_cache_miss_rate():
+    # One press/release animation on every key of a keypad, repeated
+    render_cache.button_cache.clear()
+    buttons = [CalculatorButton(t, styles.COLOR_BTN_NUM, styles.COLOR_TEXT_WHITE) for t in '0123456789']
+    painters = [_render(b) for b in buttons]
+    frames = [1.0 - 0.05 * i / 6 for i in range(7)] + [0.95 + 0.07 * i / 12 for i in range(13)] + [1.0]
+    for _ in range(20):
+        for button, paint in zip(buttons, painters):
+            for scale in frames:
+                button.scale_factor = scale
+                paint()
+    cache = render_cache.button_cache
+    return 1 - cache.hit_rate
+
+
+@benchmark('render.main_window')
+def main_window():
+    window = MainWindow()
+    return measure(_render(window))
+
+
+@benchmark('render.main_window_full')
+def main_window_full():
+    window = MainWindow()
+    target = QPixmap(window.size())
+    return measure(lambda: window.render(target))
+
+
+@benchmark('render.display_set_text')
+def display_set_text():
+    display = DisplayLabel()
+    texts = [str(n) for n in range(100)]
+
+    def update():
+        for text in texts:
+            display.set_text(text)
+        app.processEvents()
+    return measure(update) / len(texts)
+
+
+def _press_repaint_pixels(mode):
+    # Pixels repainted for one press/release animation of a shown window's '5' key
+    saved, styles.RENDER_MODE = styles.RENDER_MODE, mode
+    try:
+        window = MainWindow()
+    finally:
+        styles.RENDER_MODE = saved
+    window.show()
+    app.processEvents()
+    button = window.buttons['5']
+    frames = [1.0 - 0.05 * i / 6 for i in range(7)] + [0.95 + 0.07 * i / 12 for i in range(13)] + [1.0]
+    repaint_stats.reset()
+    for scale in frames:
+        button.scale_factor = scale
+        app.processEvents()
+    window.close()
+    return repaint_stats.total_pixels()
+
+
+@benchmark('render.press_pixels_quality', unit='px')
+def press_pixels_quality():
+    return _press_repaint_pixels("quality")
+
+
+@benchmark('render.press_pixels_performance', unit='px')
+def press_pixels_performance():
+    return _press_repaint_pixels("performance")
+
+
+# Typed entries and results as they appear while calculating
+_FIT_TEXTS = ["7", "78", "789", "789.5", "0.3333333333333333", "1234567.891", "-0.000125", "98765432109876"]
+
+
+@benchmark('render.display_fit')
+def display_fit():
+    # Per text, with the width cache warm (the steady state while typing)
+    fitter = TextFitter()
+    fit = fitter.fit
+    for text in _FIT_TEXTS:
+        fit(text, 320)
+    return measure(lambda: [fit(text, 320) for text in _FIT_TEXTS]) / len(_FIT_TEXTS)
+
+
+@benchmark('render.display_fit_measured')
+def display_fit_measured():
+    # The same decision measured with QFontMetrics on every call, for comparison
+    fitter = TextFitter()
+
+    def fit(text):
+        for size in range(fitter.max_size, fitter.min_size - 1, -1):
+            if QFontMetricsF(fitter.font(size)).horizontalAdvance(text) <= 320:
+                return size
+    return measure(lambda: [fit(text) for text in _FIT_TEXTS]) / len(_FIT_TEXTS)
@@ -0,0 +1,119 @@
+"""Load generator for src/service.py: requests/s and latency percentiles.
+
+    python -m benchmarks.bench_service [--sessions 10000] [--connections 100] [--requests 5] [--pipeline 8]
+
+Starts the service on a Unix socket in a subprocess. Every connection drives its share
+of the sessions round-robin, with up to --pipeline requests in flight.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque, namedtuple
+
+from benchmarks.harness import benchmark
+
+SERVICE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'service.py')
+KEYS = ["12", "×3", "+4=", "÷7=", "+/-", "%", "1.5+", "2="]
+
+LoadResult = namedtuple('LoadResult', ['requests', 'elapsed', 'p50', 'p95', 'p99', 'max'])
+
+
+async def _drive(path, sessions, requests, pipeline, latencies):
+    reader, writer = await asyncio.open_unix_connection(path)
+    window = asyncio.Semaphore(pipeline)
+    sent = deque()
+
+    async def send():
+        for i in range(requests * len(sessions)):
+            request = {'session': sessions[i % len(sessions)], 'keys': KEYS[i % len(KEYS)]}
+            if i < len(sessions):
+                request['reset'] = True
+            await window.acquire()
+            sent.append(time.perf_counter())
+            writer.write(json.dumps(request).encode('utf-8') + b'\n')
+            await writer.drain()
+
+    async def receive():
+        for _ in range(requests * len(sessions)):
+            reply = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - sent.popleft())
+            window.release()
+            if 'error' in reply:
+                raise RuntimeError(reply['error'])
+
+    await asyncio.gather(send(), receive())
+    writer.close()
+    await writer.wait_closed()
+
+
+async def _load(path, sessions, connections, requests, pipeline):
+    latencies = []
+    ids = [f"s{i}" for i in range(sessions)]
+    start = time.perf_counter()
+    await asyncio.gather(*(_drive(path, ids[c::connections], requests, pipeline, latencies)
+                           for c in range(connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    n = len(latencies)
+
+    def percentile(p):
+        # Nearest rank
+        return latencies[min(n - 1, max(0, -(-p * n // 100) - 1))]
+    return LoadResult(n, elapsed, percentile(50), percentile(95), percentile(99), latencies[-1])
+
+
+def run_load(sessions=10_000, connections=100, requests=5, pipeline=8) -> LoadResult:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'service.sock')
+        server = subprocess.Popen([sys.executable, SERVICE, '--unix', path], stderr=subprocess.PIPE, text=True)
+        try:
+            server.stderr.readline()  # "listening on ..."
+            return asyncio.run(_load(path, sessions, connections, requests, pipeline))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+_result = None
+
+
+def _run():
+    global _result
+    if _result is None:
+        _result = run_load()
+    return _result
+
+
+@benchmark('service.request_10k_sessions')
+def request_time():
+    # Wall time per request across all connections (1 / requests per second)
+    result = _run()
+    return result.elapsed / result.requests
+
+
+@benchmark('service.latency_p99_10k_sessions')
+def latency_p99():
+    return _run().p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=10_000)
+    parser.add_argument('--connections', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=5, help="requests per session")
+    parser.add_argument('--pipeline', type=int, default=8, help="requests in flight per connection")
+    args = parser.parse_args()
+    result = run_load(args.sessions, args.connections, args.requests, args.pipeline)
+    print(f"{result.requests} requests from {args.sessions} sessions over {args.connections} connections "
+          f"in {result.elapsed:.2f}s: {result.requests / result.elapsed:,.0f} requests/s")
+    print(f"latency p50 {result.p50 * 1e3:.2f} ms, p95 {result.p95 * 1e3:.2f} ms, "
+          f"p99 {result.p99 * 1e3:.2f} ms, max {result.max * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
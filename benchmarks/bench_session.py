@@ -0,0 +1,75 @@
+"""Session persistence: encoding, the UI-thread cost of a save, the write and the restore."""
+import os
+import tempfile
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.harness import benchmark, measure
+from src.logic import CalculatorModel
+from src.keys import apply_keys, tokenize
+from src.session import SessionFile, SessionState, decode, encode, write_atomic
+from src.ui.mainwindow import MainWindow
+
+app = QApplication.instance() or QApplication([])
+
+
+def _state(keys="1234.5 × 6 = + 78"):
+    model = CalculatorModel()
+    apply_keys(model, tokenize(keys))
+    return SessionState('float', model.snapshot(), (120, 80))
+
+
+@benchmark('session.encode')
+def encode_state():
+    state = _state()
+    return measure(lambda: encode(state))
+
+
+@benchmark('session.decode')
+def decode_state():
+    data = encode(_state())
+    return measure(lambda: decode(data))
+
+
+@benchmark('session.save_call')
+def save_call():
+    # What a key press pays: the write happens on the writer thread
+    states = [_state("1 +").snapshot, _state("2 +").snapshot]
+    with tempfile.TemporaryDirectory() as tmp:
+        session = SessionFile(os.path.join(tmp, 'session'), interval=3600)
+        i = 0
+
+        def save():
+            nonlocal i
+            i += 1
+            session.save('float', states[i & 1], (120, 80))
+        try:
+            return measure(save)
+        finally:
+            session.close()
+
+
+@benchmark('session.write')
+def write():
+    # Writer thread, per write: encode, then write, fsync and rename
+    state = _state()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'session')
+        return measure(lambda: write_atomic(path, encode(state)), repeat=3)
+
+
+@benchmark('session.restore')
+def restore():
+    # What a launch adds before the first paint: read, decode, restore the model,
+    # display and position
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'session')
+        write_atomic(path, encode(_state()))
+        window = MainWindow()
+        session = SessionFile(path)
+        try:
+            return measure(lambda: window.restore_session(session.load()))
+        finally:
+            window.close()
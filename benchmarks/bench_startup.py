@@ -0,0 +1,45 @@
+"""Cold-start phases of the app, from `src/main.py --startup-profile` in a fresh process.
+
+Each phase is the best of several launches; QT_QPA_PLATFORM defaults to 'offscreen'.
+"""
+import functools
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.harness import benchmark
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'main.py')
+PHASES = ('interpreter', 'imports', 'QApplication', 'widgets', 'first paint', 'total')
+
+
+@functools.lru_cache(maxsize=None)
+def launch_phases(runs=5):
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    best = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        history = os.path.join(tmp, 'history.tape')
+        session = os.path.join(tmp, 'session')  # restored from the second launch on
+        outputs = [subprocess.run([sys.executable, MAIN, '--startup-profile', '--history', history,
+                                   '--session', session], env=env,
+                                  capture_output=True, text=True, check=True).stderr for _ in range(runs)]
+    for output in outputs:
+        for line in output.splitlines():
+            phase, _, value = line.rpartition(' ms')[0].rpartition(' ')
+            phase = phase.strip()
+            if phase in PHASES:
+                seconds = float(value) / 1000
+                best[phase] = min(best.get(phase, seconds), seconds)
+    return best
+
+
+def _register(phase):
+    @benchmark('startup.' + phase.lower().replace(' ', '_'))
+    def startup_phase():
+        return launch_phases()[phase]
+
+
+for _phase in PHASES:
+    _register(_phase)
@@ -0,0 +1,36 @@
+"""Table mode: a million-row sweep, and exporting it to CSV."""
+import os
+import tempfile
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.harness import benchmark, measure
+from src.logic import Operation
+from src.vectorized import parse_operands, sweep
+from src.ui.sweep_view import SweepView
+
+app = QApplication.instance() or QApplication([])
+
+ROWS = "1:1000000"
+
+
+@benchmark('sweep.million_rows')
+def million_rows():
+    # Operand parsing and the vectorized pass
+    return measure(lambda: sweep(1.19, Operation.MULTIPLY, parse_operands(ROWS)))
+
+
+@benchmark('sweep.million_row_view')
+def million_row_view():
+    # Everything show_sweep does before the first paint
+    return measure(lambda: SweepView(1.19, Operation.MULTIPLY, parse_operands(ROWS)).deleteLater())
+
+
+@benchmark('sweep.csv_export_row')
+def csv_export_row():
+    model = SweepView(1.19, Operation.MULTIPLY, parse_operands("0:100:0.001")).model()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'table.csv')
+        return measure(lambda: model.write_csv(path), repeat=3) / model.rowCount()
@@ -0,0 +1,34 @@
+"""Cost of a tracing span at a call site, with tracing off and on."""
+from benchmarks.harness import benchmark, measure
+from src.tracing import Tracer
+
+
+def _span_cost(enabled):
+    tracer = Tracer(capacity=1024)
+    if enabled:
+        tracer.enable()
+
+    def traced():
+        with tracer.span('bench'):
+            pass
+    return measure(traced)
+
+
+@benchmark('tracing.span_disabled')
+def span_disabled():
+    return _span_cost(False)
+
+
+@benchmark('tracing.span_enabled')
+def span_enabled():
+    return _span_cost(True)
+
+
+@benchmark('tracing.open_close_disabled')
+def open_close_disabled():
+    tracer = Tracer(capacity=1024)
+
+    def traced():
+        tracer.open('bench')
+        tracer.close('bench')
+    return measure(traced)
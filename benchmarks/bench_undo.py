@@ -0,0 +1,66 @@
+"""Undo recording cost per step stays flat up to 1M recorded steps."""
+import itertools
+import time
+import tracemalloc
+
+from benchmarks.harness import benchmark
+from src.logic import CalculatorModel
+from src.keys import key_actions, tokenize
+from src.undo import UndoHistory
+
+STEPS = 1_000_000
+WINDOW = 10_000
+# Includes an entry longer than the model's int range, whose digit buffer snapshots share
+KEYS = tokenize("12 × 3.5 + 98765432109876543210987 − 4 ÷ 7 +/- % = AC")
+
+
+def _record_steps():
+    # Seconds per step (record + key) for the first and the last WINDOW of STEPS steps
+    model = CalculatorModel()
+    history = UndoHistory(model, depth=STEPS)
+    actions = itertools.cycle([key_actions(model)[key] for key in KEYS])
+    record = history.record
+    timings = []
+    for count in (WINDOW, STEPS - 2 * WINDOW, WINDOW):
+        start = time.perf_counter()
+        for action in itertools.islice(actions, count):
+            record()
+            action()
+        timings.append((time.perf_counter() - start) / count)
+    return timings[0], timings[2]
+
+
+_timings = None
+
+
+def _steps():
+    global _timings
+    if _timings is None:
+        _timings = _record_steps()
+    return _timings
+
+
+@benchmark('undo.step_first_10k')
+def step_first():
+    return _steps()[0]
+
+
+@benchmark('undo.step_at_1m')
+def step_at_1m():
+    return _steps()[1]
+
+
+@benchmark('undo.bytes_per_step', unit='B')
+def bytes_per_step(steps=100_000):
+    model = CalculatorModel()
+    history = UndoHistory(model, depth=steps)
+    actions = itertools.cycle([key_actions(model)[key] for key in KEYS])
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for action in itertools.islice(actions, steps):
+            history.record()
+            action()
+        return (tracemalloc.get_traced_memory()[0] - before) / steps
+    finally:
+        tracemalloc.stop()
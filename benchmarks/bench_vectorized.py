@@ -0,0 +1,88 @@
+"""Throughput of BatchCalculatorModel against one CalculatorModel per session.
+
+    python -m benchmarks.bench_vectorized [--sessions 100000] [--keys 40]
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from src.logic import CalculatorModel
+from src.keys import key_actions
+from src.vectorized import BatchCalculatorModel, KEY_CODES
+
+CODE_KEYS = {code: key for key, code in KEY_CODES.items()}
+
+
+def make_streams(sessions, length, seed=0):
+    # Three digit-or-point keys then a function key, as a (length, sessions) code matrix
+    rng = np.random.default_rng(seed)
+    entry_keys = np.array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+    entry_p = np.array([1.0] * 10 + [0.5])
+    func_keys = np.array([11, 12, 13, 14, 15, 16, 17])
+    func_p = np.array([2.0, 2, 2, 2, 3, 1, 1])
+    codes = rng.choice(entry_keys, size=(length, sessions), p=entry_p / entry_p.sum())
+    func_rows = np.arange(3, length, 4)
+    codes[func_rows] = rng.choice(func_keys, size=(len(func_rows), sessions), p=func_p / func_p.sum())
+    return codes
+
+
+def run_scalar(codes):
+    keys = [[CODE_KEYS[c] for c in column] for column in codes.T.tolist()]
+    start = time.perf_counter()
+    for session_keys in keys:
+        actions = key_actions(CalculatorModel())
+        for key in session_keys:
+            actions[key]()
+    return time.perf_counter() - start
+
+
+def run_batch(codes):
+    start = time.perf_counter()
+    batch = BatchCalculatorModel(codes.shape[1])
+    for row in codes:
+        batch.step(row)
+    return time.perf_counter() - start
+
+
+def run_uniform(sessions, length):
+    # Every session presses the same kind of key at each step (different digits)
+    rng = random.Random(0)
+    digits = np.random.default_rng(0).integers(0, 10, size=(length, sessions))
+    from src.logic import Operation
+    ops = [Operation.ADD, Operation.SUBTRACT, Operation.MULTIPLY, Operation.DIVIDE]
+    start = time.perf_counter()
+    batch = BatchCalculatorModel(sessions)
+    for i in range(length):
+        if i % 3 == 2:
+            batch.set_operation(rng.choice(ops))
+        else:
+            batch.input_digit(digits[i])
+    batch.calculate()
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=100_000)
+    parser.add_argument('--keys', type=int, default=40)
+    parser.add_argument('--scalar-sample', type=int, default=10_000,
+                        help="sessions used to time the scalar model (extrapolated)")
+    args = parser.parse_args(argv)
+
+    codes = make_streams(args.sessions, args.keys)
+    total = args.sessions * args.keys
+    sample = min(args.scalar_sample, args.sessions)
+    scalar = run_scalar(codes[:, :sample]) * args.sessions / sample
+    batch = run_batch(codes)
+    uniform = run_uniform(args.sessions, args.keys)
+
+    print(f"{args.sessions} sessions x {args.keys} keys")
+    print(f"  scalar model     {total / scalar:14,.0f} keys/s")
+    print(f"  batch, mixed     {total / batch:14,.0f} keys/s  ({scalar / batch:.1f}x)")
+    print(f"  batch, uniform   {(total + args.sessions) / uniform:14,.0f} keys/s  ({scalar / uniform:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Additional windows in one process against additional processes.
+
+QT_QPA_PLATFORM defaults to 'offscreen'. The RSS figures and the handed-over launch
+run in fresh processes.
+"""
+import functools
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.harness import benchmark
+from src.ui.windows import WindowManager
+
+app = QApplication.instance() or QApplication([])
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, 'src', 'main.py')
+
+# RSS with one window, then with `extra` more; prints both. Current RSS where /proc
+# has it, as the peak hardly moves once startup is over
+_RSS_PROBE = """
+import os, sys
+from PyQt6.QtWidgets import QApplication
+from src.startup import peak_rss
+from src.ui.windows import WindowManager
+
+def rss():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        return peak_rss()
+
+app = QApplication([])
+manager = WindowManager()
+for count in (1, int(sys.argv[1])):
+    for _ in range(count):
+        manager.open_window()
+    for _ in range(5):
+        app.processEvents()
+    print(rss())
+"""
+
+
+def _open_time(runs=20):
+    # Best time from open_window() until the new window has painted
+    manager = WindowManager()
+    manager.open_window()
+    app.processEvents()
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        window = manager.open_window()
+        app.processEvents()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        window.close()
+        QApplication.sendPostedEvents(None, 0)
+    for window in list(manager.windows):
+        window.close()
+    return best
+
+
+@functools.lru_cache(maxsize=None)
+def _rss(extra=20):
+    output = subprocess.run([sys.executable, '-c', _RSS_PROBE, str(extra)], cwd=ROOT, env=dict(os.environ),
+                            capture_output=True, text=True, check=True).stdout.split()
+    one, more = int(output[0]), int(output[1])
+    return one, (more - one) / extra
+
+
+def _handoff_time(runs=5):
+    # Wall time of `main.py --single-instance` while another instance is running
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, TMPDIR=tmp)  # a private instance address
+        server = subprocess.Popen([sys.executable, MAIN, '--single-instance', '--history', '', '--session', ''],
+                                  env=env, stderr=subprocess.DEVNULL)
+        try:
+            deadline = time.monotonic() + 30
+            while not any(name.endswith('.sock') for name in os.listdir(tmp)):
+                if time.monotonic() > deadline or server.poll() is not None:
+                    raise RuntimeError("the instance did not start listening")
+                time.sleep(0.05)
+            best = None
+            for _ in range(runs):
+                start = time.perf_counter()
+                subprocess.run([sys.executable, MAIN, '--single-instance'], env=env, check=True)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            return best
+        finally:
+            server.terminate()
+            server.wait()
+
+
+@benchmark('windows.open_additional')
+def open_additional():
+    return _open_time()
+
+
+@benchmark('windows.rss_per_additional_window', unit='B')
+def rss_per_window():
+    return _rss()[1]
+
+
+@benchmark('windows.rss_one_window_process', unit='B')
+def rss_process():
+    # What every extra process costs without single-instance mode
+    return _rss()[0]
+
+
+@benchmark('windows.handoff_launch')
+def handoff_launch():
+    return _handoff_time()
@@ -0,0 +1,110 @@
+"""Minimal benchmark registry, timer and JSON result comparison.
+
+Every benchmark returns one number where lower is better (seconds per operation or
+bytes), so comparing two runs is a ratio per name.
+"""
+import importlib
+import json
+import platform
+import sys
+import time
+import timeit
+from collections import namedtuple
+
+Benchmark = namedtuple('Benchmark', ['name', 'func', 'unit'])
+Regression = namedtuple('Regression', ['name', 'baseline', 'current', 'change'])
+
+SUITES = ['benchmarks.bench_model', 'benchmarks.bench_render', 'benchmarks.bench_startup',
+          'benchmarks.bench_tracing', 'benchmarks.bench_history',
+          'benchmarks.bench_undo', 'benchmarks.bench_evaluator',
+          'benchmarks.bench_batch', 'benchmarks.bench_service', 'benchmarks.bench_sweep',
+          'benchmarks.bench_fsm', 'benchmarks.bench_keypad',
+          'benchmarks.bench_session', 'benchmarks.bench_windows']
+
+_registry = []
+
+
+def benchmark(name, unit='s'):
+    def register(func):
+        _registry.append(Benchmark(name, func, unit))
+        return func
+    return register
+
+
+def measure(func, repeat=5, min_time=0.2):
+    """Best-of-repeat seconds per call, with the loop count picked like timeit's autorange."""
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def load_suites(names=SUITES):
+    """Import benchmark modules, returning {module: error message} for the ones that cannot load."""
+    skipped = {}
+    for name in names:
+        try:
+            importlib.import_module(name)
+        except ImportError as exc:
+            skipped[name] = str(exc)
+    return skipped
+
+
+def run(pattern=None, log=None):
+    results = {}
+    for bench in _registry:
+        if pattern and pattern not in bench.name:
+            continue
+        value = bench.func()
+        results[bench.name] = {'value': value, 'unit': bench.unit}
+        if log:
+            log(f"{bench.name:<40} {format_value(value, bench.unit)}")
+    return {'meta': environment(), 'results': results}
+
+
+def environment():
+    meta = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+    }
+    qt = sys.modules.get('PyQt6.QtCore')
+    if qt is not None:
+        meta['qt'] = qt.QT_VERSION_STR
+    return meta
+
+
+def format_value(value, unit):
+    if unit == 's':
+        for scale, suffix in ((1, 's'), (1e-3, 'ms'), (1e-6, 'us')):
+            if value >= scale:
+                return f"{value / scale:10.3f} {suffix}"
+        return f"{value * 1e9:10.1f} ns"
+    if unit == 'B':
+        return f"{value:10.0f} B"
+    return f"{value:10.4g} {unit}"
+
+
+def save(report, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(baseline, current, threshold=0.10):
+    """Benchmarks present in both reports that got slower/larger by more than threshold."""
+    regressions = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None or base['value'] <= 0:
+            continue
+        change = result['value'] / base['value'] - 1
+        if change > threshold:
+            regressions.append(Regression(name, base['value'], result['value'], change))
+    return regressions
@@ -0,0 +1,249 @@
+"""Evaluate files of calculator expressions on all cores (no Qt required).
+
+Input is CSV with a header row, or JSON lines with one object per line. Each record has
+an expression of calculator keys, e.g. ``12 × 3 + 4 =``, which is run from a cleared
+calculator. The output repeats every record in input order with a ``result`` field
+added: the display after the expression's keys, or empty (CSV) / null (JSON) when the
+expression is not calculator input. A JSON line that is not an object is replaced by
+``{"error": ..., "line": ..., "result": null}``. A record must not span lines.
+
+The input is cut into chunks at line boundaries. Workers read and write their own
+chunks; the parent only finds the boundaries and writes finished chunks in order, with
+at most ``workers * 2`` chunks in flight, so memory does not grow with the input.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Add the project root (one level up from src) to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.logic import CalculatorModel
+from src.compiler import KeystrokeCompiler
+from src.precision import ENGINES, FloatEngine, get_engine
+
+CHUNK_SIZE = 4 << 20
+FORMATS = ('csv', 'jsonl')
+
+
+class WorkerStats:
+    def __init__(self):
+        self.chunks = 0
+        self.rows = 0
+        self.busy = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.busy if self.busy else 0.0
+
+
+class BatchStats:
+    def __init__(self):
+        self.rows = 0
+        self.invalid = 0
+        self.chunks = 0
+        self.elapsed = 0.0
+        self.workers = {}  # pid -> WorkerStats
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def report(self) -> str:
+        lines = [f"evaluated {self.rows} rows ({self.invalid} invalid) in {self.chunks} chunks "
+                 f"in {self.elapsed:.3f}s ({self.rows_per_second:,.0f} rows/s)"]
+        for pid, worker in sorted(self.workers.items()):
+            lines.append(f"  worker {pid}: {worker.rows} rows in {worker.chunks} chunks, "
+                         f"busy {worker.busy:.3f}s ({worker.rows_per_second:,.0f} rows/s)")
+        return '\n'.join(lines)
+
+
+def guess_format(path: str) -> str:
+    return 'jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv'
+
+
+def file_chunks(f, start: int, size: int = CHUNK_SIZE):
+    # (offset, length) of chunks of about size bytes that end at a line boundary
+    end = os.fstat(f.fileno()).st_size
+    while start < end:
+        f.seek(min(start + size, end))
+        f.readline()
+        stop = min(f.tell(), end)
+        yield start, stop - start
+        start = stop
+
+
+def stream_chunks(stream, size: int = CHUNK_SIZE):
+    # Chunks of a binary stream, for input that workers cannot open themselves
+    while True:
+        data = stream.read(size)
+        if not data:
+            return
+        yield data + stream.readline()
+
+
+# Per-process state, set up by _init_worker
+_engine = None
+_model = None
+_compiler = None
+
+
+def _init_worker(engine):
+    global _engine, _model, _compiler
+    _engine = engine
+    _model = CalculatorModel(engine)
+    _compiler = KeystrokeCompiler()
+
+
+def _evaluate(expression):
+    try:
+        program = _compiler.compile(expression)
+    except ValueError:
+        return None
+    if type(_engine) is FloatEngine:
+        return program.run()  # cached per program
+    _model.reset()
+    return program.run(_model)
+
+
+def _evaluate_chunk(fmt, column, source):
+    # source: (path, offset, length) or the chunk's bytes. Returns (pid, rows, invalid,
+    # seconds, output bytes)
+    start = time.perf_counter()
+    if isinstance(source, tuple):
+        path, offset, length = source
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            source = f.read(length)
+    text = source.decode('utf-8')
+    out = io.StringIO()
+    rows = invalid = 0
+    if fmt == 'csv':
+        writer = csv.writer(out, lineterminator='\n')
+        for row in csv.reader(io.StringIO(text)):
+            if not row:
+                continue
+            result = _evaluate(row[column]) if column < len(row) else None
+            invalid += result is None
+            row.append('' if result is None else result)
+            writer.writerow(row)
+            rows += 1
+    else:
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if isinstance(record, dict):
+                expression = record.get(column)
+                result = _evaluate(expression) if isinstance(expression, str) else None
+                record['result'] = result
+            else:
+                result = None
+                record = {'error': "not a JSON object", 'line': line, 'result': None}
+            invalid += result is None
+            out.write(json.dumps(record, ensure_ascii=False))
+            out.write('\n')
+            rows += 1
+    return os.getpid(), rows, invalid, time.perf_counter() - start, out.getvalue().encode('utf-8')
+
+
+def evaluate_file(source, out, fmt='csv', column='expression', workers=None, engine=None,
+                  chunk_size=CHUNK_SIZE, stats=None):
+    """Evaluate every record of source (a path, or a binary stream) and write them to out.
+
+    out is a binary stream; results are written in input order as chunks finish.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt!r}")
+    if stats is None:
+        stats = BatchStats()
+    workers = workers or os.cpu_count() or 1
+    start_time = time.perf_counter()
+    f = open(source, 'rb') if isinstance(source, str) else source
+    try:
+        key = column
+        if fmt == 'csv':
+            header = f.readline().decode('utf-8')
+            if not header:
+                return stats
+            names = next(csv.reader([header]))
+            if column not in names:
+                raise ValueError(f"No {column!r} column in the header")
+            key = names.index(column)
+            out.write((header.rstrip('\r\n') + ',result\n').encode('utf-8'))
+        if isinstance(source, str):
+            tasks = ((source, offset, length) for offset, length in file_chunks(f, f.tell(), chunk_size))
+        else:
+            tasks = stream_chunks(f, chunk_size)
+
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(engine or FloatEngine(),)) as pool:
+            pending = deque()
+            for task in tasks:
+                if len(pending) >= workers * 2:
+                    _write(pending.popleft().result(), out, stats)  # backpressure
+                pending.append(pool.submit(_evaluate_chunk, fmt, key, task))
+            while pending:
+                _write(pending.popleft().result(), out, stats)
+    finally:
+        if isinstance(source, str):
+            f.close()
+        stats.elapsed += time.perf_counter() - start_time
+    return stats
+
+
+def _write(result, out, stats):
+    pid, rows, invalid, seconds, data = result
+    out.write(data)
+    stats.rows += rows
+    stats.invalid += invalid
+    stats.chunks += 1
+    worker = stats.workers.setdefault(pid, WorkerStats())
+    worker.chunks += 1
+    worker.rows += rows
+    worker.busy += seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate CSV or JSON-lines files of calculator expressions.")
+    parser.add_argument('input', nargs='?', default='-', help="input file ('-' for stdin)")
+    parser.add_argument('-o', '--output', default='-', help="output file ('-' for stdout)")
+    parser.add_argument('--format', choices=FORMATS, help="input format (default: from the file name, else csv)")
+    parser.add_argument('--column', default='expression', help="field holding the expression (default: expression)")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: %(default)s)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="bytes per chunk (default: %(default)s)")
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='float', help="number engine (default: float)")
+    parser.add_argument('--precision', type=int, default=28, help="significant digits for the decimal engine")
+    args = parser.parse_args(argv)
+
+    options = {'precision': args.precision} if args.engine == 'decimal' else {}
+    source = sys.stdin.buffer if args.input == '-' else args.input
+    fmt = args.format or guess_format(args.input)
+    out = sys.stdout.buffer if args.output == '-' else open(args.output, 'wb')
+    try:
+        stats = evaluate_file(source, out, fmt, args.column, args.workers, get_engine(args.engine, **options),
+                              args.chunk_size)
+    except ValueError as exc:
+        print(f"batch: {exc}", file=sys.stderr)
+        return 2
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+        else:
+            out.flush()
+    print(stats.report(), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
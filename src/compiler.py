@@ -0,0 +1,186 @@
+"""Compile keystroke sequences into flat programs over CalculatorModel methods.
+
+A program keeps the model's immediate-execution semantics (2 + 3 × 4 = 20): it is the
+same sequence of model calls, with runs of digits merged into one input_digits call and
+keys that cannot change the outcome removed. Compiled programs are kept in a bounded
+LRU cache keyed by the normalized key sequence.
+"""
+import re
+import string
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+from itertools import islice
+
+from src.logic import CalculatorModel
+from src.keys import ALIASES, KEYS, OPERATOR_KEYS, normalize_key, tokenize
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+_ENTRY_CHARS = frozenset('0123456789.')
+
+# Like keys._TOKEN_RE, but a run of digits and points is one token
+_RUN_RE = re.compile(r"[0-9.]+|AC|\+/-|\S")
+# Characters of keys, their aliases and whitespace. 'A' is only valid in 'AC'; the
+# characters of '+/-' are keys by themselves
+_TEXT_CHARS = frozenset(''.join(KEYS | ALIASES.keys()) + string.whitespace)
+
+_input_digits = CalculatorModel.input_digits
+_set_operation = CalculatorModel.set_operation
+_NO_ARGS = {
+    '=': CalculatorModel.calculate,
+    '+/-': CalculatorModel.toggle_sign,
+    '%': CalculatorModel.percentage,
+    'AC': CalculatorModel.reset,
+}
+
+
+def normalize(keys) -> str:
+    """Canonical text of a key sequence, e.g. '12*3+4=' -> '1 2 × 3 + 4 ='."""
+    return _normalize(keys if isinstance(keys, str) else tuple(keys))
+
+
+@lru_cache(maxsize=4096)
+def _normalize(keys) -> str:
+    if isinstance(keys, str):
+        keys = tokenize(keys)
+    return ' '.join(keys)
+
+
+class Program:
+    __slots__ = ('keys', 'ops', '_result')
+
+    def __init__(self, keys: str, ops):
+        self.keys = keys
+        self.ops = ops  # tuple of (unbound model method, args)
+        self._result = None
+
+    def __len__(self):
+        return len(self.ops)
+
+    def __repr__(self):
+        return f"Program({self.keys!r}, {len(self.ops)} ops)"
+
+    def run(self, model=None):
+        """Execute against model (a fresh CalculatorModel by default) and return the display."""
+        if model is None:
+            # From a fresh model the outcome never changes, so it is only computed once
+            if self._result is None:
+                self._result = self.run(CalculatorModel())
+            return self._result
+        for method, args in self.ops:
+            method(model, *args)
+        return model.get_display()
+
+
+def compile_keys(keys) -> Program:
+    text = normalize(keys)
+    return Program(text, _compile_tokens(text.split(' ') if text else []))
+
+
+def run_text(text: str, model, step: int = 1024):
+    """Run free text such as a paste against model, step tokens at a time.
+
+    The whole text is checked first (ValueError if it is not calculator input). Returns a
+    generator that compiles and executes the next step tokens each time it is advanced;
+    runs of digits are scanned as one token and the text is never normalized as a whole.
+    Calculations before an AC still run when the model records history.
+    """
+    check_text(text)
+    return _run_tokens(_RUN_RE.finditer(text), model, step)
+
+
+def check_text(text: str):
+    """ValueError if text is not calculator input, as run_text checks it."""
+    if not _TEXT_CHARS.issuperset(text) or text.count('A') != text.count('AC'):
+        raise ValueError("Not calculator input")
+
+
+def _run_tokens(matches, model, step):
+    while True:
+        tokens = [m.group() for m in islice(matches, step)]
+        if not tokens:
+            return
+        tokens = [token if token[0] in _ENTRY_CHARS else normalize_key(token) for token in tokens]
+        for method, args in _compile_tokens(tokens, fold_clear=model.history is None):
+            method(model, *args)
+        yield
+
+
+def _compile_tokens(tokens, fold_clear=True):
+    # Tokens are canonical keys, or runs of entry characters
+
+    # Everything before the last AC is overwritten by it, unless fold_clear is off
+    # (a model with history must still record the calculations before it)
+    start = 0
+    if fold_clear:
+        for i in range(len(tokens) - 1, -1, -1):
+            if tokens[i] == 'AC':
+                start = i
+                break
+
+    ops = []
+    last = None  # last emitted key class: 'entry', 'op', '=' or the key itself
+    entry = []
+    for key in tokens[start:]:
+        if key[0] in _ENTRY_CHARS:
+            entry.append(key)
+            continue
+        if entry:
+            ops.append((_input_digits, (''.join(entry),)))
+            entry = []
+            last = 'entry'
+        if key in OPERATOR_KEYS:
+            op = OPERATOR_KEYS[key]
+            if last == 'op':
+                # A second operator only replaces the pending one
+                ops[-1] = (_set_operation, (op,))
+            else:
+                ops.append((_set_operation, (op,)))
+            last = 'op'
+        elif key == '=':
+            # '=' right after '=' finds no pending operation
+            if last != '=':
+                ops.append((_NO_ARGS[key], ()))
+            last = '='
+        else:
+            ops.append((_NO_ARGS[key], ()))
+            last = key
+    if entry:
+        ops.append((_input_digits, (''.join(entry),)))
+    return tuple(ops)
+
+
+class KeystrokeCompiler:
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._programs = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def compile(self, keys) -> Program:
+        key = normalize(keys)
+        programs = self._programs
+        program = programs.get(key)
+        if program is not None:
+            self.hits += 1
+            programs.move_to_end(key)
+            return program
+
+        self.misses += 1
+        program = compile_keys(key)
+        programs[key] = program
+        if len(programs) > self.maxsize:
+            programs.popitem(last=False)
+            self.evictions += 1
+        return program
+
+    def evaluate(self, keys, model=None) -> str:
+        return self.compile(keys).run(model)
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._programs))
+
+    def clear(self):
+        self._programs.clear()
+        self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,116 @@
+"""Run CalculatorModel operations in a worker process.
+
+A job is the model's engine, a CalculatorModel.snapshot() and the name and arguments of a
+model method. The worker rebuilds the model, calls the method and sends back the new
+snapshot, its display text and the history records it produced, so even formatting a
+huge result happens off the caller's thread. Big-number arithmetic holds the GIL, which
+is why this is a process and not a thread. Cancelling kills the process; the next job
+starts a new one.
+"""
+import multiprocessing
+import threading
+
+from src.logic import CalculatorModel
+
+
+class _Recorder:
+    # Stands in for a HistoryTape: keeps the records as text for the caller to append
+    def __init__(self):
+        self.records = []
+
+    def record(self, engine, left, operation, right, result):
+        self.records.append((engine.format(left), operation, engine.format(right), engine.format(result)))
+
+
+def run_job(engine, state, method, args):
+    recorder = _Recorder()
+    model = CalculatorModel(engine, history=recorder)
+    model.restore(state)
+    getattr(model, method)(*args)
+    return model.snapshot(), model.get_display(), recorder.records
+
+
+def _serve(conn):
+    while True:
+        try:
+            job_id, job = conn.recv()
+        except EOFError:
+            return
+        try:
+            result = run_job(*job)
+        except Exception as exc:
+            result = exc
+        conn.send((job_id, result))
+
+
+class WorkerProcess:
+    # on_result(job_id, result) is called from a reader thread, or from submit() if the job
+    # cannot be sent; result is the tuple from run_job or the exception it raised. If the
+    # process dies, its unanswered jobs fail with a ChildProcessError and the next job
+    # starts a new process. Every submitted job gets exactly one result.
+    def __init__(self, on_result):
+        self.on_result = on_result
+        self._process = None
+        self._conn = None
+        self._jobs = set()  # ids sent to the current process and not answered yet
+        # Guards _process, _conn and _jobs, which the reader thread resets when the process dies
+        self._lock = threading.Lock()
+
+    def submit(self, job_id, engine, state, method, args=()):
+        with self._lock:
+            if self._process is None:
+                self._start()
+            self._jobs.add(job_id)
+            try:
+                self._conn.send((job_id, (engine, state, method, args)))
+                return
+            except OSError as exc:  # the process died; its reader has not noticed yet
+                self._jobs.discard(job_id)
+                error = ChildProcessError(f"cannot send to the worker process: {exc}")
+        self.on_result(job_id, error)
+
+    def _start(self):
+        # spawn: forking a process that runs Qt threads is not safe
+        context = multiprocessing.get_context('spawn')
+        conn, child_conn = context.Pipe()
+        self._process = process = context.Process(target=_serve, args=(child_conn,), daemon=True)
+        process.start()
+        child_conn.close()
+        self._conn = conn
+        self._jobs = jobs = set()
+        threading.Thread(target=self._read, args=(process, conn, jobs), daemon=True).start()
+
+    def _read(self, process, conn, jobs):
+        # The reader closes conn once the process is gone: closing it from another thread
+        # while this one reads could hand its file descriptor to the next process's pipe
+        while True:
+            try:
+                job_id, result = conn.recv()
+            except (EOFError, OSError):
+                break
+            with self._lock:
+                jobs.discard(job_id)
+            self.on_result(job_id, result)
+        with self._lock:
+            conn.close()
+            if process is not self._process:
+                return  # cancelled
+            self._process = None
+            self._conn = None
+            failed = sorted(jobs)
+            jobs.clear()
+        process.join()
+        error = ChildProcessError(f"worker process exited with code {process.exitcode}")
+        for job_id in failed:
+            self.on_result(job_id, error)
+
+    def cancel(self):
+        # The reader sees the end of the pipe and closes it
+        with self._lock:
+            process, self._process, self._conn = self._process, None, None
+        if process is None:
+            return
+        process.kill()
+        process.join()
+
+    close = cancel
@@ -0,0 +1,264 @@
+"""CalculatorModel semantics as an explicit transition table over (state, key class).
+
+The flags CalculatorModel checks on every key (new_entry, error_state, whether an
+operation is pending, whether the display is a typed entry or a computed value and
+whether the entry has a point) become one control state. Every canonical key of a
+state maps to an action and the next state, so pressing a key is one table lookup and
+one call; actions only move numbers. The table is spelled out in TRANSITIONS and is
+checked against CalculatorModel by src/fuzz.py.
+
+Typed entries are kept as a signed int mantissa and a scale, without CalculatorModel's
+digit buffer for very long entries; the displays are the same.
+"""
+from src.logic import FLOAT_ENGINE, Operation, format_entry, _ENGINE_METHODS, _INT_OPERATIONS
+from src.keys import DIGITS, KEYS, OPERATOR_KEYS
+
+# Control states. FRESH: nothing typed since AC, '=' or '%'; TYPING: an entry is being
+# typed; OPERATOR: an operation is pending and its operand not started; OPERAND: the
+# operand is being typed. _ENTRY/_VALUE: the display is a typed entry or a computed
+# value; _INT/_POINT: the entry being typed has no point or has one.
+(FRESH_ENTRY, FRESH_VALUE, TYPING_INT, TYPING_POINT,
+ OPERATOR_ENTRY, OPERATOR_VALUE, OPERAND_INT, OPERAND_POINT, ERROR) = range(9)
+STATE_NAMES = ('FRESH_ENTRY', 'FRESH_VALUE', 'TYPING_INT', 'TYPING_POINT',
+               'OPERATOR_ENTRY', 'OPERATOR_VALUE', 'OPERAND_INT', 'OPERAND_POINT', 'ERROR')
+
+KEY_CLASSES = {d: 'digit' for d in DIGITS}
+KEY_CLASSES.update({k: 'operator' for k in OPERATOR_KEYS})
+KEY_CLASSES.update({'.': 'point', '=': 'equals', '+/-': 'sign', '%': 'percent', 'AC': 'clear'})
+
+# state -> key class -> (action, next state). 'chain' calculates the pending operation
+# before taking the new one; actions that can fail go to ERROR instead.
+TRANSITIONS = {
+    FRESH_ENTRY: {
+        'digit': ('start', TYPING_INT), 'point': ('start_point', TYPING_POINT),
+        'operator': ('take', OPERATOR_ENTRY), 'equals': ('none', FRESH_ENTRY),
+        'sign': ('none', FRESH_ENTRY),  # the entry is always "0" here
+        'percent': ('percent', FRESH_VALUE), 'clear': ('reset', FRESH_ENTRY),
+    },
+    FRESH_VALUE: {
+        'digit': ('start', TYPING_INT), 'point': ('start_point', TYPING_POINT),
+        'operator': ('take', OPERATOR_VALUE), 'equals': ('none', FRESH_VALUE),
+        'sign': ('negate', FRESH_VALUE), 'percent': ('percent', FRESH_VALUE), 'clear': ('reset', FRESH_ENTRY),
+    },
+    TYPING_INT: {
+        'digit': ('append', TYPING_INT), 'point': ('point', TYPING_POINT),
+        'operator': ('take', OPERATOR_ENTRY), 'equals': ('none', TYPING_INT),
+        'sign': ('toggle', TYPING_INT), 'percent': ('percent', FRESH_VALUE), 'clear': ('reset', FRESH_ENTRY),
+    },
+    TYPING_POINT: {
+        'digit': ('append_fraction', TYPING_POINT), 'point': ('none', TYPING_POINT),
+        'operator': ('take', OPERATOR_ENTRY), 'equals': ('none', TYPING_POINT),
+        'sign': ('toggle_point', TYPING_POINT), 'percent': ('percent', FRESH_VALUE),
+        'clear': ('reset', FRESH_ENTRY),
+    },
+    OPERATOR_ENTRY: {
+        'digit': ('start', OPERAND_INT), 'point': ('start_point', OPERAND_POINT),
+        'operator': ('take', OPERATOR_ENTRY), 'equals': ('calculate', FRESH_VALUE),
+        'sign': ('toggle', OPERATOR_ENTRY), 'percent': ('percent', OPERATOR_VALUE),
+        'clear': ('reset', FRESH_ENTRY),
+    },
+    OPERATOR_VALUE: {
+        'digit': ('start', OPERAND_INT), 'point': ('start_point', OPERAND_POINT),
+        'operator': ('take', OPERATOR_VALUE), 'equals': ('calculate', FRESH_VALUE),
+        'sign': ('negate', OPERATOR_VALUE), 'percent': ('percent', OPERATOR_VALUE),
+        'clear': ('reset', FRESH_ENTRY),
+    },
+    OPERAND_INT: {
+        'digit': ('append', OPERAND_INT), 'point': ('point', OPERAND_POINT),
+        'operator': ('chain', OPERATOR_VALUE), 'equals': ('calculate', FRESH_VALUE),
+        'sign': ('toggle', OPERAND_INT), 'percent': ('percent', OPERATOR_VALUE), 'clear': ('reset', FRESH_ENTRY),
+    },
+    OPERAND_POINT: {
+        'digit': ('append_fraction', OPERAND_POINT), 'point': ('none', OPERAND_POINT),
+        'operator': ('chain', OPERATOR_VALUE), 'equals': ('calculate', FRESH_VALUE),
+        'sign': ('toggle_point', OPERAND_POINT), 'percent': ('percent', OPERATOR_VALUE),
+        'clear': ('reset', FRESH_ENTRY),
+    },
+    ERROR: {
+        'digit': ('restart', TYPING_INT), 'point': ('restart_point', TYPING_POINT),
+        'operator': ('none', ERROR), 'equals': ('none', ERROR), 'sign': ('none', ERROR),
+        'percent': ('none', ERROR), 'clear': ('reset', FRESH_ENTRY),
+    },
+}
+
+_VALUE_STATES = frozenset((FRESH_VALUE, OPERATOR_VALUE))
+_WITHOUT_POINT = {TYPING_POINT: TYPING_INT, OPERAND_POINT: OPERAND_INT}
+_OPERATIONS = dict(OPERATOR_KEYS)
+_DIGIT_VALUES = {d: int(d) for d in DIGITS}
+
+
+class StateMachineCalculator:
+    __slots__ = ('engine', 'state', 'mantissa', 'scale', 'value', 'pending_value', 'pending_operation',
+                 '_display')
+
+    def __init__(self, engine=None):
+        self.engine = engine if engine is not None else FLOAT_ENGINE
+        self.state = FRESH_ENTRY
+        self._reset()
+
+    def press(self, key: str):
+        """Apply one canonical key (see src.keys.KEYS)."""
+        action, arg, next_state = _TABLE[self.state][key]
+        self.state = action(self, arg, next_state)
+
+    def press_keys(self, keys):
+        table = _TABLE
+        for key in keys:
+            action, arg, next_state = table[self.state][key]
+            self.state = action(self, arg, next_state)  # actions read the state they start from
+
+    def reset(self):
+        self.press('AC')
+
+    def get_display(self) -> str:
+        if self._display is None:
+            if self.state == ERROR:
+                self._display = "Error"
+            elif self.state in _VALUE_STATES:
+                self._display = self.engine.format(self.value)
+            else:
+                self._display = format_entry(self.mantissa, self.scale)
+        return self._display
+
+    def _current(self):
+        if self.state in _VALUE_STATES:
+            return self.value
+        return self.engine.from_entry(self.mantissa, self.scale)
+
+    # Actions: (self, key argument, next state from the table) -> the state to move to
+
+    def _none(self, arg, next_state):
+        return next_state
+
+    def _reset(self, arg=None, next_state=FRESH_ENTRY):
+        self.mantissa = 0
+        self.scale = -1
+        self.value = None
+        self.pending_value = None
+        self.pending_operation = Operation.NONE
+        self._display = "0"
+        return next_state
+
+    def _start(self, digit, next_state):
+        self.mantissa = digit
+        self.scale = -1
+        self._display = None
+        return next_state
+
+    def _start_point(self, arg, next_state):
+        self.mantissa = 0
+        self.scale = 0
+        self._display = None
+        return next_state
+
+    def _restart(self, digit, next_state):
+        self._reset()
+        return self._start(digit, next_state)
+
+    def _restart_point(self, arg, next_state):
+        self._reset()
+        return self._start_point(arg, next_state)
+
+    def _append(self, digit, next_state):
+        # A leading "0" is replaced, which is the same as 0 * 10 + digit
+        self.mantissa = self.mantissa * 10 - digit if self.mantissa < 0 else self.mantissa * 10 + digit
+        self._display = None
+        return next_state
+
+    def _append_fraction(self, digit, next_state):
+        self.scale += 1
+        return self._append(digit, next_state)
+
+    def _point(self, arg, next_state):
+        self.scale = 0
+        self._display = None
+        return next_state
+
+    def _toggle(self, arg, next_state):
+        # The entry continues from the negated number, which drops trailing fractional
+        # zeros and a bare point ("1.50" -> "-1.5", "3." -> "-3")
+        if self.mantissa == 0 and self.scale < 0:
+            return next_state  # "0"
+        mantissa, scale = -self.mantissa, self.scale
+        while scale > 0 and mantissa % 10 == 0:
+            mantissa //= 10
+            scale -= 1
+        self.mantissa = mantissa
+        self.scale = scale if scale > 0 else -1
+        self._display = None
+        return next_state
+
+    def _toggle_point(self, arg, next_state):
+        self._toggle(arg, next_state)
+        return next_state if self.scale >= 0 else _WITHOUT_POINT[next_state]
+
+    def _negate(self, arg, next_state):
+        if self.get_display() != "0":
+            self.value = -self.value
+            self._display = None
+        return next_state
+
+    def _percent(self, arg, next_state):
+        try:
+            self.value = self.engine.percent(self._current())
+        except Exception:
+            return self._error()
+        self._display = None
+        return next_state
+
+    def _take(self, op, next_state):
+        try:
+            self.pending_value = self._current()
+        except Exception:
+            return self._error()
+        self.pending_operation = op
+        return next_state
+
+    def _chain(self, op, next_state):
+        # 2 + 3 × calculates 2 + 3 first; the result is already the pending value
+        if self._calculate(None, next_state) == ERROR:
+            return ERROR
+        self.pending_operation = op
+        return next_state
+
+    def _calculate(self, arg, next_state):
+        try:
+            current = self._current()
+            pending = self.pending_value
+            op = self.pending_operation
+            if op == Operation.DIVIDE and current == 0:
+                return self._error()
+            result = None
+            if type(pending) is int and type(current) is int:
+                result = _INT_OPERATIONS[op](pending, current)
+                if result is not None and not -self.engine.int_limit < result < self.engine.int_limit:
+                    result = None
+            if result is None:
+                result = getattr(self.engine, _ENGINE_METHODS[op])(pending, current)
+        except Exception:
+            return self._error()
+        self.value = self.pending_value = result
+        self.pending_operation = Operation.NONE
+        self._display = None
+        return next_state
+
+    def _error(self):
+        self._display = "Error"
+        return ERROR
+
+
+def _compile():
+    # TRANSITIONS over key classes -> per state, every canonical key -> (function, arg, next state)
+    args = {'start': _DIGIT_VALUES, 'restart': _DIGIT_VALUES, 'append': _DIGIT_VALUES,
+            'append_fraction': _DIGIT_VALUES, 'take': _OPERATIONS, 'chain': _OPERATIONS}
+    table = []
+    for state in range(len(STATE_NAMES)):
+        row = {}
+        for key in KEYS:
+            name, next_state = TRANSITIONS[state][KEY_CLASSES[key]]
+            row[key] = (getattr(StateMachineCalculator, '_' + name), args.get(name, {}).get(key), next_state)
+        table.append(row)
+    return tuple(table)
+
+
+_TABLE = _compile()
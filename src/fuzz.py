@@ -0,0 +1,134 @@
+"""Differential fuzzer: StateMachineCalculator against CalculatorModel (no Qt required).
+
+    python3 src/fuzz.py [--seconds 60] [--seed N] [--max-length 24] [--engine float]
+
+Runs random key sequences through both from a cleared state and compares the display,
+the pending operation and the error state at the end of each. A difference is shrunk
+to a shortest failing sequence and printed; the exit status is then 1.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add the project root (one level up from src) to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.logic import CalculatorModel
+from src.fsm import ERROR, StateMachineCalculator
+from src.keys import DIGITS, key_actions
+from src.precision import ENGINES, get_engine
+
+# Digits dominate so entries get long enough to reach the model's digit buffer
+KEY_WEIGHTS = {d: 6 for d in DIGITS}
+KEY_WEIGHTS.update({'.': 3, '+': 3, '−': 3, '×': 3, '÷': 4, '=': 4, '+/-': 3, '%': 2, 'AC': 1})
+
+
+class FuzzStats:
+    def __init__(self):
+        self.sequences = 0
+        self.keys = 0
+        self.elapsed = 0.0
+        self.failure = None  # shortest failing key sequence
+
+    @property
+    def sequences_per_minute(self):
+        return self.sequences * 60 / self.elapsed if self.elapsed else 0.0
+
+
+def outcome(calculator):
+    if isinstance(calculator, StateMachineCalculator):
+        return calculator.get_display(), calculator.pending_operation, calculator.state == ERROR
+    return calculator.get_display(), calculator.pending_operation, calculator.error_state
+
+
+def differs(keys, engine=None) -> bool:
+    model = CalculatorModel(engine)
+    actions = key_actions(model)
+    for key in keys:
+        actions[key]()
+    machine = StateMachineCalculator(engine)
+    machine.press_keys(keys)
+    return outcome(model) != outcome(machine)
+
+
+def shrink(keys, engine=None):
+    # Drops keys one at a time while the sequence still fails
+    keys = list(keys)
+    i = 0
+    while i < len(keys):
+        candidate = keys[:i] + keys[i + 1:]
+        if differs(candidate, engine):
+            keys = candidate
+        else:
+            i += 1
+    return keys
+
+
+def fuzz(seconds=60.0, seed=None, max_length=24, engine=None, stats=None):
+    if stats is None:
+        stats = FuzzStats()
+    rng = random.Random(seed)
+    population, weights = list(KEY_WEIGHTS), list(KEY_WEIGHTS.values())
+    choices, randint = rng.choices, rng.randint
+    model = CalculatorModel(engine)
+    actions = key_actions(model)
+    reset = actions['AC']
+    machine = StateMachineCalculator(engine)
+    press_keys = machine.press_keys
+    start = time.perf_counter()
+    deadline = start + seconds
+    sequences = keys_run = 0
+    try:
+        while True:
+            # The clock is read once per 1024 sequences
+            for _ in range(1024):
+                keys = choices(population, weights, k=randint(1, max_length))
+                reset()
+                for key in keys:
+                    actions[key]()
+                machine.reset()
+                press_keys(keys)
+                sequences += 1
+                keys_run += len(keys)
+                if outcome(model) != outcome(machine):
+                    stats.failure = shrink(keys, engine)
+                    return stats
+            if time.perf_counter() >= deadline:
+                return stats
+    finally:
+        stats.sequences += sequences
+        stats.keys += keys_run
+        stats.elapsed += time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check StateMachineCalculator against CalculatorModel.")
+    parser.add_argument('--seconds', type=float, default=60.0, help="how long to run (default: 60)")
+    parser.add_argument('--seed', type=int, help="random seed (default: random)")
+    parser.add_argument('--max-length', type=int, default=24, help="longest key sequence (default: 24)")
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='float', help="number engine (default: float)")
+    parser.add_argument('--precision', type=int, default=28, help="significant digits for the decimal engine")
+    args = parser.parse_args(argv)
+
+    options = {'precision': args.precision} if args.engine == 'decimal' else {}
+    engine = get_engine(args.engine, **options)
+    stats = fuzz(args.seconds, args.seed, args.max_length, engine)
+    print(f"{stats.sequences:,} sequences, {stats.keys:,} keys in {stats.elapsed:.1f}s "
+          f"({stats.sequences_per_minute:,.0f} sequences/min)", file=sys.stderr)
+    if stats.failure is not None:
+        keys = stats.failure
+        model = CalculatorModel(engine)
+        actions = key_actions(model)
+        for key in keys:
+            actions[key]()
+        machine = StateMachineCalculator(engine)
+        machine.press_keys(keys)
+        print(f"MISMATCH after {' '.join(keys)}: model {outcome(model)}, state machine {outcome(machine)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Calculation history kept in a memory-mapped ring buffer of fixed-width records.
+
+The file is a 64-byte header followed by records of 128 bytes: a float64 timestamp, the
+operation code and the left operand, right operand and result as UTF-8 text. Text too
+long for its field is cut and ends in '…'. A new file has room for INITIAL_CAPACITY
+records and doubles as it fills, up to ``capacity`` records; from then on the oldest
+records are overwritten. Opening a tape only maps the file, so reopening is instant at
+any size. Appends take an exclusive lock on the file, so instances of
+the app that share a tape never write to the same slot.
+"""
+import mmap
+import os
+import struct
+import time
+from collections import namedtuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are not locked
+    fcntl = None
+
+from src.logic import Operation
+
+HistoryEntry = namedtuple('HistoryEntry', ['left', 'operation', 'right', 'result', 'timestamp'])
+UNREADABLE = HistoryEntry('', None, '', '', None)  # a record that cannot be decoded
+
+MAGIC = b'CALCTAPE'
+VERSION = 1
+DEFAULT_CAPACITY = 1 << 16  # records kept, an 8 MiB file when full
+INITIAL_CAPACITY = 1 << 10  # records a new file has room for (128 KiB)
+
+# Magic, version, record size, records the file has room for, records written, and the
+# capacity it grows to (0 in files made before tapes grew: they never grow)
+_HEADER = struct.Struct('<8sIIQQQ')
+_HEADER_SIZE = 64
+_RECORD = struct.Struct('<dB39s40s40s')  # timestamp, operation, left, right, result
+_COUNT = struct.Struct('<Q')
+_SIZE_OFFSET = 16
+_MAX_TIMESTAMP = 1e11  # seconds, past what time.localtime() accepts everywhere
+_COUNT_OFFSET = 24
+
+_OPERATIONS = (Operation.ADD, Operation.SUBTRACT, Operation.MULTIPLY, Operation.DIVIDE)
+_OPERATION_CODES = {op: code for code, op in enumerate(_OPERATIONS)}
+
+
+def _field(text: str, size: int) -> bytes:
+    data = text.encode('utf-8')
+    if len(data) <= size:
+        return data
+    return data[:size - 3].decode('utf-8', 'ignore').encode('utf-8') + '…'.encode('utf-8')
+
+
+def _text(field: bytes) -> str:
+    return field.rstrip(b'\0').decode('utf-8')
+
+
+class HistoryTape:
+    def __init__(self, path: str, capacity: int = DEFAULT_CAPACITY):
+        self.path = path
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self._file = open(path, 'r+b' if exists else 'w+b')
+        try:
+            if exists:
+                header = self._file.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    raise ValueError(f"{path} is not a history tape")
+                magic, version, record_size, size, _, capacity = _HEADER.unpack(header)
+                if magic != MAGIC or version != VERSION or record_size != _RECORD.size:
+                    raise ValueError(f"{path} is not a version {VERSION} history tape")
+                capacity = capacity or size
+                # Another process may be growing it
+                if os.path.getsize(path) < _HEADER_SIZE + size * _RECORD.size:
+                    raise ValueError(f"{path} is truncated")
+            else:
+                size = min(capacity, INITIAL_CAPACITY)
+                self._file.truncate(_HEADER_SIZE + size * _RECORD.size)
+                self._file.write(_HEADER.pack(MAGIC, VERSION, _RECORD.size, size, 0, capacity))
+                self._file.flush()
+            self._map = mmap.mmap(self._file.fileno(), _HEADER_SIZE + size * _RECORD.size)
+        except BaseException:
+            self._file.close()
+            raise
+        self.capacity = capacity
+        self._size = size  # records the map has room for
+        self.total = _HEADER.unpack_from(self._map)[4]
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def __getitem__(self, index: int) -> HistoryEntry:
+        # 0 is the oldest record still on the tape
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("history index out of range")
+        slot = (self.total - size + index) % self.capacity
+        timestamp, code, left, right, result = _RECORD.unpack_from(self._map, _HEADER_SIZE + slot * _RECORD.size)
+        # A crash in the middle of a write can leave a torn record
+        if code >= len(_OPERATIONS) or not 0.0 <= timestamp < _MAX_TIMESTAMP:
+            return UNREADABLE
+        try:
+            return HistoryEntry(_text(left), _OPERATIONS[code], _text(right), _text(result), timestamp)
+        except UnicodeDecodeError:
+            return UNREADABLE
+
+    def append(self, left: str, operation: Operation, right: str, result: str, timestamp: float = None):
+        if timestamp is None:
+            timestamp = time.time()
+        record = (timestamp, _OPERATION_CODES[operation], _field(left, 39), _field(right, 40), _field(result, 40))
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        try:
+            # Another process may have appended, or grown the file, since this one last did
+            size = _COUNT.unpack_from(self._map, _SIZE_OFFSET)[0]
+            self.total = _COUNT.unpack_from(self._map, _COUNT_OFFSET)[0]
+            if self.total == size < self.capacity:
+                size = min(self.capacity, size * 2)
+                self._file.truncate(_HEADER_SIZE + size * _RECORD.size)
+                _COUNT.pack_into(self._map, _SIZE_OFFSET, size)
+            if size != self._size:
+                self._map.close()
+                self._map = mmap.mmap(self._file.fileno(), _HEADER_SIZE + size * _RECORD.size)
+                self._size = size
+            slot = self.total % self.capacity
+            _RECORD.pack_into(self._map, _HEADER_SIZE + slot * _RECORD.size, *record)
+            # The count is written after the record, so a crash never exposes a partial one
+            self.total += 1
+            _COUNT.pack_into(self._map, _COUNT_OFFSET, self.total)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def record(self, engine, left, operation, right, result):
+        # CalculatorModel.history hook: values are stored as the engine displays them
+        self.append(engine.format(left), operation, engine.format(right), engine.format(result))
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self):
+        if not self._map.closed:
+            self._map.flush()
+            self._map.close()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,60 @@
+"""Hands a launch over to a calculator that is already running (no Qt on POSIX).
+
+The running process listens on a local socket (see src/ui/windows.py). A later launch
+sends ``open`` and the running process opens another window and replies ``ok``. On
+POSIX the socket is a file in the temporary directory and is reached with the socket
+module, so a handed-over launch never loads Qt; Windows uses a named pipe through
+QLocalSocket.
+"""
+import getpass
+import os
+import sys
+import tempfile
+
+OPEN = b'open\n'
+OK = b'ok\n'
+
+
+def instance_address(name: str = 'calculator') -> str:
+    # One instance per user
+    name = f"{name}-{getpass.getuser()}"
+    if sys.platform == 'win32':
+        return name
+    return os.path.join(tempfile.gettempdir(), name + '.sock')
+
+
+def request_window(address: str, timeout: float = 1.0) -> bool:
+    """Ask the instance at address to open a window; False if none is running."""
+    if sys.platform == 'win32':
+        return _request_window_qt(address, timeout)
+    import socket
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(address)
+            sock.sendall(OPEN)
+            reply = b''
+            while not reply.endswith(b'\n'):
+                chunk = sock.recv(16)
+                if not chunk:
+                    break
+                reply += chunk
+        except OSError:
+            return False  # no server, a stale socket file, or no reply in time
+    return reply == OK
+
+
+def _request_window_qt(address, timeout):
+    from PyQt6.QtNetwork import QLocalSocket
+    sock = QLocalSocket()
+    sock.connectToServer(address)
+    ms = int(timeout * 1000)
+    if not sock.waitForConnected(ms):
+        return False
+    sock.write(OPEN)
+    if not sock.waitForBytesWritten(ms):
+        return False
+    reply = b''
+    while not reply.endswith(b'\n') and sock.waitForReadyRead(ms):
+        reply += bytes(sock.readAll())
+    return reply == OK
@@ -0,0 +1,69 @@
+import re
+from functools import partial
+
+from src.logic import Operation
+
+# Canonical key names, as printed on the keypad
+DIGITS = '0123456789'
+OPERATOR_KEYS = {'+': Operation.ADD, '−': Operation.SUBTRACT, '×': Operation.MULTIPLY, '÷': Operation.DIVIDE}
+
+# ASCII spellings accepted in keystroke logs and pasted text
+ALIASES = {'-': '−', '*': '×', 'x': '×', 'X': '×', '/': '÷', 'C': 'AC'}
+
+KEYS = frozenset(DIGITS) | {'.', '+/-', '%', '=', 'AC'} | OPERATOR_KEYS.keys()
+
+_TOKEN_RE = re.compile(r"AC|\+/-|\S")
+
+# Trailing text that may be the start of a multi-character key split across chunks
+_PARTIAL_TAILS = ('+/', '+', 'A')
+
+
+def normalize_key(token: str) -> str:
+    key = ALIASES.get(token, token)
+    if key not in KEYS:
+        raise ValueError(f"Unknown key: {token!r}")
+    return key
+
+
+def tokenize(text: str):
+    """Split a keystroke string such as '12×3+4=' into canonical keys."""
+    return [normalize_key(token) for token in _TOKEN_RE.findall(text)]
+
+
+def iter_keys(chunks):
+    """Yield canonical keys from an iterable of text chunks of any size."""
+    carry = ""
+    for chunk in chunks:
+        text = carry + chunk
+        carry = ""
+        for tail in _PARTIAL_TAILS:
+            if text.endswith(tail):
+                carry = tail
+                text = text[:-len(tail)]
+                break
+        for token in _TOKEN_RE.findall(text):
+            yield normalize_key(token)
+    if carry:
+        for token in _TOKEN_RE.findall(carry):
+            yield normalize_key(token)
+
+
+def key_actions(model):
+    """Map every canonical key to a zero-argument callable bound to model."""
+    actions = {d: partial(model.input_digit, d) for d in DIGITS}
+    actions.update({op_key: partial(model.set_operation, op) for op_key, op in OPERATOR_KEYS.items()})
+    actions.update({
+        '.': model.input_decimal,
+        '+/-': model.toggle_sign,
+        '%': model.percentage,
+        '=': model.calculate,
+        'AC': model.reset,
+    })
+    return actions
+
+
+def apply_keys(model, keys):
+    actions = key_actions(model)
+    for key in keys:
+        actions[key]()
+    return model.get_display()
@@ -1,6 +1,8 @@
-import math
+import operator
 from enum import Enum
 
+from src.precision import FloatEngine, format_number
+
 class Operation(Enum):
     ADD = '+'
     SUBTRACT = '-'
@@ -8,40 +10,216 @@ class Operation(Enum):
     DIVIDE = '÷'
     NONE = None
 
+_DIGIT_VALUES = {str(d): d for d in range(10)}
+_DIGIT_CODES = {str(d): ord(str(d)) for d in range(10)}
+
+# Typed entries longer than this many digits move from an int to a digit buffer,
+# so each further digit is an O(1) append instead of an O(n) multiply
+_ENTRY_INT_DIGITS = 18
+_ENTRY_INT_LIMIT = 10 ** _ENTRY_INT_DIGITS
+
+
+def _exact_divide(a: int, b: int):
+    return a // b if a % b == 0 else None
+
+# Integer fast path; anything that does not come out as an int within the engine's
+# int_limit is recomputed by the engine
+_INT_OPERATIONS = {
+    Operation.ADD: operator.add,
+    Operation.SUBTRACT: operator.sub,
+    Operation.MULTIPLY: operator.mul,
+    Operation.DIVIDE: _exact_divide,
+}
+_ENGINE_METHODS = {
+    Operation.ADD: 'add',
+    Operation.SUBTRACT: 'subtract',
+    Operation.MULTIPLY: 'multiply',
+    Operation.DIVIDE: 'divide',
+}
+
+FLOAT_ENGINE = FloatEngine()
+
+
+def format_entry(mantissa: int, scale: int) -> str:
+    # Rebuild a typed entry as keyed in: scale is the digit count after the point,
+    # or -1 when no point was typed, e.g. (150, 2) -> "1.50", (3, 0) -> "3."
+    if scale < 0:
+        return str(mantissa)
+    text = str(abs(mantissa)).rjust(scale + 1, '0')
+    text = text[:len(text) - scale] + '.' + text[len(text) - scale:]
+    return '-' + text if mantissa < 0 else text
+
+
 class CalculatorModel:
-    def __init__(self):
+    # The current value is either a typed entry, kept as a signed integer mantissa and
+    # the number of digits after the point, or a computed number in _value (None while
+    # typing). Nothing is parsed back from the display; the display string is only built
+    # on request and cached until the state changes. Entries too long for a machine-size
+    # int are kept in _digits, the typed characters without the point.
+    __slots__ = ('engine', 'history', '_mantissa', '_scale', '_digits', '_value', '_display',
+                 'pending_value', 'pending_operation', 'new_entry', 'error_state')
+
+    def __init__(self, engine=None, history=None):
+        self.engine = engine if engine is not None else FLOAT_ENGINE
+        # Optional recorder with a record(engine, left, operation, right, result) method,
+        # called for every completed operation (see src/history.py)
+        self.history = history
         self.reset()
-        
+
     def reset(self):
-        self.current_value = "0"
+        self._mantissa = 0
+        self._scale = -1
+        self._digits = None
+        self._value = None
+        self._display = "0"
         self.pending_value = None
         self.pending_operation = Operation.NONE
         self.new_entry = True  # Flag to start a new number on next digit input
         self.error_state = False
 
+    @property
+    def current_value(self):
+        return self.get_display()
+
+    def _current(self):
+        if self._value is not None:
+            return self._value
+        if self._digits is not None:
+            return self.engine.from_text(self.get_display())
+        return self.engine.from_entry(self._mantissa, self._scale)
+
+    def _set_result(self, value):
+        self._value = value
+        self._digits = None
+        self._display = None
+
+    def set_error(self):
+        self._display = "Error"
+        self.error_state = True
+
     def input_digit(self, digit: str):
+        if digit == '.':
+            self.input_decimal()
+            return
         if self.error_state:
             self.reset()
-            
+
         if self.new_entry:
-            self.current_value = digit
+            self._mantissa = _DIGIT_VALUES[digit]
+            self._scale = -1
+            self._digits = None
+            self._value = None
             self.new_entry = False
         else:
-            if self.current_value == "0" and digit != ".":
-                self.current_value = digit
+            if self._scale >= 0:
+                self._scale += 1
+            if self._digits is not None:
+                self._digits.append(_DIGIT_CODES[digit])
             else:
-                self.current_value += digit
-                
+                # A leading "0" is replaced, which is the same as 0 * 10 + digit
+                if self._mantissa < 0:
+                    mantissa = self._mantissa * 10 - _DIGIT_VALUES[digit]
+                else:
+                    mantissa = self._mantissa * 10 + _DIGIT_VALUES[digit]
+                if -_ENTRY_INT_LIMIT < mantissa < _ENTRY_INT_LIMIT:
+                    self._mantissa = mantissa
+                else:
+                    self._digits = bytearray(format_entry(mantissa, self._scale).replace('.', ''), 'ascii')
+        self._display = None
+
+    def input_digits(self, text: str):
+        # Same as calling input_digit for every character of a run of digits and points,
+        # but long runs are appended to the entry in one step
+        if not text:
+            return
+        if self.error_state or self.new_entry:
+            head, point, tail = text.partition('.')
+            tail = tail.replace('.', '')
+            if len(head) + len(tail) <= _ENTRY_INT_DIGITS:
+                # A whole short entry: leading zeros are replaced as they are typed
+                if self.error_state:
+                    self.reset()
+                self._mantissa = int(head + tail) if head or tail else 0
+                self._scale = len(tail) if point else -1
+                self._digits = None
+                self._value = None
+                self.new_entry = False
+                self._display = None
+                return
+            self.input_digit(text[0])
+            text = text[1:]
+        if self._scale >= 0:
+            text = text.replace('.', '')
+        elif '.' in text:
+            head, _, tail = text.partition('.')
+            text = head + '.' + tail.replace('.', '')
+        if len(text) <= _ENTRY_INT_DIGITS:
+            for ch in text:
+                self.input_digit(ch)
+            return
+
+        if self._digits is None:
+            if self._mantissa == 0 and self._scale < 0:
+                # Typing into a bare "0" replaces it
+                text = text.lstrip('0')
+                if not text:
+                    return
+                base = '0' if text[0] == '.' else ''
+            else:
+                base = format_entry(self._mantissa, self._scale).replace('.', '')
+            self._digits = bytearray(base, 'ascii')
+        digits = text.replace('.', '')
+        self._digits.extend(digits.encode('ascii'))
+        if self._scale >= 0:
+            self._scale += len(digits)
+        elif len(digits) != len(text):
+            self._scale = len(text) - text.index('.') - 1
+        self._display = None
+
+    def backspace(self):
+        # Deletes the last typed character of an entry; results cannot be edited
+        if self.error_state:
+            self.reset()
+            return
+        if self.new_entry or self._value is not None:
+            return
+
+        if self._scale == 0:
+            self._scale = -1  # the point itself
+        elif self._digits is not None:
+            self._digits = self._digits[:-1]  # not in place, see snapshot()
+            if self._scale > 0:
+                self._scale -= 1
+            if not self._digits.strip(b'-'):
+                self._digits = None
+                self._mantissa = 0
+                self._scale = -1
+        else:
+            if self._scale > 0:
+                self._scale -= 1
+            if self._mantissa < 0:
+                self._mantissa = -(-self._mantissa // 10)
+                if self._mantissa == 0 and self._scale >= 0:
+                    # "-0.5" -> "-0.": an int zero has no sign, so the digit buffer keeps it
+                    self._digits = bytearray(b'-' + b'0' * (self._scale + 1))
+            else:
+                self._mantissa //= 10
+        self._display = None
+
     def input_decimal(self):
         if self.error_state:
             self.reset()
-            
+
         if self.new_entry:
-            self.current_value = "0."
+            self._mantissa = 0
+            self._digits = None
+            self._value = None
             self.new_entry = False
-        elif "." not in self.current_value:
-            self.current_value += "."
-            
+        elif self._scale >= 0:
+            return
+        self._scale = 0
+        self._display = None
+
     def set_operation(self, op: Operation):
         if self.error_state:
             return
@@ -49,76 +227,153 @@ class CalculatorModel:
         if self.pending_operation != Operation.NONE and not self.new_entry:
             # Chain calculation if user presses 2 + 3 * (calculate 2+3 first)
             self.calculate()
-            
-        self.pending_value = float(self.current_value)
+            if self.error_state:
+                return
+
+        try:
+            self.pending_value = self._current()
+        except Exception:
+            self.set_error()
+            return
         self.pending_operation = op
         self.new_entry = True
-        
+
     def calculate(self):
         if self.error_state or self.pending_operation == Operation.NONE or self.pending_value is None:
             return
 
         try:
-            current = float(self.current_value)
-            result = 0.0
-            
-            if self.pending_operation == Operation.ADD:
-                result = self.pending_value + current
-            elif self.pending_operation == Operation.SUBTRACT:
-                result = self.pending_value - current
-            elif self.pending_operation == Operation.MULTIPLY:
-                result = self.pending_value * current
-            elif self.pending_operation == Operation.DIVIDE:
-                if current == 0:
-                    self.current_value = "Error"
-                    self.error_state = True
-                    return
-                result = self.pending_value / current
-                
-            # Format result to remove trailing .0 if integer
-            if result.is_integer():
-                self.current_value = str(int(result))
-            else:
-                self.current_value = str(result)
-                
+            current = self._current()
+            pending = self.pending_value
+            op = self.pending_operation
+
+            if op == Operation.DIVIDE and current == 0:
+                self.set_error()
+                return
+
+            result = None
+            if type(pending) is int and type(current) is int:
+                result = _INT_OPERATIONS[op](pending, current)
+                if result is not None and not -self.engine.int_limit < result < self.engine.int_limit:
+                    result = None
+            if result is None:
+                result = getattr(self.engine, _ENGINE_METHODS[op])(pending, current)
+
+            self._set_result(result)
             self.pending_value = result # key for repeated equals logic if we wanted it
             self.pending_operation = Operation.NONE
             self.new_entry = True
-            
+
         except Exception:
-            self.current_value = "Error"
-            self.error_state = True
+            self.set_error()
+            return
+
+        if self.history is not None:
+            self.history.record(self.engine, pending, op, current, result)
 
     def toggle_sign(self):
-        if self.error_state or self.current_value == "0":
+        if self.error_state or self.get_display() == "0":
             return
-            
-        try:
-            val = float(self.current_value)
-            val = -val
-            if val.is_integer():
-                self.current_value = str(int(val))
+
+        if self._value is not None:
+            self._set_result(-self._value)
+            return
+
+        # The entry continues from the negated number, which drops trailing
+        # fractional zeros and a bare point ("1.50" -> "-1.5", "3." -> "-3")
+        if self._digits is not None:
+            # A new buffer: snapshots may share the old one (see snapshot())
+            digits, scale = self._digits, self._scale
+            end = len(digits)
+            while scale > 0 and digits[end - 1] == ord('0'):
+                end -= 1
+                scale -= 1
+            if digits[0] == ord('-'):
+                self._digits = digits[1:end]
             else:
-                self.current_value = str(val)
-        except:
-            self.current_value = "Error"
-            self.error_state = True
+                self._digits = bytearray(b'-') + digits[:end]
+            self._scale = scale if scale > 0 else -1
+            self._display = None
+            return
+
+        mantissa, scale = -self._mantissa, self._scale
+        while scale > 0 and mantissa % 10 == 0:
+            mantissa //= 10
+            scale -= 1
+        self._mantissa = mantissa
+        self._scale = scale if scale > 0 else -1
+        self._display = None
 
     def percentage(self):
         if self.error_state:
             return
-        
+
         try:
-            val = float(self.current_value)
-            val = val / 100
-            if val.is_integer():
-                self.current_value = str(int(val))
-            else:
-                self.current_value = str(val)
-            self.new_entry = True
-        except:
-            self.current_value = "Error"
-            self.error_state = True
-            
+            self._set_result(self.engine.percent(self._current()))
+        except Exception:
+            self.set_error()
+            return
+        self.new_entry = True
+
+    def snapshot(self):
+        # The current state as an immutable tuple for restore(), in O(1): numbers are
+        # immutable and a long entry's digit buffer is shared. The model only ever appends
+        # to that buffer in place, so the snapshot keeps its length and restore() cuts
+        # the buffer back to it
+        digits = self._digits
+        return (self._mantissa, self._scale, digits, len(digits) if digits is not None else 0, self._value,
+                self.pending_value, self.pending_operation, self.new_entry, self.error_state)
+
+    def restore(self, state, display=None):
+        # display: the state's display text when it is already known
+        (self._mantissa, self._scale, digits, length, self._value,
+         self.pending_value, self.pending_operation, self.new_entry, self.error_state) = state
+        self._digits = digits[:length] if digits is not None else None
+        self._display = "Error" if self.error_state else display
+
+    def work_size(self) -> int:
+        # Rough bit size of the numbers the next operation works on (see engine.size)
+        size = 0
+        for value in (self.pending_value, self._value):
+            if value is not None:
+                size = max(size, self.engine.size(value))
+        if self._digits is not None:
+            size = max(size, len(self._digits) * 10 // 3)
+        return size
+
     def get_display(self):
-        return self.current_value
+        if self._display is None:
+            if self._value is not None:
+                self._display = self.engine.format(self._value)
+            elif self._digits is not None:
+                text = self._digits.decode('ascii')
+                if self._scale >= 0:
+                    cut = len(text) - self._scale
+                    text = text[:cut] + '.' + text[cut:]
+                self._display = text
+            else:
+                self._display = format_entry(self._mantissa, self._scale)
+        return self._display
+
+
+class ModelPool:
+    # CalculatorModels for windows that come and go: released models are reset and
+    # handed out again instead of being rebuilt
+    def __init__(self, engine=None, history=None):
+        self.engine = engine
+        self.history = history
+        self._free = []
+        self.created = 0
+
+    def acquire(self) -> CalculatorModel:
+        if self._free:
+            return self._free.pop()
+        self.created += 1
+        return CalculatorModel(self.engine, history=self.history)
+
+    def release(self, model: CalculatorModel):
+        model.reset()
+        self._free.append(model)
+
+    def __len__(self):
+        return len(self._free)
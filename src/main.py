@@ -1,17 +1,113 @@
+import argparse
 import sys
 import os
 
 # Add the project root (one level up from src) to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from PyQt6.QtWidgets import QApplication
-from src.ui.mainwindow import MainWindow
+from src.startup import StartupProfile
+from src.precision import ENGINES, get_engine
+from src.ui import styles
+
+# PyQt6 and the window modules are imported in main(), after the arguments are parsed,
+# so --help does not load Qt and --startup-profile can time the imports
+
+DEFAULT_HISTORY = os.path.join(os.path.expanduser('~'), '.calculator_history.tape')
+DEFAULT_SESSION = os.path.join(os.path.expanduser('~'), '.calculator_session')
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="iOS-style calculator")
+    parser.add_argument('--render-mode', choices=styles.RENDER_MODES, default=styles.RENDER_MODE,
+                        help="'performance' trades antialiased corners for cheaper repaints")
+    parser.add_argument('--keypad', choices=styles.KEYPAD_MODES, default=styles.KEYPAD_MODE,
+                        help="'painted' draws the keypad as one widget instead of a button per key")
+    parser.add_argument('--startup-profile', action='store_true',
+                        help="print per-phase startup timings to stderr and exit after the first paint")
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='float',
+                        help="number engine (default: %(default)s)")
+    parser.add_argument('--precision', type=int, default=28,
+                        help="significant digits for the decimal engine")
+    parser.add_argument('--undo-depth', type=int, default=styles.UNDO_DEPTH, metavar='N',
+                        help="undo steps kept (default: %(default)s)")
+    parser.add_argument('--history', metavar='FILE', default=DEFAULT_HISTORY,
+                        help="calculation history tape (default: %(default)s, '' to disable)")
+    parser.add_argument('--session', metavar='FILE', default=DEFAULT_SESSION,
+                        help="where the session is saved and restored from (default: %(default)s, '' to disable)")
+    parser.add_argument('--single-instance', action='store_true',
+                        help="open the window in an already running calculator, if there is one, "
+                             "and accept later launches as new windows")
+    parser.add_argument('--trace', metavar='FILE',
+                        help="record input-to-paint spans, write them as a Chrome trace_event JSON file "
+                             "on exit and print latency percentiles to stderr")
+    return parser.parse_known_args(argv)
 
 def main():
-    app = QApplication(sys.argv)
-    window = MainWindow()
+    profile = StartupProfile()
+    args, qt_args = parse_args(sys.argv[1:])
+    styles.RENDER_MODE = args.render_mode
+    styles.KEYPAD_MODE = args.keypad
+    styles.UNDO_DEPTH = args.undo_depth
+    if args.trace:
+        from src.tracing import tracer
+        tracer.enable()
+    address = None
+    if args.single_instance:
+        # Before Qt is imported: a launch that is handed over never loads it
+        from src.instance import instance_address, request_window
+        address = instance_address()
+        if request_window(address):
+            sys.exit(0)
+
+    from PyQt6.QtWidgets import QApplication
+    from src.ui.windows import WindowManager
+    profile.mark('imports')
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    profile.mark('QApplication')
+    history = None
+    if args.history:
+        from src.history import HistoryTape
+        try:
+            history = HistoryTape(args.history)
+        except (OSError, ValueError) as exc:
+            print(f"history disabled: {exc}", file=sys.stderr)
+    session = None
+    if args.session:
+        from src.session import SessionFile
+        session = SessionFile(args.session)
+    options = {'precision': args.precision} if args.engine == 'decimal' else {}
+    manager = WindowManager(history, get_engine(args.engine, **options), session)
+    if address is not None and not manager.listen(address):
+        if request_window(address):
+            sys.exit(0)  # another launch started listening after this one checked
+        print(f"single instance disabled: cannot listen on {address}", file=sys.stderr)
+    window = manager.open_window(show=False)
+    profile.mark('widgets')
+
+    if args.startup_profile:
+        from PyQt6.QtCore import QTimer
+
+        def painted():
+            # Children paint after the window in the same frame; the zero timer runs once it is done
+            QTimer.singleShot(0, finish)
+
+        def finish():
+            profile.mark('first paint')
+            print(profile.report(), file=sys.stderr)
+            app.quit()
+        window.first_painted.connect(painted)
+
     window.show()
-    sys.exit(app.exec())
+    status = app.exec()
+    manager.close()
+    if session is not None:
+        session.close()
+    if history is not None:
+        history.close()
+    if args.trace:
+        tracer.write_chrome_trace(args.trace)
+        print(tracer.report(), file=sys.stderr)
+    sys.exit(status)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,202 @@
+"""Number engines used by CalculatorModel.
+
+An engine turns typed entries into numbers, performs the four operations and formats
+results for the display. FloatEngine reproduces the original binary-float behaviour;
+DecimalEngine computes in a decimal context with a configurable precision; and
+FractionEngine is exact. Integers below an engine's ``int_limit`` stay plain Python
+ints, which CalculatorModel uses as a fast path before falling back to the engine.
+
+decimal and fractions are only imported when an exact engine is created, which keeps
+them off the app's startup path (the app uses FloatEngine).
+"""
+decimal = Decimal = Fraction = None
+
+
+def _import_exact():
+    global decimal, Decimal, Fraction
+    if Fraction is None:
+        import decimal
+        from decimal import Decimal
+        from fractions import Fraction
+
+
+def format_number(value: float) -> str:
+    # Format result to remove trailing .0 if integer
+    if value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _int_str(value: int) -> str:
+    try:
+        return str(value)
+    except ValueError:  # past sys.get_int_max_str_digits()
+        _import_exact()
+        return format(Decimal(value), 'f')
+
+
+class FloatEngine:
+    name = 'float'
+    int_limit = 2 ** 53  # ints below this convert to float exactly
+
+    def from_entry(self, mantissa: int, scale: int):
+        if scale > 0:
+            return mantissa / 10 ** scale
+        if -self.int_limit < mantissa < self.int_limit:
+            return mantissa
+        return float(mantissa)
+
+    def from_text(self, text: str):
+        return float(text)
+
+    def add(self, a, b):
+        return float(a) + b
+
+    def subtract(self, a, b):
+        return float(a) - b
+
+    def multiply(self, a, b):
+        return float(a) * b
+
+    def divide(self, a, b):
+        return float(a) / b
+
+    def percent(self, value):
+        return value / 100
+
+    def size(self, value) -> int:
+        # Rough bit size of value, which the cost of operating on it grows with
+        return 0  # ints stay below int_limit, everything else is a float
+
+    def format(self, value) -> str:
+        if type(value) is int:
+            return str(value)
+        return format_number(value)
+
+
+class DecimalEngine:
+    name = 'decimal'
+
+    def __init__(self, precision: int = 28, context: 'decimal.Context' = None):
+        _import_exact()
+        self.context = context.copy() if context is not None else decimal.Context(prec=precision)
+        self.int_limit = min(2 ** 63, 10 ** self.context.prec)
+
+    def __reduce__(self):
+        # Unpickling goes through __init__, so a fresh process imports decimal and fractions
+        return DecimalEngine, (self.context.prec, self.context)
+
+    def from_entry(self, mantissa: int, scale: int):
+        if scale > 0:
+            return Decimal(mantissa).scaleb(-scale, self.context)
+        if -self.int_limit < mantissa < self.int_limit:
+            return mantissa
+        return self.context.create_decimal(mantissa)
+
+    def from_text(self, text: str):
+        return self.context.create_decimal(text)
+
+    def add(self, a, b):
+        return self.context.add(a, b)
+
+    def subtract(self, a, b):
+        return self.context.subtract(a, b)
+
+    def multiply(self, a, b):
+        return self.context.multiply(a, b)
+
+    def divide(self, a, b):
+        return self.context.divide(a, b)
+
+    def percent(self, value):
+        return self.context.divide(value, 100)
+
+    def size(self, value) -> int:
+        if type(value) is int:
+            return value.bit_length()
+        return self.context.prec * 10 // 3
+
+    def format(self, value) -> str:
+        if type(value) is int:
+            return _int_str(value)
+        if not value:
+            return "0"
+        return format(value.normalize(self.context), 'f')
+
+
+class FractionEngine:
+    name = 'fraction'
+    int_limit = 2 ** 63
+
+    def __init__(self):
+        _import_exact()
+
+    def __reduce__(self):
+        return FractionEngine, ()
+
+    def from_entry(self, mantissa: int, scale: int):
+        if scale > 0:
+            return _normalize(Fraction(mantissa, 10 ** scale))
+        return mantissa
+
+    def from_text(self, text: str):
+        # Fraction(str) is capped by the int string-conversion limit; Decimal is not
+        return _normalize(Fraction(*Decimal(text).as_integer_ratio()))
+
+    def add(self, a, b):
+        return _normalize(Fraction(a) + b)
+
+    def subtract(self, a, b):
+        return _normalize(Fraction(a) - b)
+
+    def multiply(self, a, b):
+        return _normalize(Fraction(a) * b)
+
+    def divide(self, a, b):
+        return _normalize(Fraction(a) / b)
+
+    def percent(self, value):
+        return _normalize(Fraction(value) / 100)
+
+    def size(self, value) -> int:
+        if type(value) is int:
+            return value.bit_length()
+        return value.numerator.bit_length() + value.denominator.bit_length()
+
+    def format(self, value) -> str:
+        if type(value) is int:
+            return _int_str(value)
+        # Terminating decimals are shown exactly, anything else as numerator/denominator
+        denominator = value.denominator
+        twos = fives = 0
+        while denominator % 2 == 0:
+            denominator //= 2
+            twos += 1
+        while denominator % 5 == 0:
+            denominator //= 5
+            fives += 1
+        if denominator != 1:
+            return f"{_int_str(value.numerator)}/{_int_str(value.denominator)}"
+        scale = max(twos, fives)
+        digits = _int_str(abs(value.numerator) * 10 ** scale // value.denominator).rjust(scale + 1, '0')
+        text = digits[:-scale] + '.' + digits[-scale:]
+        return '-' + text if value < 0 else text
+
+
+def _normalize(value: 'Fraction'):
+    return value.numerator if value.denominator == 1 else value
+
+
+ENGINES = {
+    'float': FloatEngine,
+    'decimal': DecimalEngine,
+    'fraction': FractionEngine,
+}
+
+
+def get_engine(name: str, **options):
+    try:
+        engine_class = ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown engine: {name!r}") from None
+    return engine_class(**options)
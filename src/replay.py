@@ -0,0 +1,92 @@
+"""Headless replay of keystroke logs through CalculatorModel (no Qt required)."""
+import argparse
+import sys
+import os
+import time
+
+# Add the project root (one level up from src) to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.logic import CalculatorModel
+from src.keys import iter_keys, key_actions
+from src.precision import ENGINES, get_engine
+
+CHUNK_SIZE = 1 << 16
+
+
+def read_chunks(stream, size=CHUNK_SIZE):
+    while True:
+        chunk = stream.read(size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def read_logs(paths):
+    for path in paths:
+        if path == '-':
+            yield from read_chunks(sys.stdin)
+        else:
+            with open(path, encoding='utf-8') as f:
+                yield from read_chunks(f)
+
+
+class ReplayStats:
+    def __init__(self):
+        self.keys = 0
+        self.results = 0
+        self.elapsed = 0.0
+
+    @property
+    def keys_per_second(self):
+        return self.keys / self.elapsed if self.elapsed else 0.0
+
+
+def replay(keys, model=None, stats=None):
+    """Feed keys through the model, yielding the display after every '='."""
+    if model is None:
+        model = CalculatorModel()
+    if stats is None:
+        stats = ReplayStats()
+    actions = key_actions(model)
+    calculate = actions['=']
+    count = 0
+    start = time.perf_counter()
+    try:
+        for key in keys:
+            count += 1
+            if key == '=':
+                calculate()
+                stats.results += 1
+                yield model.get_display()
+            else:
+                actions[key]()
+    finally:
+        stats.keys += count
+        stats.elapsed += time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay calculator keystroke logs without a GUI.")
+    parser.add_argument('logs', nargs='*', default=['-'], help="keystroke log files ('-' for stdin)")
+    parser.add_argument('-q', '--quiet', action='store_true', help="do not print results, only the summary")
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='float', help="number engine (default: float)")
+    parser.add_argument('--precision', type=int, default=28, help="significant digits for the decimal engine")
+    args = parser.parse_args(argv)
+
+    options = {'precision': args.precision} if args.engine == 'decimal' else {}
+    model = CalculatorModel(get_engine(args.engine, **options))
+    stats = ReplayStats()
+    out = sys.stdout
+    for display in replay(iter_keys(read_logs(args.logs)), model, stats):
+        if not args.quiet:
+            out.write(display)
+            out.write('\n')
+    out.flush()
+    print(f"replayed {stats.keys} keys, {stats.results} results in {stats.elapsed:.3f}s "
+          f"({stats.keys_per_second:,.0f} keys/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
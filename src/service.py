@@ -0,0 +1,199 @@
+"""Calculator sessions over a local socket, as JSON lines (no Qt required).
+
+Each request is one line: ``{"session": "s1", "keys": "12×3+4=", "id": 7}``. The keys
+are run on that session's CalculatorModel and the reply is one line,
+``{"id": 7, "display": "40"}`` (``id`` is echoed when given). ``"reset": true`` clears
+the session before the keys and ``"close": true`` ends it after them. A bad request gets
+``{"id": ..., "error": "..."}`` and leaves the session unchanged. Requests may be
+pipelined; replies come back in request order.
+
+Sessions idle for longer than the idle timeout are evicted, and so is the least recently
+used one when the pool is full. The models of evicted sessions are reset and reused.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+
+# Add the project root (one level up from src) to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.logic import CalculatorModel
+from src.compiler import check_text, run_text
+from src.precision import ENGINES, get_engine
+
+DEFAULT_PORT = 7341
+IDLE_TIMEOUT = 300.0
+MAX_SESSIONS = 100_000
+LINE_LIMIT = 1 << 20  # longest request line, in bytes
+
+
+class SessionPool:
+    def __init__(self, engine=None, idle_timeout: float = IDLE_TIMEOUT, max_sessions: int = MAX_SESSIONS):
+        self.engine = engine
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()  # id -> [model, last used]; least recently used first
+        self._free = []  # models of evicted sessions
+        self.created = 0
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __contains__(self, session_id):
+        return session_id in self._sessions
+
+    def get(self, session_id, now: float = None) -> CalculatorModel:
+        if now is None:
+            now = time.monotonic()
+        entry = self._sessions.get(session_id)
+        if entry is not None:
+            entry[1] = now
+            self._sessions.move_to_end(session_id)
+            return entry[0]
+        if len(self._sessions) >= self.max_sessions:
+            self._evict(next(iter(self._sessions)))
+        if self._free:
+            model = self._free.pop()
+        else:
+            model = CalculatorModel(self.engine)
+            self.created += 1
+        self._sessions[session_id] = [model, now]
+        return model
+
+    def close(self, session_id):
+        if session_id in self._sessions:
+            self._evict(session_id)
+
+    def evict_idle(self, now: float = None) -> int:
+        if now is None:
+            now = time.monotonic()
+        deadline = now - self.idle_timeout
+        count = 0
+        # Oldest first: stop at the first session used since the deadline
+        for session_id, (_, last_used) in list(self._sessions.items()):
+            if last_used > deadline:
+                break
+            self._evict(session_id)
+            count += 1
+        return count
+
+    def _evict(self, session_id):
+        model, _ = self._sessions.pop(session_id)
+        model.reset()
+        self._free.append(model)
+        self.evicted += 1
+
+
+def handle_request(pool: SessionPool, line: bytes) -> dict:
+    request = None
+    try:
+        request = json.loads(line)
+        session_id = request['session']
+        keys = request.get('keys', '')
+        if not isinstance(session_id, str) or not isinstance(keys, str):
+            raise TypeError
+    except (ValueError, KeyError, TypeError, AttributeError):
+        reply = {'error': "expected {\"session\": str, \"keys\": str}"}
+        if isinstance(request, dict) and 'id' in request:
+            reply['id'] = request['id']
+        return reply
+    reply = {'id': request['id']} if 'id' in request else {}
+    try:
+        check_text(keys)  # before the lookup, which may create or evict a session
+    except ValueError as exc:
+        reply['error'] = str(exc)
+        return reply
+    model = pool.get(session_id)
+    steps = run_text(keys, model)
+    if request.get('reset'):
+        model.reset()
+    for _ in steps:
+        pass
+    reply['display'] = model.get_display()
+    if request.get('close'):
+        pool.close(session_id)
+    return reply
+
+
+class CalculatorService:
+    def __init__(self, pool: SessionPool):
+        self.pool = pool
+        self.requests = 0
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # longer than LINE_LIMIT
+                    writer.write(b'{"error": "request too long"}\n')
+                    break
+                if not line:
+                    break
+                if line.isspace():
+                    continue
+                self.requests += 1
+                writer.write(json.dumps(handle_request(self.pool, line)).encode('utf-8') + b'\n')
+                if writer.transport.get_write_buffer_size() > LINE_LIMIT:
+                    await writer.drain()  # the client is not reading its replies
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def evict_idle(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            self.pool.evict_idle()
+
+    async def serve(self, port: int = DEFAULT_PORT, host: str = '127.0.0.1', unix: str = None, ready=None):
+        if unix:
+            server = await asyncio.start_unix_server(self.handle, unix, limit=LINE_LIMIT)
+        else:
+            server = await asyncio.start_server(self.handle, host, port, limit=LINE_LIMIT)
+        evictor = asyncio.ensure_future(self.evict_idle(min(self.pool.idle_timeout, 10.0)))
+        if ready is not None:
+            ready(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            evictor.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve calculator sessions as JSON lines over a local socket.")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on (default: %(default)s)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="TCP port (default: %(default)s)")
+    parser.add_argument('--unix', metavar='PATH', help="listen on a Unix socket instead of TCP")
+    parser.add_argument('--idle-timeout', type=float, default=IDLE_TIMEOUT,
+                        help="seconds before an unused session is evicted (default: %(default)s)")
+    parser.add_argument('--max-sessions', type=int, default=MAX_SESSIONS,
+                        help="sessions kept at once (default: %(default)s)")
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='float', help="number engine (default: float)")
+    parser.add_argument('--precision', type=int, default=28, help="significant digits for the decimal engine")
+    args = parser.parse_args(argv)
+
+    options = {'precision': args.precision} if args.engine == 'decimal' else {}
+    pool = SessionPool(get_engine(args.engine, **options), args.idle_timeout, args.max_sessions)
+    service = CalculatorService(pool)
+
+    def ready(server):
+        where = args.unix or f"{args.host}:{args.port}"
+        print(f"listening on {where}", file=sys.stderr, flush=True)
+    try:
+        asyncio.run(service.serve(args.port, args.host, args.unix, ready))
+    except KeyboardInterrupt:
+        pass
+    print(f"served {service.requests} requests; {pool.created} models created, {pool.evicted} sessions evicted",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""The last calculator session (model state and window position), saved across launches.
+
+The file is a 14-byte header (magic, version, CRC-32 of the body) and a body holding
+the window position, flags, the pending operation, the entry and the engine's numbers,
+tagged by type. Saving only hands an O(1) CalculatorModel.snapshot() to a writer thread,
+which encodes it and replaces the file atomically; saves that arrive while a write is
+recent are coalesced into one.
+"""
+import os
+import struct
+import threading
+import zlib
+from collections import namedtuple
+
+from src.logic import Operation
+
+SessionState = namedtuple('SessionState', ['engine', 'snapshot', 'position'])
+
+MAGIC = b'CALCSESS'
+VERSION = 1
+DEFAULT_INTERVAL = 0.25  # seconds between writes
+
+_HEADER = struct.Struct('<8sHI')  # magic, version, CRC-32 of the body
+_FIXED = struct.Struct('<iiBBi')  # window x, y, flags, operation code, scale
+_U8 = struct.Struct('<B')
+_U32 = struct.Struct('<I')
+_DOUBLE = struct.Struct('<d')
+
+_NEW_ENTRY, _ERROR, _POSITION, _DIGITS = 1, 2, 4, 8
+
+_OPERATIONS = (Operation.NONE, Operation.ADD, Operation.SUBTRACT, Operation.MULTIPLY, Operation.DIVIDE)
+_OPERATION_CODES = {op: code for code, op in enumerate(_OPERATIONS)}
+
+# Number tags
+_NONE, _INT, _FLOAT, _DECIMAL, _FRACTION = range(5)
+
+
+def _pack_int(value: int, out: bytearray):
+    size = (value.bit_length() + 8) // 8  # room for the sign bit
+    out += _U32.pack(size)
+    out += value.to_bytes(size, 'little', signed=True)
+
+
+def _pack_bytes(data, out: bytearray):
+    out += _U32.pack(len(data))
+    out += data
+
+
+def _pack_number(value, out: bytearray):
+    kind = type(value)
+    if value is None:
+        out.append(_NONE)
+    elif kind is int:
+        out.append(_INT)
+        _pack_int(value, out)
+    elif kind is float:
+        out.append(_FLOAT)
+        out += _DOUBLE.pack(value)
+    # By name: decimal and fractions stay unimported unless an exact engine is in use
+    elif kind.__name__ == 'Fraction':
+        out.append(_FRACTION)
+        _pack_int(value.numerator, out)
+        _pack_int(value.denominator, out)
+    elif kind.__name__ == 'Decimal':
+        out.append(_DECIMAL)
+        _pack_bytes(str(value).encode('ascii'), out)
+    else:
+        raise TypeError(f"cannot save a {kind.__name__}")
+
+
+def encode(state: SessionState) -> bytes:
+    (mantissa, scale, digits, length, value, pending_value, pending_operation,
+     new_entry, error_state) = state.snapshot
+    flags = (_NEW_ENTRY if new_entry else 0) | (_ERROR if error_state else 0)
+    x = y = 0
+    if state.position is not None:
+        flags |= _POSITION
+        x, y = state.position
+    if digits is not None:
+        flags |= _DIGITS
+    body = bytearray(_FIXED.pack(x, y, flags, _OPERATION_CODES[pending_operation], scale))
+    engine = state.engine.encode('ascii')
+    body += _U8.pack(len(engine))
+    body += engine
+    _pack_int(mantissa, body)
+    if digits is not None:
+        _pack_bytes(digits[:length], body)
+    _pack_number(value, body)
+    _pack_number(pending_value, body)
+    return _HEADER.pack(MAGIC, VERSION, zlib.crc32(body)) + body
+
+
+class _Reader:
+    def __init__(self, data, offset):
+        self.data = data
+        self.offset = offset
+
+    def unpack(self, layout):
+        values = layout.unpack_from(self.data, self.offset)
+        self.offset += layout.size
+        return values
+
+    def bytes(self, size):
+        end = self.offset + size
+        if end > len(self.data):
+            raise ValueError("truncated")
+        chunk = self.data[self.offset:end]
+        self.offset = end
+        return chunk
+
+    def int(self):
+        return int.from_bytes(self.bytes(self.unpack(_U32)[0]), 'little', signed=True)
+
+    def number(self):
+        tag = self.bytes(1)[0]
+        if tag == _NONE:
+            return None
+        if tag == _INT:
+            return self.int()
+        if tag == _FLOAT:
+            return self.unpack(_DOUBLE)[0]
+        if tag == _FRACTION:
+            from fractions import Fraction
+            return Fraction(self.int(), self.int())
+        if tag == _DECIMAL:
+            from decimal import Decimal
+            return Decimal(self.bytes(self.unpack(_U32)[0]).decode('ascii'))
+        raise ValueError(f"unknown number tag {tag}")
+
+
+def decode(data: bytes) -> SessionState:
+    """The SessionState in data; ValueError if it is not a valid version 1 session."""
+    try:
+        magic, version, crc = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a version {VERSION} session")
+        if zlib.crc32(memoryview(data)[_HEADER.size:]) != crc:
+            raise ValueError("checksum mismatch")
+        reader = _Reader(data, _HEADER.size)
+        x, y, flags, code, scale = reader.unpack(_FIXED)
+        engine = reader.bytes(reader.unpack(_U8)[0]).decode('ascii')
+        mantissa = reader.int()
+        digits = bytearray(reader.bytes(reader.unpack(_U32)[0])) if flags & _DIGITS else None
+        value = reader.number()
+        pending_value = reader.number()
+        snapshot = (mantissa, scale, digits, len(digits) if digits is not None else 0, value, pending_value,
+                    _OPERATIONS[code], bool(flags & _NEW_ENTRY), bool(flags & _ERROR))
+    except (struct.error, IndexError, ArithmeticError) as exc:
+        raise ValueError(f"corrupt session: {exc}") from None
+    return SessionState(engine, snapshot, (x, y) if flags & _POSITION else None)
+
+
+def write_atomic(path: str, data: bytes):
+    # Readers see the old file or the new one, never a partial write
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class SessionFile:
+    def __init__(self, path: str, interval: float = DEFAULT_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.writes = 0
+        self.error = None  # the last OSError from a write
+        self._last = None
+        self._pending = None
+        self._writing = False
+        self._urgent = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def load(self):
+        """The saved SessionState, or None if there is none or it is unreadable."""
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+            state = decode(data)
+        except (OSError, ValueError):
+            return None
+        self._last = state
+        return state
+
+    def save(self, engine: str, snapshot, position=None):
+        # Called on every state change; a state equal to the last one saved is skipped
+        state = SessionState(engine, snapshot, position)
+        if state == self._last:
+            return
+        self._last = state
+        with self._condition:
+            if self._closed:
+                return
+            self._pending = state
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='session-writer', daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def _run(self):
+        condition = self._condition
+        while True:
+            with condition:
+                condition.wait_for(lambda: self._pending is not None or self._closed)
+                state, self._pending = self._pending, None
+                if state is None:
+                    return  # closed
+                self._writing = True
+            try:
+                write_atomic(self.path, encode(state))
+                self.writes += 1
+            except OSError as exc:
+                self.error = exc
+            with condition:
+                self._writing = False
+                condition.notify_all()
+                # Saves during the interval are merged into the next write
+                condition.wait_for(lambda: self._closed or self._urgent, self.interval)
+
+    def flush(self):
+        """Wait until the latest saved state is on disk."""
+        with self._condition:
+            if self._thread is None:
+                return
+            self._urgent = True
+            self._condition.notify_all()
+            self._condition.wait_for(lambda: self._pending is None and not self._writing)
+            self._urgent = False
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,47 @@
+"""Startup phase timings, printed by ``src/main.py --startup-profile``.
+
+Only the standard library is imported here, so the profile can start before PyQt6.
+"""
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes, or None where it is not available."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024  # bytes on macOS, KiB elsewhere
+
+
+class StartupProfile:
+    def __init__(self):
+        # The interpreter phase is the CPU time used before this object was created;
+        # there is no portable wall-clock timestamp for process start, so it is reported
+        # on its own and left out of the wall-clock phases and their total
+        self.interpreter = time.process_time()
+        self.phases = []
+        self.start = self._last = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def total(self):
+        # Wall-clock seconds from this object's creation to the last mark
+        return sum(seconds for _, seconds in self.phases)
+
+    def report(self):
+        lines = [f"{'interpreter':<20}{self.interpreter * 1000:8.1f} ms CPU"]
+        lines += [f"{phase:<20}{seconds * 1000:8.1f} ms" for phase, seconds in self.phases]
+        lines.append(f"{'total':<20}{self.total() * 1000:8.1f} ms (after the interpreter)")
+        rss = peak_rss()
+        if rss is not None:
+            lines.append(f"{'peak RSS':<20}{rss / 2**20:8.1f} MB")
+        return "\n".join(lines)
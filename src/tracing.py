@@ -0,0 +1,131 @@
+"""Opt-in latency spans along the input-to-pixel path.
+
+Spans are kept in a fixed-size ring buffer, summarised as p50/p95/p99 per name and can be
+written as a Chrome ``trace_event`` file (chrome://tracing or https://ui.perfetto.dev).
+While ``tracer.enabled`` is False, ``span()`` hands back a shared no-op context manager and
+``open()``/``close()`` return at once, so the call sites can stay in place.
+"""
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+LatencyStats = namedtuple('LatencyStats', ['count', 'p50', 'p95', 'p99', 'max'])
+
+_now = time.perf_counter_ns
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'start')
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = _now()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, self.start, _now() - self.start)
+        return False
+
+
+class Tracer:
+    # Not locked: spans are recorded from the GUI thread
+    def __init__(self, capacity: int = 8192):
+        self.enabled = False
+        self.capacity = capacity
+        self._events = [None] * capacity
+        self._next = 0
+        self._open = {}
+
+    def enable(self):
+        self.clear()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        self._open.clear()
+
+    def clear(self):
+        self._events = [None] * self.capacity
+        self._next = 0
+        self._open.clear()
+
+    def span(self, name: str):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def open(self, name: str):
+        # Starts a span that ends elsewhere; while it is open, later opens keep the first start
+        if self.enabled and name not in self._open:
+            self._open[name] = _now()
+
+    def close(self, name: str):
+        if self._open:
+            start = self._open.pop(name, None)
+            if start is not None:
+                self.record(name, start, _now() - start)
+
+    def record(self, name: str, start_ns: int, duration_ns: int):
+        self._events[self._next % self.capacity] = (name, start_ns, duration_ns, threading.get_ident())
+        self._next += 1
+
+    def events(self):
+        # Oldest first
+        if self._next <= self.capacity:
+            return self._events[:self._next]
+        split = self._next % self.capacity
+        return self._events[split:] + self._events[:split]
+
+    def stats(self):
+        durations = {}
+        for name, _, duration, _ in self.events():
+            durations.setdefault(name, []).append(duration)
+        return {name: _latency_stats(values) for name, values in durations.items()}
+
+    def report(self) -> str:
+        lines = [f"{'span':<28}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+        for name, s in sorted(self.stats().items()):
+            lines.append(f"{name:<28}{s.count:>7}{s.p50 * 1e3:>10.3f}{s.p95 * 1e3:>10.3f}"
+                         f"{s.p99 * 1e3:>10.3f}{s.max * 1e3:>10.3f}")
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict:
+        pid = os.getpid()
+        events = [{'name': name, 'cat': name.partition('.')[0], 'ph': 'X', 'ts': start / 1000,
+                   'dur': duration / 1000, 'pid': pid, 'tid': tid}
+                  for name, start, duration, tid in self.events()]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
+
+
+def _latency_stats(durations_ns) -> LatencyStats:
+    # Nearest-rank percentiles, in seconds
+    values = sorted(durations_ns)
+    n = len(values)
+
+    def percentile(p):
+        return values[min(n - 1, max(0, -(-p * n // 100) - 1))] / 1e9
+    return LatencyStats(n, percentile(50), percentile(95), percentile(99), values[-1] / 1e9)
+
+
+# Shared by the UI modules; src/main.py --trace enables it
+tracer = Tracer()
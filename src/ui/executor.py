@@ -0,0 +1,60 @@
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal
+
+from src.evaluator import WorkerProcess
+from src.ui import styles
+
+
+class ModelExecutor(QObject):
+    # Runs one CalculatorModel operation at a time in a worker process and delivers the
+    # result on the GUI thread. Results of cancelled jobs are dropped.
+    finished = pyqtSignal(object)  # (snapshot, display, history records) or an exception
+    busy_changed = pyqtSignal(bool)
+    _result = pyqtSignal(int, object)  # emitted from the worker's reader thread, or its submit()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._worker = WorkerProcess(self._result.emit)
+        # Queued even when the worker fails a job inside submit(), which is then still running
+        self._result.connect(self._on_result, Qt.ConnectionType.QueuedConnection)
+        self._last_id = 0
+        self._job = None  # id of the running job
+        self.busy = False
+        # Fast jobs finish without the display ever showing them as busy
+        self._busy_timer = QTimer(self)
+        self._busy_timer.setSingleShot(True)
+        self._busy_timer.setInterval(styles.BUSY_THRESHOLD_MS)
+        self._busy_timer.timeout.connect(lambda: self._set_busy(True))
+
+    @property
+    def running(self):
+        return self._job is not None
+
+    def submit(self, model, method, args=()):
+        self._last_id += 1
+        self._job = self._last_id
+        self._worker.submit(self._job, model.engine, model.snapshot(), method, args)
+        self._busy_timer.start()
+
+    def cancel(self):
+        if self._job is not None:
+            self._worker.cancel()
+            self._done()
+
+    def close(self):
+        self._worker.close()
+
+    def _on_result(self, job_id, result):
+        if job_id != self._job:
+            return  # stale: cancelled, or replaced by a newer job
+        self._done()
+        self.finished.emit(result)
+
+    def _done(self):
+        self._job = None
+        self._busy_timer.stop()
+        self._set_busy(False)
+
+    def _set_busy(self, busy):
+        if busy != self.busy:
+            self.busy = busy
+            self.busy_changed.emit(busy)
@@ -0,0 +1,93 @@
+import time
+
+from PyQt6.QtWidgets import QTableView, QHeaderView, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from src.ui import styles
+
+
+class HistoryTableModel(QAbstractTableModel):
+    # Rows are read from the tape when the view asks for them, so memory does not grow
+    # with the tape; only the last decoded row is kept
+    COLUMNS = ("Time", "Calculation", "Result")
+
+    def __init__(self, tape, parent=None):
+        super().__init__(parent)
+        self.tape = tape
+        self._rows = len(tape)
+        self._total = tape.total
+        self._cached = (None, None)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.TextAlignmentRole and index.column() > 0:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        row = index.row()
+        if self._cached[0] != row:
+            self._cached = (row, self.tape[row])
+        entry = self._cached[1]
+        column = index.column()
+        if entry.operation is None:
+            return "unreadable record" if column == 1 else ""
+        if column == 0:
+            return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry.timestamp))
+        if column == 1:
+            return f"{entry.left} {entry.operation.value} {entry.right}"
+        return entry.result
+
+    def refresh(self):
+        # Picks up records appended to the tape since the last call
+        total = self.tape.total
+        if total == self._total:
+            return
+        rows = len(self.tape)
+        # Once the ring is full, new records overwrite the oldest and every row moves up
+        shifted = total - self._total > rows - self._rows
+        self._total = total
+        self._cached = (None, None)
+        if rows > self._rows:
+            self.beginInsertRows(QModelIndex(), self._rows, rows - 1)
+            self._rows = rows
+            self.endInsertRows()
+        if shifted:
+            self.dataChanged.emit(self.index(0, 0), self.index(rows - 1, len(self.COLUMNS) - 1))
+
+
+class HistoryView(QTableView):
+    def __init__(self, tape, parent=None):
+        super().__init__(parent)
+        self.setModel(HistoryTableModel(tape, self))
+        self.setStyleSheet(f"color: {styles.COLOR_TEXT_WHITE}; background: {styles.COLOR_BACKGROUND};"
+                           f" gridline-color: {styles.COLOR_BTN_NUM};")
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        # Fixed row heights and column widths: nothing is measured per row
+        rows = self.verticalHeader()
+        rows.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        rows.setDefaultSectionSize(24)
+        rows.hide()
+        columns = self.horizontalHeader()
+        columns.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        columns.setStretchLastSection(True)
+        self.setColumnWidth(0, 130)
+        self.setColumnWidth(1, 110)
+        self.scrollToBottom()
+
+    def refresh(self):
+        at_end = self.verticalScrollBar().value() == self.verticalScrollBar().maximum()
+        self.model().refresh()
+        if at_end:
+            self.scrollToBottom()
@@ -0,0 +1,184 @@
+import math
+
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import Qt, QRect, QSize, QVariantAnimation, QEasingCurve, pyqtSignal
+from PyQt6.QtGui import QPainter, QColor
+
+from src.ui import styles, render_cache
+from src.ui.repaint_stats import repaint_stats
+from src.ui.widgets import button_font, face_rect, render_face
+
+
+def circle_spans(size):
+    # For each pixel row of a size x size face, the [start, end) columns that
+    # CalculatorButton.hitButton accepts: 4 * (dx² + dy²) <= size² around the center pixel
+    center = (size - 1) // 2
+    spans = []
+    for y in range(size):
+        dy = y - center
+        rest = size * size - 4 * dy * dy
+        if rest < 0:
+            spans.append((0, 0))
+            continue
+        half = math.isqrt(rest // 4)
+        spans.append((max(0, center - half), min(size, center + half + 1)))
+    return tuple(spans)
+
+
+class PaintedKey:
+    # One key of a PaintedKeypad. It stands in for a CalculatorButton in
+    # MainWindow.buttons, which only uses text() and setText()
+    __slots__ = ('keypad', 'name', 'label', 'x', 'y', 'rect', 'normal_bg', 'pressed_bg', 'text_color',
+                 'current_bg', 'scale')
+
+    def __init__(self, keypad, name, x, y, bg_color, text_color):
+        self.keypad = keypad
+        self.name = name  # what clicked emits; the label can change ('AC' -> 'C')
+        self.label = name
+        self.x = x
+        self.y = y
+        self.rect = QRect(x, y, styles.BUTTON_SIZE, styles.BUTTON_SIZE)
+        self.normal_bg = QColor(bg_color)
+        self.pressed_bg = self.normal_bg.lighter(120) if bg_color != styles.COLOR_TEXT_WHITE else QColor("#D0D0D0")
+        self.text_color = QColor(text_color)
+        self.current_bg = self.normal_bg
+        self.scale = 1.0
+
+    def text(self):
+        return self.label
+
+    def setText(self, text):
+        if text != self.label:
+            self.label = text
+            self.keypad.update(self.rect)
+
+
+class PaintedKeypad(QWidget):
+    """The keypad as one widget: every key is painted by one paintEvent.
+
+    Keys sit where the fixed-size CalculatorButtons sit in MainWindow's grid layout and
+    look and animate the same. A mouse press finds its key through a cell grid built
+    from the key definitions (one list index) and the face's precomputed row spans, and
+    only the pressed key's face is repainted while it animates.
+    """
+    clicked = pyqtSignal(str)  # the key's name, as in the key definitions
+
+    def __init__(self, key_defs, parent=None):
+        # key_defs: (text, row, col, row span, col span, background, text color) per key
+        super().__init__(parent)
+        size = styles.BUTTON_SIZE
+        self._size = size
+        self._pitch = pitch = size + styles.GRID_SPACING
+        self.performance = styles.RENDER_MODE == "performance"
+        self.keys = {}
+        self._rows = max(r + rs for _, r, _, rs, _, _, _ in key_defs)
+        self._cols = max(c + cs for _, _, c, _, cs, _, _ in key_defs)
+        self._grid = [None] * (self._rows * self._cols)
+        for text, r, c, rs, cs, bg, fg in key_defs:
+            key = self.keys[text] = PaintedKey(self, text, c * pitch, r * pitch, bg, fg)
+            for row in range(r, r + rs):
+                self._grid[row * self._cols + c:row * self._cols + c + cs] = [key] * cs
+        self._spans = circle_spans(size)
+        self._pressed = None
+
+        # One animation for the keypad; it moves to whichever key was pressed last
+        self._animated = None
+        self.anim = QVariantAnimation(self)
+        self.anim.valueChanged.connect(self._set_scale)
+
+        self.setMinimumSize(self.sizeHint())
+        self._background_color = QColor(styles.COLOR_BACKGROUND)
+        if self.performance:
+            self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+
+    def sizeHint(self):
+        spacing = styles.GRID_SPACING
+        return QSize(self._cols * self._pitch - spacing, self._rows * self._pitch - spacing)
+
+    def key_at(self, x: int, y: int):
+        if x < 0 or y < 0:
+            return None
+        col = x // self._pitch
+        row = y // self._pitch
+        if col >= self._cols or row >= self._rows:
+            return None
+        key = self._grid[row * self._cols + col]
+        if key is None:
+            return None
+        dy = y - key.y
+        if dy >= self._size:
+            return None
+        start, end = self._spans[dy]
+        return key if start <= x - key.x < end else None
+
+    def _face_update_rect(self, key, scale):
+        rect = face_rect(self._size, self._size, False, scale).translated(key.x, key.y)
+        return rect.toAlignedRect().adjusted(-1, -1, 1, 1)
+
+    def _set_scale(self, value):
+        key = self._animated
+        old = render_cache.quantize_scale(key.scale)
+        new = render_cache.quantize_scale(value)
+        key.scale = value
+        if old != new:
+            self.update(self._face_update_rect(key, max(old, new)))
+
+    def _animate(self, key, duration, start, end, easing):
+        if self._animated is not key and self.anim.state() == QVariantAnimation.State.Running:
+            # The previous key skips to the end of its animation
+            self.anim.stop()
+            self._set_scale(self.anim.endValue())
+        self.anim.stop()
+        self._animated = key
+        self.anim.setDuration(duration)
+        self.anim.setStartValue(start)
+        self.anim.setEndValue(end)
+        self.anim.setEasingCurve(easing)
+        self.anim.start()
+
+    def mousePressEvent(self, event):
+        pos = event.position()
+        key = self.key_at(int(pos.x()), int(pos.y()))
+        if key is None or event.button() != Qt.MouseButton.LeftButton:
+            event.ignore()  # the window drags, as it does between buttons
+            return
+        if self._pressed is not None:
+            self._pressed.current_bg = self._pressed.normal_bg
+            self.update(self._pressed.rect)
+        self._pressed = key
+        key.current_bg = key.pressed_bg
+        self._animate(key, 100, 1.0, 0.95, QEasingCurve.Type.OutQuad)
+
+    def mouseReleaseEvent(self, event):
+        key = self._pressed
+        if key is None or event.button() != Qt.MouseButton.LeftButton:
+            event.ignore()
+            return
+        self._pressed = None
+        key.current_bg = key.normal_bg
+        self._animate(key, 300, key.scale, 1.0, QEasingCurve.Type.OutElastic)
+        pos = event.position()
+        if self.key_at(int(pos.x()), int(pos.y())) is key:
+            self.clicked.emit(key.name)
+
+    def paintEvent(self, event):
+        repaint_stats.record('PaintedKeypad', event.region())
+        painter = QPainter(self)
+        dirty = event.rect()
+        if self.performance:
+            painter.fillRect(dirty, self._background_color)
+        size = self._size
+        dpr = self.devicePixelRatioF()
+        font = button_font()
+        font_key = font.key()
+        for key in self.keys.values():
+            if not key.rect.intersects(dirty):
+                continue
+            scale = render_cache.quantize_scale(key.scale)
+            # Same cache key as a CalculatorButton of the same face, so both share pixmaps
+            cache_key = (False, size, size, key.current_bg.rgba(), key.text_color.rgba(), key.label, font_key,
+                         scale, dpr, self.performance)
+            pixmap = render_cache.button_cache.get(cache_key, lambda: render_face(
+                size, size, False, key.current_bg, key.text_color, key.label, font, scale, dpr, self.performance))
+            painter.drawPixmap(key.x, key.y, pixmap)
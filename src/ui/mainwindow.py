@@ -1,22 +1,54 @@
+import sys
+import time
+import traceback
+
 from PyQt6.QtWidgets import QMainWindow, QWidget, QGridLayout, QVBoxLayout, QApplication
-from PyQt6.QtCore import Qt, QPoint, QRectF
-from PyQt6.QtGui import QPainter, QColor, QFont, QBrush, QPainterPath
+from PyQt6.QtCore import Qt, QPoint, QRectF, QTimer, QKeyCombination, pyqtSignal
+from PyQt6.QtGui import QPainter, QColor, QFont, QBrush, QPainterPath, QRegion, QKeySequence
 
 from src.logic import CalculatorModel, Operation
+from src.keys import DIGITS, OPERATOR_KEYS, normalize_key
+from src.compiler import run_text
+from src.undo import UndoHistory
 from src.ui import styles
 from src.ui.widgets import CalculatorButton, DisplayLabel
+from src.ui.keypad import PaintedKeypad
+from src.ui.repaint_stats import repaint_stats
+from src.tracing import tracer
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    first_painted = pyqtSignal()
+    closed = pyqtSignal()
+    # Model methods that run in a worker process when their operands are large
+    WORKER_ACTIONS = frozenset(('calculate', 'set_operation', 'percentage', 'toggle_sign'))
+
+    def __init__(self, history=None, engine=None, session=None, model=None):
         super().__init__()
-        self.model = CalculatorModel()
+        # history: an optional src.history.HistoryTape that records every calculation
+        self.history = history
+        # session: an optional src.session.SessionFile the state is saved to on every change
+        self.session = None
+        self.history_view = None
+        self.sweep_view = None
+        # model: a CalculatorModel to use (e.g. from a ModelPool) instead of a new one
+        self.model = model if model is not None else CalculatorModel(engine, history=history)
+        self.undo_history = UndoHistory(self.model, styles.UNDO_DEPTH)
         
         self.setWindowTitle("Calculator")
         self.resize(styles.WINDOW_WIDTH, styles.WINDOW_HEIGHT)
         
         # Frameless and Transparent for custom rounded corners
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint)
-        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.performance = styles.RENDER_MODE == "performance"
+        if self.performance:
+            # Opaque window cut to shape by a mask: nothing needs blending with the desktop,
+            # and paintEvent only fills the damaged rect (corners are not antialiased)
+            self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        else:
+            self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self._background_color = QColor(styles.COLOR_BACKGROUND)
+        self._background_path = None
+        self._painted = False
         
         # Central Widget acts as the background
         self.central_widget = QWidget()
@@ -31,27 +63,80 @@ class MainWindow(QMainWindow):
         self.display.setFixedHeight(int(styles.WINDOW_HEIGHT * 0.3)) # 30% top
         self.main_layout.addWidget(self.display)
         
-        # Grid Layout for Buttons
-        self.grid_layout = QGridLayout()
-        self.grid_layout.setSpacing(styles.GRID_SPACING)
-        self.main_layout.addLayout(self.grid_layout)
-        
+        # Keypad, in a widget so the history can take its place
+        self.keypad = None
+        self.grid_layout = None
         self.buttons = {}
         self.setup_buttons()
+        self.main_layout.addWidget(self.keypad)
+
+        # Typed characters, after keys.normalize_key, and the handler for each
+        self.key_handlers = {d: (lambda d=d: self.on_digit(d)) for d in DIGITS}
+        self.key_handlers.update({k: (lambda op=op: self.on_operation(op)) for k, op in OPERATOR_KEYS.items()})
+        self.key_handlers.update({
+            '.': self.on_decimal,
+            '%': self.on_percent,
+            '=': self.on_equals,
+            'AC': self.on_clear,
+        })
+        self._paste_steps = None
+        # Worker for expensive operations, started with the first one; input that arrives
+        # while it runs is queued and applied to its result
+        self.executor = None
+        self._queued = []
         
         # Window Dragging Logic
         self.old_pos = None
 
+        if session is not None:
+            state = session.load()
+            if state is not None:
+                self.restore_session(state)
+            self.session = session
+
+    def restore_session(self, state):
+        # Runs before the window is shown, so the first frame already has the saved state
+        model = self.model
+        if state.engine == model.engine.name:
+            model.restore(state.snapshot)
+            self.display.set_text_now(model.get_display())
+            fresh = CalculatorModel(model.engine).snapshot()
+            self.buttons['AC'].setText('AC' if model.snapshot() == fresh else 'C')
+        if state.position is not None:
+            self.move(*state.position)
+
+    def save_session(self):
+        if self.session is not None:
+            self.session.save(self.model.engine.name, self.model.snapshot(), (self.x(), self.y()))
+
+    def background_path(self):
+        # Rounded background shape, rebuilt only when the window is resized
+        if self._background_path is None:
+            path = QPainterPath()
+            rect = QRectF(self.rect())
+            path.addRoundedRect(rect, 20, 20) # 20px radius
+            self._background_path = path
+        return self._background_path
+
+    def resizeEvent(self, event):
+        self._background_path = None
+        if self.performance:
+            self.setMask(QRegion(self.background_path().toFillPolygon().toPolygon()))
+        super().resizeEvent(event)
+
     def paintEvent(self, event):
-        # Draw rounded background
+        repaint_stats.record('MainWindow', event.region())
+        if not self._painted:
+            self._painted = True
+            self.first_painted.emit()
         painter = QPainter(self)
+        if self.performance:
+            painter.fillRect(event.rect(), self._background_color)
+            return
+
+        # Draw rounded background
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        path = QPainterPath()
-        rect = QRectF(self.rect())
-        path.addRoundedRect(rect, 20, 20) # 20px radius
-        
-        painter.fillPath(path, QColor(styles.COLOR_BACKGROUND))
+        painter.fillPath(self.background_path(), self._background_color)
 
     def setup_buttons(self):
         # Definition: (Text, Row, Col, RowSpan, ColSpan, Type)
@@ -69,6 +154,13 @@ class MainWindow(QMainWindow):
             ('0', 4, 0, 1, 2, 0), ('.', 4, 2, 1, 1, 0), ('=', 4, 3, 1, 1, 1),
         ]
 
+        # Handler per button, by the text it is defined with
+        handlers = {d: (lambda d=d: self.on_digit(d)) for d in DIGITS}
+        handlers.update({k: (lambda op=op: self.on_operation(op)) for k, op in OPERATOR_KEYS.items()})
+        handlers.update({'.': self.on_decimal, 'AC': self.on_clear, '+/-': self.on_sign, '%': self.on_percent,
+                         '=': self.on_equals})
+
+        keys = []
         for text, r, c, rs, cs, btype in btn_defs:
             if btype == 0:
                 bg, fg = styles.COLOR_BTN_NUM, styles.COLOR_TEXT_WHITE
@@ -76,52 +168,101 @@ class MainWindow(QMainWindow):
                 bg, fg = styles.COLOR_BTN_OP, styles.COLOR_TEXT_WHITE
             else:
                 bg, fg = styles.COLOR_BTN_FUNC, styles.COLOR_TEXT_BLACK
-                
-            btn = CalculatorButton(text, bg, fg)
-            if text == '0':
-                # Special handling for 0 button width if needed, or just let spans handle it
-                # Because we are drawing circles, a spanned button needs to be drawn as a rounded rect (lozenge)
-                # My CalculatorButton draws a circle by using min(width,height).
-                # I should update CalculatorButton to handle non-square shapes if 0 is wide.
-                # For now let's assume it draws a circle in the center or left aligned?
-                # iOS 0 button is a lozenge (rounded rect).
-                # I will stick to the default implementation which might draw a circle in the middle unless I fix it.
-                # *Self-Correction*: The user requested iOS style. 0 is wide.
-                # I should override paintEvent for the 0 button or make CalculatorButton adaptive.
-                # Let's override the paint logic for this instance or subclass?
-                # Simpler: Make CalculatorButton draw a rounded rect based on its size, with radius = height/2.
-                pass
+            keys.append((text, r, c, rs, cs, bg, fg))
+
+        if styles.KEYPAD_MODE == "painted":
+            # One widget paints every key; MainWindow.buttons holds its PaintedKeys
+            self.keypad = PaintedKeypad(keys)
+            self.keypad.clicked.connect(lambda text: handlers[text]())
+            self.buttons = self.keypad.keys
+            return
 
+        # Grid Layout for Buttons
+        self.keypad = QWidget()
+        self.grid_layout = QGridLayout(self.keypad)
+        self.grid_layout.setContentsMargins(0, 0, 0, 0)
+        self.grid_layout.setSpacing(styles.GRID_SPACING)
+        for text, r, c, rs, cs, bg, fg in keys:
+            # The 0 button spans two cells but keeps its fixed size, so it is drawn as a
+            # circle; CalculatorButton draws a lozenge when it is made wider than high
+            btn = CalculatorButton(text, bg, fg)
             self.grid_layout.addWidget(btn, r, c, rs, cs)
             self.buttons[text] = btn
-            
-            # Connect
-            if text in ['0', '1', '2', '3', '4', '5', '6', '7', '8', '9']:
-                btn.clicked.connect(lambda _, t=text: self.on_digit(t))
-            elif text == '.':
-                btn.clicked.connect(self.on_decimal)
-            elif text == 'AC':
-                btn.clicked.connect(self.on_clear)
-            elif text == '+/-':
-                btn.clicked.connect(self.on_sign)
-            elif text == '%':
-                btn.clicked.connect(self.on_percent)
-            elif text == '=':
-                btn.clicked.connect(self.on_equals)
-            else:
-                # Ops
-                op_map = {'+': Operation.ADD, '−': Operation.SUBTRACT, '×': Operation.MULTIPLY, '÷': Operation.DIVIDE}
-                btn.clicked.connect(lambda _, o=op_map[text]: self.on_operation(o))
+            btn.clicked.connect(lambda _, handler=handlers[text]: handler())
 
-    def on_digit(self, d):
-        self.model.input_digit(d)
+    def apply(self, action, *args):
+        # Runs a CalculatorModel method and refreshes the display. With tracing on, the
+        # 'input' span lasts until the display has painted the result
+        if self._paste_steps is not None:
+            self.finish_paste()  # keys typed during a paste apply after it
+        if self.executor is not None and self.executor.running:
+            self._queued.append(lambda: self.apply(action, *args))
+            return
+        self.undo_history.record()
+        if action.__name__ in self.WORKER_ACTIONS and self.model.work_size() >= styles.WORKER_MIN_BITS:
+            self.run_in_worker(action.__name__, *args)
+            return
+        if not tracer.enabled:
+            action(*args)
+            self.update_ui()
+            return
+        tracer.open('input')
+        with tracer.span('model.' + action.__name__):
+            action(*args)
+        with tracer.span('MainWindow.update_ui'):
+            self.update_ui()
+
+    def run_in_worker(self, method, *args):
+        if self.executor is None:
+            from src.ui.executor import ModelExecutor
+            self.executor = ModelExecutor(self)
+            self.executor.finished.connect(self._worker_finished)
+            self.executor.busy_changed.connect(self._set_busy)
+        tracer.open('input')
+        tracer.open('model.worker')
+        self.executor.submit(self.model, method, args)
+
+    def _worker_finished(self, result):
+        tracer.close('model.worker')
+        if isinstance(result, Exception):
+            # Raising in a slot would abort the app; the job fails like a division by zero
+            traceback.print_exception(result, file=sys.stderr)
+            self.model.set_error()
+        else:
+            state, display, records = result
+            self.model.restore(state, display)
+            if self.history is not None:
+                for record in records:
+                    self.history.append(*record)
         self.update_ui()
+        queued, self._queued = self._queued, []
+        for call in queued:
+            call()  # queues itself again if it starts another job
+
+    def cancel_worker(self):
+        # Drops the running job and the input queued behind it; the model keeps its state
+        # from before the job
+        if self.executor is not None and self.executor.running:
+            self.executor.cancel()
+            self._queued.clear()
+            tracer.close('model.worker')
+            return True
+        return False
+
+    def _set_busy(self, busy):
+        self.display.set_busy(busy)
+        if busy:
+            self.setCursor(Qt.CursorShape.BusyCursor)
+        else:
+            self.unsetCursor()
+
+    def on_digit(self, d):
+        self.apply(self.model.input_digit, d)
         # Toggle AC to C? iOS does this.
         self.buttons['AC'].setText('C')
 
     def on_decimal(self):
-        self.model.input_decimal()
-        self.update_ui()
+        self.apply(self.model.input_decimal)
         self.buttons['AC'].setText('C')
 
     def on_clear(self):
@@ -130,28 +271,157 @@ class MainWindow(QMainWindow):
         # But my model has 'reset()' which is AC. 
         # I'll just map to reset for now or implement clear entry if I have time.
         # User requirement says "Botón AC: borra todo el estado."
-        self.model.reset()
+        self.cancel_worker()
+        self.apply(self.model.reset)
         self.buttons['AC'].setText('AC')
-        self.update_ui()
+
+    def on_undo(self):
+        if self._paste_steps is not None:
+            self.finish_paste()
+        # Undoing a running job cancels it, and drops the step recorded for it
+        self.cancel_worker()
+        if self.undo_history.undo():
+            self.update_ui()
+
+    def on_redo(self):
+        if self._paste_steps is not None:
+            self.finish_paste()
+        self.cancel_worker()
+        if self.undo_history.redo():
+            self.update_ui()
+
+    def on_backspace(self):
+        self.apply(self.model.backspace)
 
     def on_sign(self):
-        self.model.toggle_sign()
-        self.update_ui()
+        self.apply(self.model.toggle_sign)
 
     def on_percent(self):
-        self.model.percentage()
-        self.update_ui()
+        self.apply(self.model.percentage)
 
     def on_operation(self, op):
-        self.model.set_operation(op)
-        self.update_ui()
+        self.apply(self.model.set_operation, op)
 
     def on_equals(self):
-        self.model.calculate()
-        self.update_ui()
+        self.apply(self.model.calculate)
 
     def update_ui(self):
         self.display.set_text(self.model.get_display())
+        self.save_session()
+        if self.history_view is not None and not self.history_view.isHidden():
+            self.history_view.refresh()
+
+    def _show_panel(self, panel):
+        # The keypad, the history view and the sweep table take turns below the display
+        for widget in (self.keypad, self.history_view, self.sweep_view):
+            if widget is not None:
+                widget.setVisible(widget is panel)
+
+    def toggle_history(self):
+        # The history view replaces the keypad; it is created the first time it is shown
+        if self.history is None:
+            return
+        if self.history_view is None:
+            from src.ui.history_view import HistoryView
+            self.history_view = HistoryView(self.history)
+            self.history_view.hide()
+            self.main_layout.addWidget(self.history_view)
+        if self.history_view.isHidden():
+            self._show_panel(self.history_view)
+            self.history_view.refresh()
+            self.history_view.scrollToBottom()
+        else:
+            self._show_panel(self.keypad)
+
+    def toggle_sweep(self):
+        # Asks for operands and tabulates the pending operation over them (float engine only)
+        if self.sweep_view is not None and not self.sweep_view.isHidden():
+            self._show_panel(self.keypad)
+            return
+        model = self.model
+        if model.pending_operation == Operation.NONE or model.error_state or model.engine.name != 'float':
+            return
+        from PyQt6.QtWidgets import QInputDialog, QMessageBox
+        from src.vectorized import parse_operands
+        label = f"{model.engine.format(model.pending_value)} {model.pending_operation.value} x for x in:"
+        text, ok = QInputDialog.getText(self, "Table", label, text="1:100")
+        if not ok:
+            return
+        try:
+            operands = parse_operands(text)
+        except ValueError as exc:
+            QMessageBox.warning(self, "Table", f"{exc}.\nUse start:stop, start:stop:step or a list.")
+            return
+        self.show_sweep(operands)
+
+    def show_sweep(self, operands):
+        from src.ui.sweep_view import SweepView
+        with tracer.span('model.sweep'):
+            view = SweepView(self.model.pending_value, self.model.pending_operation, operands)
+        if self.sweep_view is not None:
+            self.main_layout.removeWidget(self.sweep_view)
+            self.sweep_view.deleteLater()
+        self.sweep_view = view
+        self.main_layout.addWidget(view)
+        self._show_panel(view)
+
+    def export_sweep(self):
+        if self.sweep_view is None or self.sweep_view.isHidden():
+            return
+        from PyQt6.QtWidgets import QFileDialog
+        path, _ = QFileDialog.getSaveFileName(self, "Export table", "table.csv", "CSV files (*.csv)")
+        if path:
+            self.sweep_view.model().write_csv(path)
+
+    def paste_text(self, text):
+        # The paste is compiled and run in batches; long ones are spread over several
+        # event-loop turns, and the display is only updated once, at the end
+        if self._paste_steps is not None:
+            self.finish_paste()
+        if self.executor is not None and self.executor.running:
+            self._queued.append(lambda: self.paste_text(text))
+            return
+        try:
+            steps = run_text(text, self.model)
+        except ValueError:
+            return  # not calculator input
+        self.undo_history.record()  # the whole paste is one step
+        self._paste_steps = steps
+        tracer.open('input')
+        self._continue_paste()
+
+    def _continue_paste(self):
+        if self._paste_steps is None:
+            return  # finished early by finish_paste()
+        deadline = time.perf_counter() + styles.PASTE_SLICE_MS / 1000
+        with tracer.span('model.paste_slice'):
+            for _ in self._paste_steps:
+                if time.perf_counter() > deadline:
+                    QTimer.singleShot(0, self._continue_paste)
+                    return
+        self._paste_steps = None
+        self.update_ui()
+        self.buttons['AC'].setText('C')
+
+    def finish_paste(self):
+        with tracer.span('model.paste_slice'):
+            for _ in self._paste_steps:
+                pass
+        self._paste_steps = None
+        self.update_ui()
+
+    def closeEvent(self, event):
+        # Nothing may drive the model after closed: a WindowManager hands it to another window
+        self._paste_steps = None
+        self._queued.clear()
+        if self.executor is not None:
+            self.executor.cancel()  # a result already on its way is dropped
+            self.executor.close()
+        if self.session is not None:
+            self.save_session()  # a hidden window gets no move events
+            self.session.close()
+        super().closeEvent(event)
+        self.closed.emit()
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
@@ -166,7 +436,38 @@ class MainWindow(QMainWindow):
     def mouseReleaseEvent(self, event):
         self.old_pos = None
 
+    def moveEvent(self, event):
+        super().moveEvent(event)
+        self.save_session()
+
     def keyPressEvent(self, event):
-        if event.key() == Qt.Key.Key_Escape:
+        key = event.key()
+        if key == Qt.Key.Key_Escape:
             self.close()
+        elif key == Qt.Key.Key_H and event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            self.toggle_history()
+        elif key == Qt.Key.Key_T and event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            self.toggle_sweep()
+        elif event.matches(QKeySequence.StandardKey.Save):
+            self.export_sweep()
+        elif event.matches(QKeySequence.StandardKey.Undo):
+            self.on_undo()
+        elif event.matches(QKeySequence.StandardKey.Redo) or event.keyCombination() == QKeyCombination(
+                Qt.KeyboardModifier.ControlModifier | Qt.KeyboardModifier.ShiftModifier, Qt.Key.Key_Z):
+            self.on_redo()
+        elif event.matches(QKeySequence.StandardKey.Paste):
+            self.paste_text(QApplication.clipboard().text())
+        elif key in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+            self.on_equals()
+        elif key == Qt.Key.Key_Backspace:
+            self.on_backspace()
+        elif key == Qt.Key.Key_Delete:
+            self.on_clear()
+        else:
+            try:
+                handler = self.key_handlers[normalize_key(event.text())]
+            except (KeyError, ValueError):
+                super().keyPressEvent(event)
+                return
+            handler()
 
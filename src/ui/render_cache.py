@@ -0,0 +1,59 @@
+from collections import OrderedDict, namedtuple
+
+CacheStats = namedtuple('CacheStats', ['hits', 'misses', 'evictions', 'entries', 'bytes', 'max_bytes'])
+
+# Scale factors are rounded to this many steps per unit, so an animation reuses a
+# small set of frames (0.95..1.0 is 10 frames)
+SCALE_STEPS = 200
+
+
+def quantize_scale(scale: float) -> float:
+    return round(scale * SCALE_STEPS) / SCALE_STEPS
+
+
+class PixmapCache:
+    # LRU of rendered QPixmaps, bounded by their pixel memory rather than by count
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._pixmaps = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, render):
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self.hits += 1
+            self._pixmaps.move_to_end(key)
+            return pixmap
+
+        self.misses += 1
+        pixmap = render()
+        size = pixmap.width() * pixmap.height() * pixmap.depth() // 8
+        if size > self.max_bytes:
+            return pixmap
+        self._pixmaps[key] = pixmap
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, old = self._pixmaps.popitem(last=False)
+            self._bytes -= old.width() * old.height() * old.depth() // 8
+            self.evictions += 1
+        return pixmap
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, self.evictions, len(self._pixmaps), self._bytes, self.max_bytes)
+
+    def clear(self):
+        self._pixmaps.clear()
+        self._bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+
+# Shared by every CalculatorButton
+button_cache = PixmapCache()
@@ -0,0 +1,27 @@
+from collections import Counter
+
+
+class RepaintStats:
+    # Paint events and repainted pixels per widget kind. PyQt6 cannot list the rects of
+    # a QRegion, so the area is that of the region's bounding rect.
+    def __init__(self):
+        self.events = Counter()
+        self.pixels = Counter()
+
+    def record(self, name, region):
+        rect = region.boundingRect()
+        self.events[name] += 1
+        self.pixels[name] += rect.width() * rect.height()
+
+    def reset(self):
+        self.events.clear()
+        self.pixels.clear()
+
+    def snapshot(self):
+        return {name: {'events': self.events[name], 'pixels': self.pixels[name]} for name in self.events}
+
+    def total_pixels(self):
+        return sum(self.pixels.values())
+
+
+repaint_stats = RepaintStats()
@@ -7,6 +7,7 @@ COLOR_BTN_FUNC = "#A5A5A5"    # Light Gray for AC, +/-, %
 COLOR_BTN_OP = "#FF9500"      # Orange for operations
 COLOR_TEXT_WHITE = "#FFFFFF"
 COLOR_TEXT_BLACK = "#000000"
+COLOR_TEXT_BUSY = "#8E8E93"   # Display text while a result is being computed
 
 # Dimensions
 WINDOW_WIDTH = 360
@@ -14,9 +15,34 @@ WINDOW_HEIGHT = 600
 BUTTON_SIZE = 75
 BUTTON_MARGIN = 10
 GRID_SPACING = 12
+WINDOW_CASCADE = 30  # offset of each new window from the previous one
+INSTANCE_PROBE_MS = 200  # how long listen() waits for an instance already at the address
+
+# Rendering
+# "quality": translucent window with antialiased rounded corners (default)
+# "performance": opaque window clipped by a mask, buttons repaint only the changed area
+RENDER_MODES = ("quality", "performance")
+RENDER_MODE = "quality"
+# "widgets": one CalculatorButton per key (default)
+# "painted": one widget paints every key (fewer widgets, cheaper startup and input)
+KEYPAD_MODES = ("widgets", "painted")
+KEYPAD_MODE = "widgets"
 
 # Fonts
 FONT_FAMILY = ".AppleSystemUIFont"  # Default on Mac, falls back gracefully if handled well
 FONT_SIZE_DISPLAY_MAIN = 50
+FONT_SIZE_DISPLAY_MIN = 24           # long text shrinks down to this, then turns scientific
 FONT_SIZE_DISPLAY_OP = 24
 FONT_SIZE_BUTTON = 32
+
+# Display updates
+DISPLAY_FRAME_MS = 16               # updates within one frame are merged into one
+FAST_TYPING_KEYS_PER_SEC = 8        # above this rate the display skips its fade animation
+PASTE_SLICE_MS = 8                  # long pastes run in slices of this length between events
+
+# Undo
+UNDO_DEPTH = 1000                   # undo steps kept (Ctrl+Z / Ctrl+Shift+Z)
+
+# Background evaluation
+WORKER_MIN_BITS = 200_000           # operations on numbers this large run in a worker process
+BUSY_THRESHOLD_MS = 100             # the display dims when a worker takes longer than this
@@ -0,0 +1,81 @@
+import csv
+from itertools import islice
+
+from PyQt6.QtWidgets import QTableView, QHeaderView, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from src.logic import format_number
+from src.vectorized import sweep
+from src.ui import styles
+
+
+class SweepTableModel(QAbstractTableModel):
+    # Results are computed for every operand up front (one NumPy pass); the text of a
+    # row is only built when the view asks for it
+    def __init__(self, pending, operation, operands, parent=None):
+        super().__init__(parent)
+        self.operands = operands
+        self.results, self.errors = sweep(pending, operation, operands)
+        self.columns = ("x", f"{format_number(float(pending))} {operation.value} x")
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.operands)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 2
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.columns[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        row = index.row()
+        if index.column() == 0:
+            return format_number(float(self.operands[row]))
+        return self.result_text(row)
+
+    def result_text(self, row):
+        if self.errors[row]:
+            return "Error"
+        return format_number(float(self.results[row]))
+
+    def rows(self):
+        errors = self.errors.tolist()
+        for operand, result, error in zip(self.operands.tolist(), self.results.tolist(), errors):
+            yield format_number(operand), "Error" if error else format_number(result)
+
+    def write_csv(self, path):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.columns)
+            rows = self.rows()
+            while True:
+                block = list(islice(rows, 65536))
+                if not block:
+                    break
+                writer.writerows(block)
+
+
+class SweepView(QTableView):
+    def __init__(self, pending, operation, operands, parent=None):
+        super().__init__(parent)
+        self.setModel(SweepTableModel(pending, operation, operands, self))
+        self.setStyleSheet(f"color: {styles.COLOR_TEXT_WHITE}; background: {styles.COLOR_BACKGROUND};"
+                           f" gridline-color: {styles.COLOR_BTN_NUM};")
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        # Fixed row heights and column widths: nothing is measured per row
+        rows = self.verticalHeader()
+        rows.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        rows.setDefaultSectionSize(24)
+        rows.hide()
+        columns = self.horizontalHeader()
+        columns.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        columns.setStretchLastSection(True)
+        self.setColumnWidth(0, 140)
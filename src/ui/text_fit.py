@@ -0,0 +1,143 @@
+import re
+from collections import OrderedDict, namedtuple
+
+from PyQt6.QtGui import QFont, QFontMetricsF
+
+from src.ui import styles
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+# Digits have the same advance in the display fonts (tabular figures), so text is
+# measured by its length and character classes: every digit counts as '0'
+_CLASSES = str.maketrans('123456789', '000000000')
+_RUN_RE = re.compile(r'(.)\1*', re.DOTALL)
+_SHORT_TEXT = 64  # characters
+
+_SCIENTIFIC_DIGITS = 16  # significant digits tried first in scientific notation
+
+
+def _shape(text: str):
+    # The cache key of text, (length, runs of character classes), and its class string.
+    # Short text is its own run list; only long text is worth run-length encoding
+    classes = text.translate(_CLASSES)
+    if len(classes) <= _SHORT_TEXT:
+        return classes, classes
+    return (len(text), tuple((m.group(1), m.end() - m.start()) for m in _RUN_RE.finditer(classes))), classes
+
+
+def _parse(text: str):
+    # text (a number as the model displays it, possibly p/q) as a finite Decimal, or None
+    from decimal import Decimal, localcontext  # only needed for text that does not fit
+    try:
+        if '/' in text:
+            numerator, denominator = text.split('/')
+            with localcontext() as context:
+                context.prec = _SCIENTIFIC_DIGITS + 2
+                value = Decimal(numerator) / Decimal(denominator)
+        else:
+            value = Decimal(text)
+    except (ValueError, ArithmeticError):
+        return None
+    return value if value.is_finite() else None
+
+
+def _scientific(value, digits: int):
+    # value with digits significant digits, e.g. 1.2345e20
+    mantissa, _, exponent = format(value, f'.{digits - 1}e').partition('e')
+    if '.' in mantissa:
+        mantissa = mantissa.rstrip('0').rstrip('.')
+    return f"{mantissa}e{int(exponent)}"
+
+
+class TextFitter:
+    """Picks the largest display font size, down to min_size, at which text fits a width.
+
+    Text too wide even at min_size is shown in scientific notation with as many
+    significant digits as fit. Widths are cached by (length, runs of character classes,
+    size), so once a text shape has been seen fitting it costs a dict lookup per size
+    tried, and a long entry keeps a key of a few runs rather than its text.
+    """
+
+    def __init__(self, family=styles.FONT_FAMILY, max_size=styles.FONT_SIZE_DISPLAY_MAIN,
+                 min_size=styles.FONT_SIZE_DISPLAY_MIN, maxsize=4096):
+        self.family = family
+        self.max_size = max_size
+        self.min_size = min_size
+        self.maxsize = maxsize
+        self._fonts = {}
+        self._metrics = {}
+        self._widths = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size: int) -> QFont:
+        font = self._fonts.get(size)
+        if font is None:
+            font = QFont(self.family)
+            font.setPixelSize(size)
+            font.setWeight(QFont.Weight.Thin)
+            self._fonts[size] = font
+        return font
+
+    def width(self, text: str, size: int) -> float:
+        return self._width(*_shape(text), size)
+
+    def _width(self, shape, classes: str, size: int) -> float:
+        key = (shape, size)
+        widths = self._widths
+        width = widths.get(key)
+        if width is not None:
+            self.hits += 1
+            widths.move_to_end(key)
+            return width
+        self.misses += 1
+        metrics = self._metrics.get(size)
+        if metrics is None:
+            metrics = self._metrics[size] = QFontMetricsF(self.font(size))
+        width = widths[key] = metrics.horizontalAdvance(classes)
+        if len(widths) > self.maxsize:
+            widths.popitem(last=False)
+        return width
+
+    def size_for(self, text: str, available: float):
+        # Largest size at which text fits, or None
+        shape, classes = _shape(text)
+        width = self._width(shape, classes, self.max_size)
+        if width <= available:
+            return self.max_size
+        # Widths grow about linearly with the size: start from the estimate
+        size = min(self.max_size - 1, int(self.max_size * available / width) + 1)
+        while size >= self.min_size:
+            if self._width(shape, classes, size) <= available:
+                return size
+            size -= 1
+        return None
+
+    def fit(self, text: str, available: float):
+        """(text to show, font size) for text in available pixels."""
+        size = self.size_for(text, available)
+        if size is not None:
+            return text, size
+        value = _parse(text)
+        if value is None:
+            return text, self.min_size  # clipped
+        for digits in range(_SCIENTIFIC_DIGITS, 0, -1):
+            short = _scientific(value, digits)
+            size = self.size_for(short, available)
+            if size is not None:
+                return short, size
+        return text, self.min_size  # clipped
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._widths))
+
+
+_display_fitter = None
+
+
+def display_fitter() -> TextFitter:
+    # Shared by every display, like widgets.button_font()
+    global _display_fitter
+    if _display_fitter is None:
+        _display_fitter = TextFitter()
+    return _display_fitter
@@ -1,7 +1,24 @@
-from PyQt6.QtWidgets import QPushButton, QLabel, QWidget, QVBoxLayout
-from PyQt6.QtCore import Qt, QPropertyAnimation, pyqtProperty, QRectF, QPoint, QEasingCurve, QTimer
-from PyQt6.QtGui import QPainter, QColor, QFont, QBrush, QPen
-from src.ui import styles
+import time
+
+from PyQt6.QtWidgets import QPushButton, QLabel, QWidget, QVBoxLayout, QSizePolicy
+from PyQt6.QtCore import (Qt, QPropertyAnimation, QAbstractAnimation, pyqtProperty, pyqtSignal, QObject,
+                          QRectF, QPoint, QEasingCurve, QTimer, QEvent)
+from PyQt6.QtGui import QPainter, QColor, QFont, QBrush, QPen, QPixmap
+from src.ui import styles, render_cache
+from src.ui.repaint_stats import repaint_stats
+from src.ui.text_fit import display_fitter
+from src.tracing import tracer
+
+_button_font = None
+
+
+def button_font():
+    # One QFont shared by every button instead of one per button
+    global _button_font
+    if _button_font is None:
+        _button_font = QFont(styles.FONT_FAMILY)
+        _button_font.setPixelSize(styles.FONT_SIZE_BUTTON)
+    return _button_font
 
 class CalculatorButton(QPushButton):
     def __init__(self, text, bg_color, text_color, parent=None):
@@ -15,13 +32,20 @@ class CalculatorButton(QPushButton):
         
         self.current_bg = self.normal_bg
         self._scale_factor = 1.0
+        self.anim = None
+        self.performance = styles.RENDER_MODE == "performance"
         
         # Font
-        font = QFont(styles.FONT_FAMILY)
-        font.setPixelSize(styles.FONT_SIZE_BUTTON)
-        self.setFont(font)
+        self.setFont(button_font())
+
+        if self.performance:
+            # Faces are drawn over the window color, so the window never repaints underneath.
+            # The style clears the attribute when polishing a button, so polish first.
+            self.ensurePolished()
+            self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
         
         self.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)  # typed keys go to the window
 
     @pyqtProperty(float)
     def scale_factor(self):
@@ -29,8 +53,16 @@ class CalculatorButton(QPushButton):
 
     @scale_factor.setter
     def scale_factor(self, value):
+        if not self.performance:
+            self._scale_factor = value
+            self.update()
+            return
+        # Only repaint when the cached frame changes, and only the area the face covers
+        old = render_cache.quantize_scale(self._scale_factor)
+        new = render_cache.quantize_scale(value)
         self._scale_factor = value
-        self.update()
+        if old != new:
+            self.update(self._face_rect(max(old, new)).toAlignedRect().adjusted(-1, -1, 1, 1))
 
     def hitButton(self, pos: QPoint):
         # Circular hit detection - optional, but nice
@@ -44,12 +76,7 @@ class CalculatorButton(QPushButton):
         self.current_bg = self.pressed_bg
         
         # Scale animation (shrink)
-        self.anim = QPropertyAnimation(self, b"scale_factor")
-        self.anim.setDuration(100)
-        self.anim.setStartValue(1.0)
-        self.anim.setEndValue(0.95)
-        self.anim.setEasingCurve(QEasingCurve.Type.OutQuad)
-        self.anim.start()
+        self._animate_scale(100, 1.0, 0.95, QEasingCurve.Type.OutQuad)
         
         super().mousePressEvent(event)
 
@@ -57,104 +84,252 @@ class CalculatorButton(QPushButton):
         self.current_bg = self.normal_bg
         
         # Scale animation (restore)
-        self.anim = QPropertyAnimation(self, b"scale_factor")
-        self.anim.setDuration(300)
-        self.anim.setStartValue(self._scale_factor)
-        self.anim.setEndValue(1.0)
-        self.anim.setEasingCurve(QEasingCurve.Type.OutElastic) # Gentle bounce
-        self.anim.start()
+        self._animate_scale(300, self._scale_factor, 1.0, QEasingCurve.Type.OutElastic) # Gentle bounce
         
         super().mouseReleaseEvent(event)
 
+    def _animate_scale(self, duration, start, end, easing):
+        # One animation object per button, restarted for every press and release
+        if self.anim is None:
+            self.anim = QPropertyAnimation(self, b"scale_factor")
+        self.anim.stop()
+        self.anim.setDuration(duration)
+        self.anim.setStartValue(start)
+        self.anim.setEndValue(end)
+        self.anim.setEasingCurve(easing)
+        self.anim.start()
+
     def paintEvent(self, event):
+        # Button faces are rendered once per (shape, size, colors, text, scale, dpr) and
+        # blitted afterwards, so animation frames mostly cost a drawPixmap
+        scale = render_cache.quantize_scale(self._scale_factor)
+        dpr = self.devicePixelRatioF()
+        key = (self._is_lozenge(), self.width(), self.height(), self.current_bg.rgba(), self.text_color.rgba(),
+               self.text(), self.font().key(), scale, dpr, self.performance)
+        pixmap = render_cache.button_cache.get(key, lambda: self._render_face(scale, dpr))
+
+        repaint_stats.record('CalculatorButton', event.region())
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # Draw Background
-        painter.setBrush(QBrush(self.current_bg))
-        painter.setPen(Qt.PenStyle.NoPen)
-        
+        painter.drawPixmap(0, 0, pixmap)
+
+    def _is_lozenge(self):
         # If width > height (like the 0 button), draw a lozenge (rounded rect with radius = height/2)
         # Otherwise draw a circle
-        
-        if self.width() > self.height() * 1.2: # slight tolerance
-             # Calculate scaled rect for lozenge
-            w = self.width() * self._scale_factor
-            h = self.height() * self._scale_factor
-            x_off = (self.width() - w) / 2
-            y_off = (self.height() - h) / 2
-            rect = QRectF(x_off, y_off, w, h)
-            radius = h / 2
-            painter.drawRoundedRect(rect, radius, radius)
-            
-            # Text alignment adjustment if needed
-            # For 0 button in iOS, text is left aligned with some padding? 
-            # Actually usually it's still centered or slightly left. 
-            # Let's keep it centered for simplicity unless it looks bad.
-            # *Correction*: iOS 0 is left aligned. Let's try to align it left if it's wide.
-            painter.setPen(self.text_color)
-            painter.setFont(self.font())
-            alignment = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
-            # Add padding for left alignment
-            text_rect = QRectF(rect.left() + radius, rect.top(), rect.width() - radius, rect.height())
-            painter.drawText(text_rect, alignment, self.text())
-            
-        else:
-            # Circle
-            size = min(self.width(), self.height()) * self._scale_factor
-            offset_x = (self.width() - size) / 2
-            offset_y = (self.height() - size) / 2
-            rect = QRectF(offset_x, offset_y, size, size)
-            painter.drawEllipse(rect)
-        
-            # Draw Text Centered
-            painter.setPen(self.text_color)
-            painter.setFont(self.font())
-            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, self.text())
+        return self.width() > self.height() * 1.2 # slight tolerance
+
+    def _face_rect(self, scale):
+        return face_rect(self.width(), self.height(), self._is_lozenge(), scale)
+
+    def _render_face(self, scale, dpr):
+        return render_face(self.width(), self.height(), self._is_lozenge(), self.current_bg, self.text_color,
+                           self.text(), self.font(), scale, dpr, self.performance)
+
+
+# Button faces, shared by CalculatorButton and the painted keypad (src/ui/keypad.py)
+
+def face_rect(width, height, lozenge, scale):
+    if lozenge:
+        # Calculate scaled rect for lozenge
+        w = width * scale
+        h = height * scale
+    else:
+        w = h = min(width, height) * scale
+    return QRectF((width - w) / 2, (height - h) / 2, w, h)
+
+
+def render_face(width, height, lozenge, bg, fg, text, font, scale, dpr, opaque):
+    # A width x height pixmap with the face drawn over the window color (opaque) or
+    # over transparency
+    pixmap = QPixmap(round(width * dpr), round(height * dpr))
+    pixmap.setDevicePixelRatio(dpr)
+    pixmap.fill(QColor(styles.COLOR_BACKGROUND) if opaque else Qt.GlobalColor.transparent)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+    # Draw Background
+    painter.setBrush(QBrush(bg))
+    painter.setPen(Qt.PenStyle.NoPen)
+
+    rect = face_rect(width, height, lozenge, scale)
+    painter.setFont(font)
+    if lozenge:
+        radius = rect.height() / 2
+        painter.drawRoundedRect(rect, radius, radius)
+
+        # iOS 0 is left aligned: the text starts after the rounded end
+        painter.setPen(fg)
+        alignment = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+        text_rect = QRectF(rect.left() + radius, rect.top(), rect.width() - radius, rect.height())
+        painter.drawText(text_rect, alignment, text)
+    else:
+        # Circle
+        painter.drawEllipse(rect)
+
+        # Draw Text Centered
+        painter.setPen(fg)
+        painter.drawText(QRectF(0, 0, width, height), Qt.AlignmentFlag.AlignCenter, text)
+    painter.end()
+    return pixmap
 
 
 from PyQt6.QtWidgets import QGraphicsOpacityEffect
 
+class DisplayUpdateScheduler(QObject):
+    # Collects display updates for one frame and delivers only the last one. Also tracks
+    # how fast updates arrive so the display can drop its fades during fast typing.
+    flushed = pyqtSignal(str, bool)  # text, animate
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pending = None
+        self._last_update = None
+        self._interval = 1.0  # smoothed seconds between updates
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(styles.DISPLAY_FRAME_MS)
+        self._timer.timeout.connect(self.flush)
+
+    @property
+    def fast_input(self):
+        return self._interval * styles.FAST_TYPING_KEYS_PER_SEC < 1.0
+
+    def schedule(self, text):
+        now = time.monotonic()
+        if self._last_update is not None:
+            self._interval = 0.5 * (self._interval + now - self._last_update)
+        self._last_update = now
+        self._pending = text
+        if not self._timer.isActive():
+            tracer.open('display.frame_wait')
+            self._timer.start()
+
+    def flush(self):
+        self._timer.stop()
+        if self._pending is not None:
+            tracer.close('display.frame_wait')
+            text, self._pending = self._pending, None
+            with tracer.span('DisplayLabel.show_text'):
+                self.flushed.emit(text, not self.fast_input)
+
 class DisplayLabel(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(0, 0, 20, 10) # Right margin
-        self.layout.setAlignment(Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignRight)
+        self.layout.setAlignment(Qt.AlignmentFlag.AlignBottom)  # the label spans the width and aligns its text right
         
         self.main_label = QLabel("0")
         self.main_label.setStyleSheet(f"color: {styles.COLOR_TEXT_WHITE};")
-        font = QFont(styles.FONT_FAMILY)
-        font.setPixelSize(styles.FONT_SIZE_DISPLAY_MAIN)
-        font.setWeight(QFont.Weight.Thin)
-        self.main_label.setFont(font)
+        # Long text shrinks the font, then turns scientific, to fit the label's width;
+        # the label itself never asks for more room
+        self.fitter = display_fitter()
+        self._font_size = self.fitter.max_size
+        self._shown_text = "0"  # the text the label shows, before fitting
+        self.main_label.setFont(self.fitter.font(self._font_size))
+        self.main_label.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Preferred)
         self.main_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignBottom)
         
-        # Opacity Effect for Animation
-        self.eff = QGraphicsOpacityEffect(self.main_label)
-        self.main_label.setGraphicsEffect(self.eff)
+        # Opacity Effect for Animation, installed with the first fade: an effect renders
+        # the label through an offscreen pixmap, which the first frame does not need
+        self.eff = None
         
         self.layout.addWidget(self.main_label)
-        
+
+        # Fade animations are created once and restarted; the fade-out always
+        # swaps in the latest target text, not the one it was started for
+        self._target_text = "0"
+        self.anim_out = None
+        self.anim_in = None
+
+        self.scheduler = DisplayUpdateScheduler(self)
+        self.scheduler.flushed.connect(self._show_text)
+
+        if tracer.enabled:
+            # Ends the 'input' span when the new text is painted (the opacity effect draws
+            # nothing while a fade-in is at 0)
+            self.main_label.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and self._shown_text == self._target_text:
+            tracer.close('input')
+        return False
+
+    def text(self):
+        return self._target_text
+
+    def _set_label_text(self, text):
+        margins = self.layout.contentsMargins()
+        shown, size = self.fitter.fit(text, self.width() - margins.left() - margins.right())
+        if size != self._font_size:
+            self._font_size = size
+            self.main_label.setFont(self.fitter.font(size))
+        self._shown_text = text
+        self.main_label.setText(shown)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if event.size().width() != event.oldSize().width():
+            self._set_label_text(self._shown_text)
+
+    def set_busy(self, busy):
+        # Dims the current text while a worker computes the next one
+        color = styles.COLOR_TEXT_BUSY if busy else styles.COLOR_TEXT_WHITE
+        self.main_label.setStyleSheet(f"color: {color};")
+
     def set_text(self, text):
-        if self.main_label.text() == text:
+        if text == self._target_text:
+            tracer.close('input')  # nothing to paint
             return
-            
-        # Fade Out
-        self.anim_out = QPropertyAnimation(self.eff, b"opacity")
+        self._target_text = text
+        self.scheduler.schedule(text)
+
+    def set_text_now(self, text):
+        # Shows text without waiting for the next frame or fading (e.g. before the first paint)
+        self._target_text = text
+        self._show_text(text, False)
+
+    def _create_animations(self):
+        self.eff = QGraphicsOpacityEffect(self.main_label)
+        self.main_label.setGraphicsEffect(self.eff)
+
+        self.anim_out = QPropertyAnimation(self.eff, b"opacity", self)
         self.anim_out.setDuration(50)
-        self.anim_out.setStartValue(1.0)
         self.anim_out.setEndValue(0.0)
         self.anim_out.setEasingCurve(QEasingCurve.Type.OutQuad)
-        self.anim_out.finished.connect(lambda: self._update_text_and_fade_in(text))
-        self.anim_out.start()
-        
-    def _update_text_and_fade_in(self, text):
-        self.main_label.setText(text)
-        # Fade In
-        self.anim_in = QPropertyAnimation(self.eff, b"opacity")
+        self.anim_out.finished.connect(self._fade_in)
+
+        self.anim_in = QPropertyAnimation(self.eff, b"opacity", self)
         self.anim_in.setDuration(150)
-        self.anim_in.setStartValue(0.0)
         self.anim_in.setEndValue(1.0)
         self.anim_in.setEasingCurve(QEasingCurve.Type.InQuad)
+        self.anim_in.finished.connect(lambda: tracer.close('display.fade'))
+
+    def _show_text(self, text, animate):
+        fading = self.anim_out is not None and (self.anim_out.state() == QAbstractAnimation.State.Running
+                                                or self.anim_in.state() == QAbstractAnimation.State.Running)
+        if text == self._shown_text and not fading:
+            return
+        if not animate:
+            # Fast typing: show the value right away
+            if self.anim_out is not None:
+                self.anim_out.stop()
+                self.anim_in.stop()
+                self.eff.setOpacity(1.0)
+            self._set_label_text(text)
+            return
+
+        if self.anim_out is None:
+            self._create_animations()
+        if self.anim_out.state() == QAbstractAnimation.State.Running:
+            return  # _fade_in picks up the latest text
+        # Fade Out (from wherever a running fade-in got to)
+        self.anim_in.stop()
+        self.anim_out.setStartValue(self.eff.opacity())
+        tracer.open('display.fade')
+        self.anim_out.start()
+
+    def _fade_in(self):
+        self._set_label_text(self._target_text)
+        # Fade In
+        self.anim_in.setStartValue(0.0)
         self.anim_in.start()
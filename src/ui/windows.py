@@ -0,0 +1,89 @@
+from functools import partial
+
+from PyQt6.QtCore import QObject, QPoint
+
+from src.logic import ModelPool
+from src.instance import OPEN, OK
+from src.ui import styles
+from src.ui.mainwindow import MainWindow
+
+
+class WindowManager(QObject):
+    """The calculator windows of one process.
+
+    Windows share the process-wide button font, display fitter and pixmap caches
+    (widgets.button_font, text_fit.display_fitter, render_cache.button_cache) and the
+    history tape, and take their models from one ModelPool. The session is saved and
+    restored by the first window only. With listen(), later launches of the app open
+    their window here (see src/instance.py).
+    """
+
+    def __init__(self, history=None, engine=None, session=None, parent=None):
+        super().__init__(parent)
+        self.history = history
+        self.engine = engine
+        self.session = session
+        self.pool = ModelPool(engine, history)
+        self.windows = []
+        self.server = None
+
+    def open_window(self, show=True) -> MainWindow:
+        session, self.session = self.session, None
+        window = MainWindow(self.history, self.engine, session, model=self.pool.acquire())
+        if self.windows and session is None:
+            # Cascade from the newest window
+            offset = styles.WINDOW_CASCADE
+            window.move(self.windows[-1].pos() + QPoint(offset, offset))
+        window.closed.connect(partial(self._closed, window))
+        self.windows.append(window)
+        if show:
+            window.show()
+        return window
+
+    def _closed(self, window):
+        if window in self.windows:
+            self.windows.remove(window)
+            self.pool.release(window.model)
+            window.deleteLater()
+
+    def listen(self, address: str) -> bool:
+        # False if another instance is serving at address, or it cannot be used
+        from PyQt6.QtNetwork import QLocalServer, QLocalSocket  # only single-instance mode needs QtNetwork
+        # Checked first: with socket options set, listen() replaces a socket file in use
+        probe = QLocalSocket()
+        probe.connectToServer(address)
+        if probe.waitForConnected(styles.INSTANCE_PROBE_MS):
+            probe.abort()
+            return False  # a launch that started at the same time got there first
+        # What is left is the socket of an instance that did not shut down cleanly
+        QLocalServer.removeServer(address)
+        server = QLocalServer(self)
+        server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        if not server.listen(address):
+            return False
+        server.newConnection.connect(self._accept)
+        self.server = server
+        return True
+
+    def _accept(self):
+        while True:
+            connection = self.server.nextPendingConnection()
+            if connection is None:
+                return
+            connection.readyRead.connect(partial(self._read, connection))
+            connection.disconnected.connect(connection.deleteLater)
+
+    def _read(self, connection):
+        if not connection.canReadLine():
+            return
+        if bytes(connection.readLine()) == OPEN:
+            window = self.open_window()
+            window.raise_()
+            window.activateWindow()
+            connection.write(OK)
+        connection.disconnectFromServer()
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()  # removes the socket
+            self.server = None
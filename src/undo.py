@@ -0,0 +1,52 @@
+"""Multi-level undo/redo for CalculatorModel over immutable state snapshots.
+
+Recording a step stores one CalculatorModel.snapshot() tuple, so it costs the same at any
+depth. Only the newest ``depth`` steps are kept.
+"""
+from collections import deque
+
+DEFAULT_DEPTH = 1000
+
+
+class UndoHistory:
+    def __init__(self, model, depth: int = DEFAULT_DEPTH):
+        self.model = model
+        self.depth = depth
+        self._undo = deque(maxlen=depth)
+        self._redo = []
+
+    def record(self):
+        # Call before changing the model; a state equal to the last recorded one is skipped
+        state = self.model.snapshot()
+        if not self._undo or self._undo[-1] != state:
+            self._undo.append(state)
+        self._redo.clear()
+
+    def undo(self) -> bool:
+        if not self._undo:
+            return False
+        self._redo.append(self.model.snapshot())
+        self.model.restore(self._undo.pop())
+        return True
+
+    def redo(self) -> bool:
+        if not self._redo:
+            return False
+        self._undo.append(self.model.snapshot())
+        self.model.restore(self._redo.pop())
+        return True
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def __len__(self):
+        return len(self._undo)
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
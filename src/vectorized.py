@@ -0,0 +1,313 @@
+"""CalculatorModel semantics for many independent sessions at once, stored as NumPy arrays.
+
+Each session occupies one slot of every state array. The public methods mirror
+CalculatorModel and take an optional boolean ``where`` mask selecting the sessions
+the key applies to, so a whole step of keystrokes costs a handful of array operations
+instead of one Python call per session.
+
+Typed entries are kept as (mantissa, scale, has_point, negative) so the display can be
+rebuilt exactly; results are kept as float64. Displays match CalculatorModel for entries
+of up to 15 significant digits whose values do not print in exponent form.
+"""
+import numpy as np
+
+from src.logic import Operation, format_entry, format_number
+
+OP_NONE, OP_ADD, OP_SUBTRACT, OP_MULTIPLY, OP_DIVIDE = range(5)
+OP_CODES = {
+    Operation.NONE: OP_NONE,
+    Operation.ADD: OP_ADD,
+    Operation.SUBTRACT: OP_SUBTRACT,
+    Operation.MULTIPLY: OP_MULTIPLY,
+    Operation.DIVIDE: OP_DIVIDE,
+}
+
+# Per-session key codes accepted by BatchCalculatorModel.step
+KEY_CODES = {str(d): d for d in range(10)}
+KEY_CODES.update({'.': 10, '+': 11, '−': 12, '×': 13, '÷': 14, '=': 15, '+/-': 16, '%': 17, 'AC': 18})
+KEY_DECIMAL, KEY_EQUALS, KEY_SIGN, KEY_PERCENT, KEY_CLEAR = 10, 15, 16, 17, 18
+
+_POW10 = 10.0 ** np.arange(309)
+
+_BINARY_OPS = {OP_ADD: np.add, OP_SUBTRACT: np.subtract, OP_MULTIPLY: np.multiply, OP_DIVIDE: np.true_divide}
+
+ALL = slice(None)
+
+
+def _select(i, mask):
+    # Narrow an index selection by a mask aligned with it; ALL stays a cheap slice when possible
+    if isinstance(i, slice):
+        return ALL if mask.all() else np.flatnonzero(mask)
+    return i[mask]
+
+
+def _pick(values, mask):
+    if not np.ndim(values) or mask.all():
+        return values
+    return values[mask]
+
+
+def _size(i):
+    return 1 if isinstance(i, slice) else i.size
+
+
+class BatchCalculatorModel:
+    def __init__(self, size: int):
+        self.size = size
+        self.value = np.zeros(size, dtype=np.float64)      # current value when not a typed entry
+        self.mantissa = np.zeros(size, dtype=np.int64)     # typed entry digits, without sign or point
+        self.scale = np.zeros(size, dtype=np.int64)        # digits typed after the point
+        self.has_point = np.zeros(size, dtype=bool)
+        self.negative = np.zeros(size, dtype=bool)
+        self.entry = np.ones(size, dtype=bool)             # display comes from the typed entry
+        self.pending_value = np.zeros(size, dtype=np.float64)
+        self.pending_operation = np.zeros(size, dtype=np.int8)
+        self.new_entry = np.ones(size, dtype=bool)
+        self.error_state = np.zeros(size, dtype=bool)
+
+    # Public methods take a boolean mask; the private ones take an index array, or ALL for
+    # every session, so a key pressed by a few sessions only touches those sessions' slots.
+    def _indices(self, where):
+        return ALL if where is None else np.flatnonzero(where)
+
+    def reset(self, where=None):
+        self._reset(self._indices(where))
+
+    def input_digit(self, digit, where=None):
+        i = self._indices(where)
+        if np.ndim(digit) and where is not None:
+            digit = np.asarray(digit)[i]
+        self._input_digit(i, digit)
+
+    def input_decimal(self, where=None):
+        self._input_decimal(self._indices(where))
+
+    def set_operation(self, op, where=None):
+        i = self._indices(where)
+        code = OP_CODES[op] if isinstance(op, Operation) else np.asarray(op, dtype=np.int8)
+        if np.ndim(code) and where is not None:
+            code = code[i]
+        self._set_operation(i, code)
+
+    def calculate(self, where=None):
+        self._calculate(self._indices(where))
+
+    def toggle_sign(self, where=None):
+        self._toggle_sign(self._indices(where))
+
+    def percentage(self, where=None):
+        self._percentage(self._indices(where))
+
+    def step(self, codes):
+        """Apply one key per session, given as an array of KEY_CODES values."""
+        codes = np.asarray(codes)
+        digits = codes < 10
+        if digits.all():
+            self._input_digit(ALL, codes)
+            return
+        i = np.flatnonzero(digits)
+        if i.size:
+            self._input_digit(i, codes[i])
+        i = np.flatnonzero((codes >= 11) & (codes <= 14))
+        if i.size:
+            self._set_operation(i, (codes[i] - 10).astype(np.int8))
+        for code, method in ((KEY_DECIMAL, self._input_decimal), (KEY_EQUALS, self._calculate),
+                             (KEY_SIGN, self._toggle_sign), (KEY_PERCENT, self._percentage),
+                             (KEY_CLEAR, self._reset)):
+            i = np.flatnonzero(codes == code)
+            if i.size:
+                method(i)
+
+    def current(self):
+        return self._current(ALL)
+
+    def _current(self, i):
+        entry = self.entry[i]
+        if not entry.any():
+            return self.value[i].copy()
+        typed = self.mantissa[i] / np.take(_POW10, self.scale[i], mode='clip')
+        np.negative(typed, out=typed, where=self.negative[i])
+        if entry.all():
+            return typed
+        return np.where(entry, typed, self.value[i])
+
+    def _reset(self, i):
+        self.value[i] = 0.0
+        self.mantissa[i] = 0
+        self.scale[i] = 0
+        self.has_point[i] = False
+        self.negative[i] = False
+        self.entry[i] = True
+        self.pending_value[i] = 0.0
+        self.pending_operation[i] = OP_NONE
+        self.new_entry[i] = True
+        self.error_state[i] = False
+
+    def _clear_errors(self, i):
+        errors = self.error_state[i]
+        if errors.any():
+            self._reset(_select(i, errors))
+
+    def _start_entry(self, i, point):
+        self.scale[i] = 0
+        self.has_point[i] = point
+        self.negative[i] = False
+        self.entry[i] = True
+        self.new_entry[i] = False
+
+    def _input_digit(self, i, digit):
+        self._clear_errors(i)
+        fresh = self.new_entry[i]
+        start, cont = _select(i, fresh), _select(i, ~fresh)
+        start_digit, cont_digit = _pick(digit, fresh), _pick(digit, ~fresh)
+        # Appending to "0" without a point replaces it, which is the same as 0 * 10 + digit
+        self.mantissa[cont] = self.mantissa[cont] * 10 + cont_digit
+        self.scale[cont] += self.has_point[cont]
+
+        self.mantissa[start] = start_digit
+        self._start_entry(start, point=False)
+
+    def _input_decimal(self, i):
+        self._clear_errors(i)
+        fresh = self.new_entry[i].copy()
+        start = _select(i, fresh)
+        self.has_point[_select(i, ~fresh)] = True
+        self.mantissa[start] = 0
+        self._start_entry(start, point=True)
+
+    def _set_operation(self, i, code):
+        ok = ~self.error_state[i]
+        chain = ok & (self.pending_operation[i] != OP_NONE) & ~self.new_entry[i]
+        if chain.any():
+            # Chain calculation if user presses 2 + 3 * (calculate 2+3 first)
+            self._calculate(_select(i, chain))
+            ok &= ~self.error_state[i]
+        code = _pick(code, ok)
+        i = _select(i, ok)
+        self.pending_value[i] = self._current(i)
+        self.pending_operation[i] = code
+        self.new_entry[i] = True
+
+    def _calculate(self, i):
+        i = _select(i, ~self.error_state[i] & (self.pending_operation[i] != OP_NONE))
+        current = self._current(i)
+        pending = self.pending_value[i]
+        op = self.pending_operation[i]
+        with np.errstate(all='ignore'):
+            if op.size and op.min() == op.max():
+                result = _BINARY_OPS[op[0]](pending, current)
+            else:
+                result = np.select(
+                    [op == OP_ADD, op == OP_SUBTRACT, op == OP_MULTIPLY],
+                    [pending + current, pending - current, pending * current],
+                    pending / current,
+                )
+
+        errors = (op == OP_DIVIDE) & (current == 0)
+        if errors.any():
+            self.error_state[_select(i, errors)] = True
+            i, result = _select(i, ~errors), result[~errors]
+        self.value[i] = result
+        self.pending_value[i] = result
+        self.pending_operation[i] = OP_NONE
+        self.entry[i] = False
+        self.new_entry[i] = True
+
+    def _toggle_sign(self, i):
+        i = _select(i, ~self.error_state[i])
+        # Nothing to do when the display is exactly "0"
+        i = _select(i, (self._current(i) != 0) | (self.entry[i] & self.has_point[i]))
+
+        typed = self.entry[i].copy()
+        computed = _select(i, ~typed)
+        self.value[computed] = -self.value[computed]
+
+        i = _select(i, typed)
+        self.negative[i] = ~self.negative[i]
+        # The entry is re-read as a float, so trailing fractional zeros and a bare point disappear
+        strip = _select(i, (self.scale[i] > 0) & (self.mantissa[i] % 10 == 0))
+        while _size(strip):
+            self.mantissa[strip] //= 10
+            self.scale[strip] -= 1
+            strip = _select(strip, (self.scale[strip] > 0) & (self.mantissa[strip] % 10 == 0))
+        self.has_point[i] = self.scale[i] > 0
+        self.negative[_select(i, self.mantissa[i] == 0)] = False
+
+    def _percentage(self, i):
+        i = _select(i, ~self.error_state[i])
+        self.value[i] = self._current(i) / 100
+        self.entry[i] = False
+        self.new_entry[i] = True
+
+    def get_display(self, index: int) -> str:
+        if self.error_state[index]:
+            return "Error"
+        if not self.entry[index]:
+            return format_number(float(self.value[index]))
+        mantissa = int(self.mantissa[index])
+        scale = int(self.scale[index]) if self.has_point[index] else -1
+        return format_entry(-mantissa if self.negative[index] else mantissa, scale)
+
+    def displays(self):
+        return [self.get_display(i) for i in range(self.size)]
+
+
+MAX_SWEEP_ROWS = 10_000_000
+
+
+def _entry(text: str):
+    # "12.50" -> (1250, 2): the mantissa and scale CalculatorModel keeps for a typed entry
+    text = text.strip()
+    sign = -1 if text.startswith('-') else 1
+    head, _, tail = text.lstrip('+-').partition('.')
+    if not (head + tail).isdigit() or not (head + tail).isascii():
+        raise ValueError(f"Not a number: {text!r}")
+    return sign * int(head + tail), len(tail)
+
+
+def parse_operands(text: str) -> np.ndarray:
+    """Operands for sweep() from 'start:stop[:step]' (stop included) or a list such as '1, 2.5, 10'.
+
+    Each operand is the float a typed entry with the same digits has, so 0:1:0.1 gives
+    0.3 and not 0.1 * 3.
+    """
+    if ':' in text:
+        parts = [_entry(part) for part in text.split(':')]
+        if not 2 <= len(parts) <= 3:
+            raise ValueError("Expected start:stop or start:stop:step")
+        if len(parts) == 2:
+            parts.append((1, 0))
+        scale = max(s for _, s in parts)
+        start, stop, step = (m * 10 ** (scale - s) for m, s in parts)
+        if step == 0 or (stop - start) * step < 0:
+            raise ValueError("The step does not lead from start to stop")
+        count = (stop - start) // step + 1
+        if count > MAX_SWEEP_ROWS:
+            raise ValueError(f"More than {MAX_SWEEP_ROWS} operands")
+        if max(abs(start), abs(stop)) >= 2 ** 53:
+            raise ValueError("Operands out of range")
+        mantissas = np.arange(count, dtype=np.int64) * step + start
+        return mantissas / 10.0 ** scale if scale else mantissas.astype(np.float64)
+    entries = [_entry(part) for part in text.replace(';', ',').split(',') if part.strip()]
+    if not entries or len(entries) > MAX_SWEEP_ROWS:
+        raise ValueError("Expected one or more operands")
+    return np.array([m / 10 ** s if s else float(m) for m, s in entries], dtype=np.float64)
+
+
+def sweep(pending: float, operation: Operation, operands):
+    """CalculatorModel results of ``pending <operation> operand`` for every operand, in one pass.
+
+    Returns (results, errors): float64 results, and a mask of the elements that end in
+    Error (division by zero), whose results are meaningless.
+    """
+    operands = np.asarray(operands, dtype=np.float64)
+    code = OP_CODES[operation]
+    if code == OP_NONE:
+        raise ValueError("No pending operation")
+    with np.errstate(all='ignore'):
+        results = _BINARY_OPS[code](np.float64(pending), operands)
+    if code == OP_DIVIDE:
+        errors = operands == 0
+    else:
+        errors = np.zeros(operands.shape, dtype=bool)
+    return results, errors
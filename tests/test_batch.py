@@ -0,0 +1,74 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from src.batch import BatchStats, evaluate_file
+from src.compiler import compile_keys
+from src.precision import FractionEngine
+
+EXPRESSIONS = ["12 × 3 + 4 =", "1 ÷ 0 =", "2 + 3 × 4 =", "not input", "5 +/- %", "1/3=", ""]
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, data):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def expected(self, expression):
+        try:
+            return compile_keys(expression).run()
+        except ValueError:
+            return None
+
+    def test_csv_results_in_input_order(self):
+        rows = [(i, EXPRESSIONS[i % len(EXPRESSIONS)]) for i in range(200)]
+        data = "id,expression\n" + "".join(f'{i},"{e}"\n' for i, e in rows)
+        path = self.write('in.csv', data.encode('utf-8'))
+        out = io.BytesIO()
+        stats = evaluate_file(path, out, workers=2, chunk_size=256)
+        lines = out.getvalue().decode('utf-8').splitlines()
+        self.assertEqual(lines[0], "id,expression,result")
+        self.assertEqual(len(lines), 201)
+        for (i, expression), line in zip(rows, lines[1:]):
+            result = self.expected(expression)
+            self.assertEqual(line.rsplit(',', 1), [f"{i},{expression}", result or ''])
+        self.assertEqual(stats.rows, 200)
+        self.assertGreater(stats.chunks, 10)
+        self.assertEqual(sum(w.rows for w in stats.workers.values()), 200)
+        self.assertEqual(stats.invalid, sum(self.expected(e) is None for _, e in rows))
+
+    def test_jsonl_stream_with_engine(self):
+        data = "".join(json.dumps({'n': i, 'expression': e}) + "\n" for i, e in enumerate(EXPRESSIONS))
+        out = io.BytesIO()
+        evaluate_file(io.BytesIO(data.encode('utf-8')), out, 'jsonl', workers=1, engine=FractionEngine(),
+                      chunk_size=16)
+        records = [json.loads(line) for line in out.getvalue().decode('utf-8').splitlines()]
+        self.assertEqual([r['n'] for r in records], list(range(len(EXPRESSIONS))))
+        self.assertEqual(records[5]['result'], "1/3")
+        self.assertIsNone(records[3]['result'])
+
+    def test_jsonl_bad_lines_are_invalid_records(self):
+        lines = ['{"expression": "1+1="}', '{"expression": "2+', '[1, 2]', '{"expression": "3×3="}']
+        out = io.BytesIO()
+        stats = evaluate_file(io.BytesIO("\n".join(lines).encode('utf-8')), out, 'jsonl', workers=1)
+        records = [json.loads(line) for line in out.getvalue().decode('utf-8').splitlines()]
+        self.assertEqual([r['result'] for r in records], ["2", None, None, "9"])
+        self.assertEqual(records[1], {'error': "not a JSON object", 'line': lines[1], 'result': None})
+        self.assertEqual(records[2]['line'], "[1, 2]")
+        self.assertEqual((stats.rows, stats.invalid), (4, 2))
+
+    def test_missing_column(self):
+        path = self.write('in.csv', b"a,b\n1,2\n")
+        with self.assertRaises(ValueError):
+            evaluate_file(path, io.BytesIO(), stats=BatchStats())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import random
+import unittest
+from src.logic import CalculatorModel, Operation
+from src.keys import apply_keys
+from src.compiler import KeystrokeCompiler, compile_keys, normalize, run_text
+
+KEYS = list('0123456789.') * 3 + ['+', '−', '×', '÷', '=', '=', '+/-', '%', 'AC']
+
+class TestKeystrokeCompiler(unittest.TestCase):
+    def test_chain_operations(self):
+        # Immediate execution, as in test_logic.test_chain_operations
+        self.assertEqual(compile_keys("2 + 3 × 4 =").run(), "20")
+
+    def test_normalize(self):
+        self.assertEqual(normalize("12*3+4="), "1 2 × 3 + 4 =")
+        self.assertEqual(normalize(['1', '2', '×']), "1 2 ×")
+
+    def test_program_is_flat_and_folded(self):
+        program = compile_keys("5 + 1 2 3 × ÷ 4 = = AC 6 + 7 =")
+        self.assertEqual(len(program), 5)  # AC, 6, +, 7, =
+        self.assertEqual(program.run(), "13")
+
+    def test_matches_model(self):
+        rng = random.Random(99)
+        for _ in range(3000):
+            keys = [rng.choice(KEYS) for _ in range(rng.randint(0, 30))]
+            self.assertEqual(compile_keys(keys).run(), apply_keys(CalculatorModel(), keys), keys)
+
+    def test_run_on_existing_model(self):
+        model = CalculatorModel()
+        compile_keys("7 +").run(model)
+        self.assertEqual(compile_keys("3 =").run(model), "10")
+
+    def test_lru_cache(self):
+        compiler = KeystrokeCompiler(maxsize=2)
+        self.assertEqual(compiler.evaluate("1+1="), "2")
+        self.assertEqual(compiler.evaluate("1 + 1 ="), "2")
+        compiler.evaluate("2+2=")
+        compiler.evaluate("1+1=")  # refreshes "1 + 1 ="
+        compiler.evaluate("3+3=")  # evicts "2 + 2 ="
+        info = compiler.cache_info()
+        self.assertEqual((info.hits, info.misses, info.evictions, info.currsize), (2, 3, 1, 2))
+        compiler.evaluate("2+2=")
+        self.assertEqual(compiler.cache_info().misses, 4)
+
+    def test_run_text_matches_model(self):
+        rng = random.Random(7)
+        for step in (1, 3, 1024):
+            for _ in range(500):
+                keys = [rng.choice(KEYS) for _ in range(rng.randint(0, 30))]
+                model = CalculatorModel()
+                for _ in run_text(' '.join(keys), model, step):
+                    pass
+                self.assertEqual(model.get_display(), apply_keys(CalculatorModel(), keys), keys)
+
+    def test_run_text_records_history_before_clear(self):
+        class Recorder:
+            def __init__(self):
+                self.records = []
+
+            def record(self, engine, left, operation, right, result):
+                self.records.append((left, operation, right, result))
+        recorder = Recorder()
+        model = CalculatorModel(history=recorder)
+        for _ in run_text('1+1=AC2+2=', model):
+            pass
+        self.assertEqual(recorder.records, [(1, Operation.ADD, 1, 2), (2, Operation.ADD, 2, 4)])
+
+    def test_run_text_rejects_other_text(self):
+        for text in ("12 A", "1,5", "abc"):
+            with self.assertRaises(ValueError):
+                run_text(text, CalculatorModel())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import threading
+import time
+import unittest
+from src.evaluator import WorkerProcess, run_job
+from src.logic import CalculatorModel, Operation
+from src.precision import DecimalEngine, FractionEngine
+
+class TestEvaluator(unittest.TestCase):
+    def test_job_matches_inline_model(self):
+        engine = FractionEngine()
+        model = CalculatorModel(engine)
+        for d in "1" * 40:
+            model.input_digit(d)
+        model.set_operation(Operation.DIVIDE)
+        model.input_digit("7")
+        state, display, records = run_job(engine, model.snapshot(), 'calculate', ())
+        model.calculate()
+        self.assertEqual(state, model.snapshot())
+        self.assertEqual(display, model.get_display())
+        self.assertEqual(records, [("1" * 40, Operation.DIVIDE, "7", model.get_display())])
+
+    def test_worker_process_runs_and_cancels(self):
+        results = []
+        done = threading.Event()
+
+        def on_result(job_id, result):
+            results.append((job_id, result))
+            done.set()
+        worker = WorkerProcess(on_result)
+        try:
+            model = CalculatorModel()
+            model.input_digit("8")
+            worker.submit(1, model.engine, model.snapshot(), 'set_operation', (Operation.MULTIPLY,))
+            self.assertTrue(done.wait(30))
+            job_id, (state, display, records) = results[0]
+            self.assertEqual((job_id, display, records), (1, "8", []))
+            model.restore(state)
+            self.assertEqual(model.pending_operation, Operation.MULTIPLY)
+
+            worker.cancel()
+            self.assertIsNone(worker._process)
+            done.clear()
+            worker.submit(2, model.engine, state, 'percentage', ())
+            self.assertTrue(done.wait(30))
+            self.assertEqual(results[1][1][1], "0.08")
+        finally:
+            worker.close()
+
+    def test_worker_process_runs_exact_engines(self):
+        results = {}
+        done = threading.Event()
+
+        def on_result(job_id, result):
+            results[job_id] = result
+            if len(results) == 2:
+                done.set()
+        worker = WorkerProcess(on_result)
+        try:
+            for job_id, engine in enumerate((FractionEngine(), DecimalEngine())):
+                model = CalculatorModel(engine)
+                model.input_digit("1")
+                model.set_operation(Operation.DIVIDE)
+                model.input_digit("1")
+                model.input_digit("5")
+                worker.submit(job_id, engine, model.snapshot(), 'calculate', ())
+            self.assertTrue(done.wait(30))
+            self.assertEqual(results[0][1], "1/15")
+            self.assertEqual(results[1][1], "0.06666666666666666666666666667")
+        finally:
+            worker.close()
+
+    def test_worker_death_fails_the_job_and_restarts(self):
+        results = []
+        done = threading.Event()
+
+        def on_result(job_id, result):
+            results.append((job_id, result))
+            done.set()
+        worker = WorkerProcess(on_result)
+        try:
+            model = CalculatorModel()
+            model.input_digit("8")
+            worker.submit(1, model.engine, model.snapshot(), 'percentage', ())
+            worker._process.kill()  # still starting up, so the job is unanswered
+            self.assertTrue(done.wait(30))
+            job_id, error = results[0]
+            self.assertEqual(job_id, 1)
+            self.assertIsInstance(error, ChildProcessError)
+
+            done.clear()
+            worker.submit(2, model.engine, model.snapshot(), 'percentage', ())
+            self.assertTrue(done.wait(30))
+            self.assertEqual(results[1][0], 2)
+            self.assertEqual(results[1][1][1], "0.08")
+        finally:
+            worker.close()
+
+    def test_job_submitted_as_worker_dies_gets_one_result(self):
+        results = []
+        lock = threading.Lock()
+
+        def on_result(job_id, result):
+            with lock:
+                results.append((job_id, result))
+        worker = WorkerProcess(on_result)
+        model = CalculatorModel()
+        model.input_digit("8")
+        try:
+            for job_id in range(1, 7, 2):
+                worker.submit(job_id, model.engine, model.snapshot(), 'percentage', ())
+                process = worker._process
+                process.kill()
+                process.join()
+                worker.submit(job_id + 1, model.engine, model.snapshot(), 'percentage', ())  # races the reader
+            for _ in range(3000):
+                if len(results) >= 6:
+                    break
+                time.sleep(0.01)
+            time.sleep(0.1)  # no second result arrives
+            self.assertEqual(sorted(job_id for job_id, _ in results), list(range(1, 7)))
+        finally:
+            worker.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import itertools
+import unittest
+from src import fsm
+from src.fsm import ERROR, FRESH_VALUE, KEY_CLASSES, STATE_NAMES, TRANSITIONS, StateMachineCalculator
+from src.fuzz import differs, fuzz, shrink
+from src.keys import KEYS
+from src.precision import DecimalEngine, FractionEngine
+
+class TestStateMachineCalculator(unittest.TestCase):
+    def test_table_is_complete(self):
+        classes = set(KEY_CLASSES.values())
+        self.assertEqual(set(KEY_CLASSES), set(KEYS))
+        for state in range(len(STATE_NAMES)):
+            self.assertEqual(set(TRANSITIONS[state]), classes, STATE_NAMES[state])
+
+    def test_chain_operations(self):
+        machine = StateMachineCalculator()
+        machine.press_keys("2+3×4=")
+        self.assertEqual(machine.get_display(), "20")
+        self.assertEqual(machine.state, FRESH_VALUE)
+
+    def test_division_by_zero(self):
+        machine = StateMachineCalculator()
+        machine.press_keys("1÷0=")
+        self.assertEqual(machine.state, ERROR)
+        self.assertEqual(machine.get_display(), "Error")
+        machine.press('7')
+        self.assertEqual(machine.get_display(), "7")
+
+    def test_matches_model_exhaustively(self):
+        # Every sequence of up to 3 keys, after a prefix that leaves each kind of state
+        for prefix in ("", "12.5", "3+", "3+4", "3+4.", "1÷0=", "7=", "9%"):
+            for n in range(1, 4):
+                for keys in itertools.product(KEYS, repeat=n):
+                    keys = list(prefix) + list(keys)
+                    self.assertFalse(differs(keys), keys)
+
+    def test_long_entries(self):
+        keys = list("9" * 40 + "×" + "9" * 30 + "=")
+        self.assertFalse(differs(keys))
+        self.assertFalse(differs(list("1." + "0" * 25 + "5") + ['+/-', '+/-']))
+
+    def test_fuzz(self):
+        for engine in (None, DecimalEngine(), FractionEngine()):
+            stats = fuzz(seconds=0.2, seed=5, engine=engine)
+            self.assertIsNone(stats.failure, stats.failure)
+            self.assertGreater(stats.sequences, 0)
+
+    def test_shrink(self):
+        # With a broken transition the fuzzer finds and minimizes a counterexample
+        row = TRANSITIONS[FRESH_VALUE]
+        saved = fsm._TABLE
+        row_sign = row['sign']
+        try:
+            row['sign'] = ('none', FRESH_VALUE)
+            fsm._TABLE = fsm._compile()
+            stats = fuzz(seconds=5, seed=1)
+            self.assertIsNotNone(stats.failure)
+            self.assertEqual(shrink(stats.failure), stats.failure)
+            self.assertIn('+/-', stats.failure)
+        finally:
+            row['sign'] = row_sign
+            fsm._TABLE = saved
+
+if __name__ == '__main__':
+    unittest.main()
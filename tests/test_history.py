@@ -0,0 +1,115 @@
+import os
+import tempfile
+import unittest
+from src.history import INITIAL_CAPACITY, UNREADABLE, HistoryTape
+from src.logic import CalculatorModel, Operation
+
+def _append_many(path, name, count):
+    with HistoryTape(path) as tape:
+        for i in range(count):
+            tape.append(name, Operation.ADD, str(i), str(i))
+
+class TestHistoryTape(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'history.tape')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_records_survive_reopen(self):
+        with HistoryTape(self.path, capacity=8) as tape:
+            tape.append("2", Operation.ADD, "3", "5", timestamp=100.0)
+            tape.append("5", Operation.MULTIPLY, "4", "20", timestamp=101.0)
+        with HistoryTape(self.path) as tape:
+            self.assertEqual(len(tape), 2)
+            self.assertEqual(tuple(tape[0]), ("2", Operation.ADD, "3", "5", 100.0))
+            self.assertEqual(tape[-1].result, "20")
+
+    def test_ring_overwrites_oldest(self):
+        with HistoryTape(self.path, capacity=4) as tape:
+            for i in range(10):
+                tape.append(str(i), Operation.SUBTRACT, "1", str(i - 1))
+            self.assertEqual(len(tape), 4)
+            self.assertEqual(tape.total, 10)
+            self.assertEqual([tape[i].left for i in range(4)], ["6", "7", "8", "9"])
+            with self.assertRaises(IndexError):
+                tape[4]
+
+    def test_file_grows_to_capacity(self):
+        record_size = 128
+        with HistoryTape(self.path, capacity=3000) as tape:
+            self.assertEqual(os.path.getsize(self.path), 64 + INITIAL_CAPACITY * record_size)
+            for i in range(2500):
+                tape.append(str(i), Operation.ADD, "1", str(i + 1))
+            self.assertEqual(os.path.getsize(self.path), 64 + 3000 * record_size)
+        with HistoryTape(self.path) as tape:
+            self.assertEqual((len(tape), tape.capacity), (2500, 3000))
+            self.assertEqual((tape[0].left, tape[-1].left), ("0", "2499"))
+            for i in range(2500, 3200):
+                tape.append(str(i), Operation.ADD, "1", str(i + 1))
+            self.assertEqual((len(tape), tape[0].left), (3000, "200"))
+        self.assertEqual(os.path.getsize(self.path), 64 + 3000 * record_size)
+
+    def test_torn_record_is_unreadable(self):
+        with HistoryTape(self.path, capacity=8) as tape:
+            tape.append("2", Operation.ADD, "3", "5")
+            tape.append("5", Operation.MULTIPLY, "4", "20")
+            tape._map[64 + 8] = 200  # the first record's operation code
+            tape._map[64 + 128 + 9] = 0xff  # the second record's left operand
+            self.assertIs(tape[0], UNREADABLE)
+            self.assertIs(tape[1], UNREADABLE)
+
+    def test_long_text_is_cut(self):
+        with HistoryTape(self.path, capacity=2) as tape:
+            tape.append("1" * 100, Operation.DIVIDE, "3", "3" * 100)
+            entry = tape[0]
+        self.assertTrue(entry.left.endswith('…'))
+        self.assertLessEqual(len(entry.left.encode('utf-8')), 39)
+        self.assertTrue(entry.result.startswith("333"))
+
+    def test_tapes_sharing_a_file_keep_every_record(self):
+        with HistoryTape(self.path, capacity=8) as first, HistoryTape(self.path) as second:
+            first.append("1", Operation.ADD, "1", "2")
+            second.append("2", Operation.ADD, "2", "4")
+            first.append("3", Operation.ADD, "3", "6")
+        with HistoryTape(self.path) as tape:
+            self.assertEqual([tape[i].left for i in range(len(tape))], ["1", "2", "3"])
+
+    def test_concurrent_processes_keep_every_record(self):
+        import multiprocessing
+        HistoryTape(self.path, capacity=4096).close()
+        context = multiprocessing.get_context('spawn')
+        processes = [context.Process(target=_append_many, args=(self.path, name, 1000)) for name in "ab"]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        with HistoryTape(self.path) as tape:
+            self.assertEqual(tape.total, 2000)
+            records = sorted((tape[i].left, tape[i].right) for i in range(len(tape)))
+        self.assertEqual(records, sorted((name, str(i)) for name in "ab" for i in range(1000)))
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a tape' * 10)
+        with self.assertRaises(ValueError):
+            HistoryTape(self.path)
+
+    def test_model_records_chained_operations(self):
+        with HistoryTape(self.path, capacity=16) as tape:
+            model = CalculatorModel(history=tape)
+            for key, action in (("2", model.input_digit), (Operation.ADD, model.set_operation),
+                                ("3", model.input_digit), (Operation.MULTIPLY, model.set_operation),
+                                ("4", model.input_digit)):
+                action(key)
+            model.calculate()
+            model.set_operation(Operation.DIVIDE)
+            model.input_digit("0")
+            model.calculate()  # errors are not recorded
+            self.assertEqual([(e.left, e.operation, e.right, e.result) for e in (tape[0], tape[1])],
+                             [("2", Operation.ADD, "3", "5"), ("5", Operation.MULTIPLY, "4", "20")])
+            self.assertEqual(len(tape), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from src.logic import CalculatorModel, Operation
+from src.logic import CalculatorModel, ModelPool, Operation
 
 class TestCalculatorModel(unittest.TestCase):
     def setUp(self):
@@ -90,5 +90,87 @@ class TestCalculatorModel(unittest.TestCase):
         self.model.percentage()
         self.assertEqual(self.model.current_value, "0.5")
 
+    def test_entry_keeps_typed_digits(self):
+        self.model.input_decimal()
+        self.model.input_digit("0")
+        self.model.input_digit("5")
+        self.model.input_digit("0")
+        self.assertEqual(self.model.current_value, "0.050")
+        self.model.toggle_sign()
+        self.assertEqual(self.model.current_value, "-0.05")
+        self.model.input_digit("1")
+        self.assertEqual(self.model.current_value, "-0.051")
+
+    def test_chained_error_stops_operation(self):
+        self.model.input_digit("5")
+        self.model.set_operation(Operation.DIVIDE)
+        self.model.input_digit("0")
+        self.model.set_operation(Operation.ADD)
+        self.assertEqual(self.model.current_value, "Error")
+        self.model.input_digit("3")
+        self.assertEqual(self.model.current_value, "3")
+
+    def test_display_is_cached(self):
+        self.model.input_digit("7")
+        display = self.model.get_display()
+        self.assertIs(self.model.get_display(), display)
+        self.model.input_digit("1")
+        self.assertEqual(self.model.get_display(), "71")
+
+    def test_backspace(self):
+        for ch in "12.05":
+            self.model.input_digit(ch)
+        expected = ["12.0", "12.", "12", "1", "0", "0"]
+        for display in expected:
+            self.model.backspace()
+            self.assertEqual(self.model.current_value, display)
+        self.model.input_digit("7")
+        self.assertEqual(self.model.current_value, "7")
+
+    def test_backspace_keeps_sign_of_zero(self):
+        for ch in "0.5":
+            self.model.input_digit(ch)
+        self.model.toggle_sign()
+        self.model.backspace()
+        self.assertEqual(self.model.current_value, "-0.")
+        self.model.input_digit("3")
+        self.assertEqual(self.model.current_value, "-0.3")
+        self.model.set_operation(Operation.ADD)
+        self.model.input_digit("1")
+        self.model.calculate()
+        self.assertEqual(self.model.current_value, "0.7")
+
+    def test_backspace_long_entry_and_result(self):
+        self.model.input_digits("9" * 30)
+        self.model.backspace()
+        self.assertEqual(self.model.current_value, "9" * 29)
+        self.model.set_operation(Operation.ADD)
+        self.model.backspace()  # nothing typed yet
+        self.model.input_digit("1")
+        self.model.calculate()
+        result = self.model.current_value
+        self.model.backspace()  # results are not edited
+        self.assertEqual(self.model.current_value, result)
+
+    def test_slots(self):
+        self.assertFalse(hasattr(self.model, '__dict__'))
+
+class TestModelPool(unittest.TestCase):
+    def test_released_models_are_reset_and_reused(self):
+        history = object()
+        pool = ModelPool(history=history)
+        first, second = pool.acquire(), pool.acquire()
+        self.assertIsNot(first, second)
+        self.assertIs(first.history, history)
+        first.input_digit('7')
+        first.set_operation(Operation.ADD)
+        pool.release(first)
+        self.assertEqual(len(pool), 1)
+        again = pool.acquire()
+        self.assertIs(again, first)
+        self.assertEqual(again.get_display(), "0")
+        self.assertEqual(again.pending_operation, Operation.NONE)
+        self.assertEqual(pool.created, 2)
+
 if __name__ == '__main__':
     unittest.main()
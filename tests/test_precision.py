@@ -0,0 +1,100 @@
+import subprocess
+import sys
+import unittest
+from decimal import Decimal
+from fractions import Fraction
+from src.logic import CalculatorModel, Operation
+from src.precision import DecimalEngine, FractionEngine, get_engine
+
+class TestPrecisionEngines(unittest.TestCase):
+    def enter(self, model, text):
+        for ch in text:
+            model.input_digit(ch)
+
+    def test_long_entry_is_kept_exactly(self):
+        model = CalculatorModel()
+        digits = "1234567890" * 5
+        self.enter(model, digits + ".50")
+        self.assertEqual(model.get_display(), digits + ".50")
+        model.toggle_sign()
+        self.assertEqual(model.get_display(), "-" + digits + ".5")
+        model.input_digit("7")
+        self.assertEqual(model.get_display(), "-" + digits + ".57")
+
+    def test_float_engine_rounds_like_before(self):
+        model = CalculatorModel()
+        self.enter(model, "0.1")
+        model.set_operation(Operation.ADD)
+        self.enter(model, "0.2")
+        model.calculate()
+        self.assertEqual(model.get_display(), "0.30000000000000004")
+
+    def test_int_fast_path_stays_exact_for_float_engine(self):
+        model = CalculatorModel()
+        self.enter(model, "461539210")
+        model.set_operation(Operation.MULTIPLY)
+        model.calculate()
+        # Past 2**53 the result must be rounded like a float
+        self.assertEqual(model.get_display(), "213018442367424096")
+
+    def test_decimal_engine(self):
+        model = CalculatorModel(DecimalEngine(precision=50))
+        self.enter(model, "0.1")
+        model.set_operation(Operation.ADD)
+        self.enter(model, "0.2")
+        model.calculate()
+        self.assertEqual(model.get_display(), "0.3")
+        model.reset()
+        self.enter(model, "1")
+        model.set_operation(Operation.DIVIDE)
+        self.enter(model, "9")
+        model.calculate()
+        self.assertEqual(model.get_display(), "0." + "1" * 50)
+
+    def test_decimal_engine_large_operands(self):
+        model = CalculatorModel(get_engine('decimal', precision=100))
+        self.enter(model, "9" * 40)
+        model.set_operation(Operation.ADD)
+        self.enter(model, "1")
+        model.calculate()
+        self.assertEqual(model.get_display(), "1" + "0" * 40)
+        self.assertIsInstance(model.pending_value, Decimal)
+
+    def test_fraction_engine(self):
+        model = CalculatorModel(FractionEngine())
+        self.enter(model, "1")
+        model.set_operation(Operation.DIVIDE)
+        self.enter(model, "3")
+        model.calculate()
+        self.assertEqual(model.get_display(), "1/3")
+        self.assertEqual(model.pending_value, Fraction(1, 3))
+        model.set_operation(Operation.MULTIPLY)
+        self.enter(model, "3")
+        model.calculate()
+        self.assertEqual(model.get_display(), "1")
+        self.assertIs(type(model.pending_value), int)
+        self.enter(model, "5")
+        model.percentage()
+        self.assertEqual(model.get_display(), "0.05")
+
+    def test_division_by_zero(self):
+        for engine in (DecimalEngine(), FractionEngine()):
+            model = CalculatorModel(engine)
+            self.enter(model, "5")
+            model.set_operation(Operation.DIVIDE)
+            self.enter(model, "0.0")
+            model.calculate()
+            self.assertEqual(model.get_display(), "Error")
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            get_engine('quad')
+
+    def test_float_model_does_not_import_exact_types(self):
+        # Keeps decimal and fractions off the app's startup path
+        code = "import sys, src.logic; src.logic.CalculatorModel(); print('fractions' in sys.modules)"
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), 'False')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import os
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+try:
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtGui import QPixmap
+except ImportError:
+    QApplication = None
+
+
+@unittest.skipIf(QApplication is None, "PyQt6 is not installed")
+class TestPixmapCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_hits_and_byte_bound_eviction(self):
+        from src.ui.render_cache import PixmapCache
+        size = 10 * 10 * QPixmap(10, 10).depth() // 8
+        cache = PixmapCache(max_bytes=size * 2)
+        renders = []
+
+        def render():
+            renders.append(1)
+            return QPixmap(10, 10)
+
+        cache.get('a', render)
+        cache.get('a', render)
+        cache.get('b', render)
+        cache.get('c', render)  # evicts 'a'
+        cache.get('a', render)
+        stats = cache.stats()
+        self.assertEqual(len(renders), 4)
+        self.assertEqual((stats.hits, stats.misses, stats.evictions, stats.entries), (1, 4, 2, 2))
+        self.assertLessEqual(stats.bytes, cache.max_bytes)
+        self.assertAlmostEqual(cache.hit_rate, 0.2)
+
+    def test_quantize_scale(self):
+        from src.ui.render_cache import quantize_scale
+        self.assertEqual(quantize_scale(0.9512), 0.95)
+        self.assertEqual(quantize_scale(1.0), 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
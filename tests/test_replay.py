@@ -0,0 +1,28 @@
+import io
+import unittest
+from src.keys import iter_keys, tokenize
+from src.replay import read_chunks, replay, ReplayStats
+
+class TestReplay(unittest.TestCase):
+    def test_tokenize(self):
+        self.assertEqual(tokenize("12 × 3 + 4 ="), ['1', '2', '×', '3', '+', '4', '='])
+        self.assertEqual(tokenize("5+/-AC*/-C"), ['5', '+/-', 'AC', '×', '÷', '−', 'AC'])
+
+    def test_unknown_key(self):
+        with self.assertRaises(ValueError):
+            tokenize("2+q")
+
+    def test_keys_split_across_chunks(self):
+        chunks = ["5+", "/-", "A", "C3+", "/", "-"]
+        self.assertEqual(list(iter_keys(chunks)), ['5', '+/-', 'AC', '3', '+/-'])
+
+    def test_replay_yields_after_equals(self):
+        log = io.StringIO("2+3=\n2+3×4=\n5÷0=\nAC 1.5+/-=\n")
+        stats = ReplayStats()
+        results = list(replay(iter_keys(read_chunks(log, size=3)), stats=stats))
+        self.assertEqual(results, ["5", "20", "Error", "-1.5"])
+        self.assertEqual(stats.results, 4)
+        self.assertEqual(stats.keys, 20)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import asyncio
+import json
+import unittest
+from src.service import CalculatorService, SessionPool, handle_request
+
+def request(pool, **fields):
+    return handle_request(pool, json.dumps(fields).encode('utf-8'))
+
+class TestSessionPool(unittest.TestCase):
+    def test_sessions_keep_chaining_state(self):
+        pool = SessionPool()
+        self.assertEqual(request(pool, session="a", keys="2+3", id=1), {'id': 1, 'display': "3"})
+        self.assertEqual(request(pool, session="b", keys="7×"), {'display': "7"})
+        self.assertEqual(request(pool, session="a", keys="×4=")['display'], "20")
+        self.assertEqual(request(pool, session="a", keys="1", reset=True)['display'], "1")
+
+    def test_bad_requests_leave_session_unchanged(self):
+        pool = SessionPool()
+        request(pool, session="a", keys="12")
+        self.assertIn('error', request(pool, session="a", keys="12 apples", reset=True, id=3))
+        self.assertEqual(request(pool, session="a", keys="")['display'], "12")
+        self.assertIn('error', handle_request(pool, b"not json"))
+        self.assertEqual(request(pool, keys="1", id=4)['id'], 4)
+        self.assertIn('error', request(pool, keys="1", id=4))
+
+    def test_bad_request_creates_no_session(self):
+        pool = SessionPool(max_sessions=1)
+        request(pool, session="a", keys="12")
+        self.assertIn('error', request(pool, session="b", keys="12 apples"))
+        self.assertEqual(list(pool._sessions), ["a"])
+        self.assertEqual(request(pool, session="a", keys="")['display'], "12")
+
+    def test_eviction_reuses_models(self):
+        pool = SessionPool(idle_timeout=10, max_sessions=2)
+        a = pool.get("a", now=0)
+        a.input_digit("5")
+        pool.get("b", now=5)
+        c = pool.get("c", now=6)  # full: "a" is the least recently used
+        self.assertNotIn("a", pool)
+        self.assertIs(c, a)
+        self.assertEqual(c.get_display(), "0")
+        self.assertEqual(pool.evict_idle(now=15.5), 1)  # "b" idle for 10.5s
+        self.assertEqual(list(pool._sessions), ["c"])
+        pool.get("d", now=16)
+        self.assertEqual((pool.created, pool.evicted), (2, 2))
+        request(pool, session="c", keys="1", close=True)
+        self.assertNotIn("c", pool)
+
+class TestService(unittest.TestCase):
+    def test_pipelined_requests_over_tcp(self):
+        async def scenario():
+            service = CalculatorService(SessionPool())
+            ready = asyncio.get_running_loop().create_future()
+            task = asyncio.ensure_future(service.serve(port=0, ready=ready.set_result))
+            server = await ready
+            host, port = server.sockets[0].getsockname()[:2]
+            reader, writer = await asyncio.open_connection(host, port)
+            lines = [{'id': i, 'session': f"s{i % 3}", 'keys': keys}
+                     for i, keys in enumerate(["1", "2", "3", "+1=", "×2=", "÷0="])]
+            writer.write(b''.join(json.dumps(line).encode('utf-8') + b'\n' for line in lines))
+            replies = [json.loads(await reader.readline()) for _ in lines]
+            writer.close()
+            task.cancel()
+            return replies
+        replies = asyncio.run(scenario())
+        self.assertEqual([r['id'] for r in replies], list(range(6)))
+        self.assertEqual([r['display'] for r in replies[3:]], ["2", "4", "Error"])
+
+if __name__ == '__main__':
+    unittest.main()
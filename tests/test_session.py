@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from src.logic import CalculatorModel, Operation
+from src.keys import apply_keys, tokenize
+from src.precision import get_engine
+from src.session import SessionFile, SessionState, decode, encode
+
+class TestSessionFormat(unittest.TestCase):
+    def roundtrip(self, engine, keys, position=(12, -40)):
+        model = CalculatorModel(get_engine(engine))
+        apply_keys(model, tokenize(keys))
+        state = decode(encode(SessionState(engine, model.snapshot(), position)))
+        restored = CalculatorModel(get_engine(engine))
+        restored.restore(state.snapshot)
+        self.assertEqual(state.engine, engine)
+        self.assertEqual(state.position, position)
+        self.assertEqual(restored.snapshot(), model.snapshot())
+        self.assertEqual(restored.get_display(), model.get_display())
+        return restored
+
+    def test_roundtrip(self):
+        for engine in ('float', 'decimal', 'fraction'):
+            self.roundtrip(engine, "12.5 × 3 = + 1.0")
+            self.roundtrip(engine, "1 ÷ 3 × ")
+            self.roundtrip(engine, "1 ÷ 0 =")
+            self.roundtrip(engine, "9" * 40 + " +/-")  # long entry in the digit buffer
+            self.roundtrip(engine, "", position=None)
+        model = self.roundtrip('fraction', "1 ÷ 7 + 2 =")
+        self.assertEqual(model.get_display(), "15/7")
+
+    def test_continues_after_restore(self):
+        model = self.roundtrip('float', "2 + 3")
+        self.assertEqual(model.pending_operation, Operation.ADD)
+        apply_keys(model, tokenize("4 ="))
+        self.assertEqual(model.get_display(), "36")
+
+    def test_rejects_damaged_data(self):
+        data = encode(SessionState('float', CalculatorModel().snapshot(), (1, 2)))
+        for bad in (b'', data[:10], data[:-1], b'X' + data[1:], data[:8] + b'\x02' + data[9:],
+                    data[:-1] + bytes([data[-1] ^ 1])):
+            with self.assertRaises(ValueError):
+                decode(bad)
+
+class TestSessionFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'session')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_load_missing_or_corrupt(self):
+        self.assertIsNone(SessionFile(self.path).load())
+        with open(self.path, 'wb') as f:
+            f.write(b'not a session')
+        self.assertIsNone(SessionFile(self.path).load())
+
+    def test_saves_are_coalesced(self):
+        session = SessionFile(self.path, interval=60)
+        model = CalculatorModel()
+        for key in tokenize("1 2 3 × 4 5 6 = + 7"):
+            apply_keys(model, [key])
+            session.save('float', model.snapshot(), (5, 6))
+        session.flush()
+        session.close()
+        self.assertLessEqual(session.writes, 2)  # the first save, then everything since
+        self.assertEqual(os.listdir(self.tmp.name), ['session'])  # no temporary file left
+        state = SessionFile(self.path).load()
+        self.assertEqual(state.snapshot, model.snapshot())
+        self.assertEqual(state.position, (5, 6))
+
+    def test_unchanged_state_is_not_written(self):
+        session = SessionFile(self.path)
+        model = CalculatorModel()
+        session.save('float', model.snapshot())
+        session.flush()
+        session.save('float', model.snapshot())
+        session.close()
+        self.assertEqual(session.writes, 1)
+
+    def test_write_errors_are_kept(self):
+        session = SessionFile(os.path.join(self.path, 'missing', 'session'))
+        session.save('float', CalculatorModel().snapshot())
+        session.close()
+        self.assertEqual(session.writes, 0)
+        self.assertIsInstance(session.error, OSError)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import json
+import os
+import tempfile
+import unittest
+from src.tracing import Tracer
+
+class TestTracer(unittest.TestCase):
+    def test_disabled_records_nothing(self):
+        tracer = Tracer(capacity=4)
+        with tracer.span('a'):
+            pass
+        tracer.open('b')
+        tracer.close('b')
+        self.assertEqual(tracer.events(), [])
+
+    def test_ring_buffer_keeps_latest(self):
+        tracer = Tracer(capacity=4)
+        tracer.enable()
+        for i in range(10):
+            tracer.record('span', i, i * 1000)
+        self.assertEqual([e[1] for e in tracer.events()], [6, 7, 8, 9])
+
+    def test_percentiles(self):
+        tracer = Tracer(capacity=200)
+        tracer.enable()
+        for ms in range(1, 101):
+            tracer.record('span', 0, ms * 1_000_000)
+        stats = tracer.stats()['span']
+        self.assertEqual(stats.count, 100)
+        self.assertAlmostEqual(stats.p50, 0.050)
+        self.assertAlmostEqual(stats.p95, 0.095)
+        self.assertAlmostEqual(stats.p99, 0.099)
+        self.assertAlmostEqual(stats.max, 0.100)
+
+    def test_open_keeps_first_start(self):
+        tracer = Tracer()
+        tracer.enable()
+        tracer.open('input')
+        tracer.open('input')
+        tracer.close('input')
+        tracer.close('input')
+        self.assertEqual(len(tracer.events()), 1)
+
+    def test_chrome_trace_file(self):
+        tracer = Tracer()
+        tracer.enable()
+        with tracer.span('model.calculate'):
+            pass
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'trace.json')
+            tracer.write_chrome_trace(path)
+            with open(path) as f:
+                trace = json.load(f)
+        event, = trace['traceEvents']
+        self.assertEqual(event['name'], 'model.calculate')
+        self.assertEqual(event['cat'], 'model')
+        self.assertEqual(event['ph'], 'X')
+        self.assertGreaterEqual(event['dur'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import random
+import unittest
+from src.logic import CalculatorModel
+from src.keys import key_actions
+from src.undo import UndoHistory
+
+KEYS = list('0123456789.') * 3 + ['+', '−', '×', '÷', '=', '+/-', '%', 'AC']
+
+class TestUndoHistory(unittest.TestCase):
+    def test_undo_redo_walks_every_state(self):
+        rng = random.Random(5)
+        model = CalculatorModel()
+        history = UndoHistory(model, depth=100)
+        actions = key_actions(model)
+        displays = [model.get_display()]
+        for _ in range(60):
+            history.record()
+            actions[rng.choice(KEYS)]()
+            displays.append(model.get_display())
+        seen = [model.get_display()]
+        while history.undo():
+            seen.append(model.get_display())
+        # Steps that did not change the state were not recorded
+        self.assertEqual(seen[-1], "0")
+        self.assertTrue(set(seen) <= set(displays))
+        while history.redo():
+            pass
+        self.assertEqual(model.get_display(), displays[-1])
+
+    def test_long_entry_buffer_is_not_shared(self):
+        model = CalculatorModel()
+        history = UndoHistory(model)
+        model.input_digits("1" * 40)
+        history.record()
+        model.input_digit("2")
+        history.record()
+        model.backspace()
+        history.record()
+        model.toggle_sign()
+        self.assertEqual(model.get_display(), "-" + "1" * 40)
+        history.undo()
+        self.assertEqual(model.get_display(), "1" * 40)
+        history.undo()
+        self.assertEqual(model.get_display(), "1" * 40 + "2")
+        history.undo()
+        history.record()
+        model.input_digit("3")  # appends to a copy, not to the buffer the redo state had
+        self.assertEqual(model.get_display(), "1" * 40 + "3")
+        self.assertFalse(history.can_redo)
+        history.undo()
+        self.assertEqual(model.get_display(), "1" * 40)
+
+    def test_depth_is_bounded(self):
+        model = CalculatorModel()
+        history = UndoHistory(model, depth=3)
+        for digit in "12345":
+            history.record()
+            model.input_digit(digit)
+        self.assertEqual(len(history), 3)
+        while history.undo():
+            pass
+        self.assertEqual(model.get_display(), "12")
+
+    def test_error_state_is_restored(self):
+        model = CalculatorModel()
+        history = UndoHistory(model)
+        for key in "5÷0":
+            history.record()
+            key_actions(model)[key]()
+        history.record()
+        model.calculate()
+        self.assertEqual(model.get_display(), "Error")
+        history.undo()
+        self.assertEqual(model.get_display(), "0")
+        history.redo()
+        self.assertEqual(model.get_display(), "Error")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import random
+import unittest
+from src.logic import CalculatorModel, Operation, format_number
+from src.keys import apply_keys
+
+try:
+    import numpy as np
+    from src.vectorized import BatchCalculatorModel, KEY_CODES, parse_operands, sweep
+except ImportError:
+    np = None
+
+
+def random_keys(rng, length):
+    # Entries stay short so typed values never reach exponent notation
+    keys = []
+    run = 0
+    for _ in range(length):
+        if run < 4 and rng.random() < 0.55:
+            keys.append(rng.choice('0123456789.'))
+            run += 1
+        else:
+            keys.append(rng.choice(['+', '−', '×', '÷', '=', '+/-', '%', 'AC', '=', '÷']))
+            run = 0
+    return keys
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestBatchCalculatorModel(unittest.TestCase):
+    def test_broadcast_operations(self):
+        batch = BatchCalculatorModel(3)
+        batch.input_digit(np.array([2, 5, 1]))
+        batch.set_operation(Operation.DIVIDE)
+        batch.input_digit(np.array([4, 0, 3]))
+        batch.calculate()
+        self.assertEqual(batch.displays(), ["0.5", "Error", "0.3333333333333333"])
+        self.assertEqual(batch.error_state.tolist(), [False, True, False])
+
+    def test_chain_operations(self):
+        batch = BatchCalculatorModel(1)
+        batch.input_digit(2)
+        batch.set_operation(Operation.ADD)
+        batch.input_digit(3)
+        batch.set_operation(Operation.MULTIPLY)
+        self.assertEqual(batch.get_display(0), "5")
+        batch.input_digit(4)
+        batch.calculate()
+        self.assertEqual(batch.get_display(0), "20")
+
+    def test_matches_scalar_model(self):
+        rng = random.Random(1234)
+        sessions, length = 300, 40
+        streams = [random_keys(rng, length) for _ in range(sessions)]
+        batch = BatchCalculatorModel(sessions)
+        for step in range(length):
+            batch.step(np.array([KEY_CODES[s[step]] for s in streams]))
+            if step % 10 == 9:
+                expected = [apply_keys(CalculatorModel(), s[:step + 1]) for s in streams]
+                self.assertEqual(batch.displays(), expected)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestSweep(unittest.TestCase):
+    def test_parse_operands(self):
+        self.assertEqual(parse_operands("1:5").tolist(), [1, 2, 3, 4, 5])
+        self.assertEqual(parse_operands("0:1:0.1")[3], 0.3)
+        self.assertEqual(parse_operands("-1:1:0.75").tolist(), [-1, -0.25, 0.5])
+        self.assertEqual(parse_operands("2.5, -3 ,10").tolist(), [2.5, -3, 10])
+        for text in ("", "1:", "1:5:0", "5:1", "1:2:3:4", "a, b", "1e5"):
+            with self.assertRaises(ValueError, msg=text):
+                parse_operands(text)
+
+    def test_matches_scalar_model(self):
+        def enter(model, text):
+            model.input_digits(text.lstrip('-'))
+            if text.startswith('-'):
+                model.toggle_sign()
+
+        operands = ["-12.5", "-3", "-0.1", "0", "0.3", "1", "7", "1234567.89", "9007199254740993"]
+        for pending in ("1.19", "0", "3", "-2.5"):
+            for op in (Operation.ADD, Operation.SUBTRACT, Operation.MULTIPLY, Operation.DIVIDE):
+                model = CalculatorModel()
+                enter(model, pending)
+                model.set_operation(op)
+                results, errors = sweep(model.pending_value, op, parse_operands(", ".join(operands)))
+                for operand, result, error in zip(operands, results.tolist(), errors.tolist()):
+                    expected = CalculatorModel()
+                    enter(expected, pending)
+                    expected.set_operation(op)
+                    enter(expected, operand)
+                    expected.calculate()
+                    self.assertEqual("Error" if error else format_number(result), expected.get_display(),
+                                     (pending, op, operand))
+
+if __name__ == '__main__':
+    unittest.main()
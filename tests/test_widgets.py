@@ -0,0 +1,424 @@
+import os
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+try:
+    from PyQt6.QtWidgets import QApplication
+except ImportError:
+    QApplication = None
+
+
+@unittest.skipIf(QApplication is None, "PyQt6 is not installed")
+class TestDisplayUpdates(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_scheduler_delivers_last_value_once(self):
+        from src.ui.widgets import DisplayUpdateScheduler
+        scheduler = DisplayUpdateScheduler()
+        delivered = []
+        scheduler.flushed.connect(lambda text, animate: delivered.append((text, animate)))
+        for text in ("1", "12", "123", "1234", "12345", "123456"):
+            scheduler.schedule(text)
+        scheduler.flush()
+        scheduler.flush()
+        self.assertEqual(len(delivered), 1)
+        self.assertEqual(delivered[0][0], "123456")
+        self.assertTrue(scheduler.fast_input)
+        self.assertFalse(delivered[0][1])
+
+    def test_display_shows_latest_text(self):
+        from src.ui.widgets import DisplayLabel
+        display = DisplayLabel()
+        display.set_text("4")
+        display.scheduler.flush()  # slow input: fades out, then shows the newest text
+        for text in ("45", "456"):
+            display.set_text(text)
+        self.assertEqual(display.text(), "456")
+        display.scheduler.flush()
+        display.anim_out.setCurrentTime(display.anim_out.duration())
+        self.assertEqual(display.main_label.text(), "456")
+
+    def test_button_reuses_animation(self):
+        from src.ui import styles
+        from src.ui.widgets import CalculatorButton
+        button = CalculatorButton('5', styles.COLOR_BTN_NUM, styles.COLOR_TEXT_WHITE)
+        from PyQt6.QtCore import QEasingCurve
+        button._animate_scale(100, 1.0, 0.95, QEasingCurve.Type.OutQuad)
+        first = button.anim
+        button._animate_scale(300, 0.95, 1.0, QEasingCurve.Type.OutElastic)
+        self.assertIs(button.anim, first)
+
+    def test_performance_mode_repaints_only_the_button(self):
+        from src.ui import styles
+        from src.ui.mainwindow import MainWindow
+        from src.ui.repaint_stats import repaint_stats
+        saved, styles.RENDER_MODE = styles.RENDER_MODE, "performance"
+        try:
+            window = MainWindow()
+        finally:
+            styles.RENDER_MODE = saved
+        window.show()
+        self.app.processEvents()
+        button = window.buttons['5']
+        repaint_stats.reset()
+        for scale in (0.99, 0.98, 0.97):
+            button.scale_factor = scale
+            self.app.processEvents()
+        window.close()
+        self.assertNotIn('MainWindow', repaint_stats.events)
+        self.assertEqual(repaint_stats.events['CalculatorButton'], 3)
+        self.assertLessEqual(repaint_stats.total_pixels(), 3 * button.width() * button.height())
+
+    def test_traced_input_ends_at_display_paint(self):
+        from src.tracing import tracer
+        from src.ui.mainwindow import MainWindow
+        tracer.enable()
+        try:
+            window = MainWindow()
+            window.show()
+            self.app.processEvents()
+            window.on_digit('7')
+            window.display.scheduler.flush()
+            self.assertNotIn('input', tracer.stats())  # still fading out the old text
+            display = window.display
+            display.anim_out.setCurrentTime(display.anim_out.duration())
+            display.anim_in.setCurrentTime(display.anim_in.duration() // 2)  # nothing is drawn at opacity 0
+            display.main_label.repaint()
+            stats = tracer.stats()
+        finally:
+            tracer.disable()
+        window.close()
+        self.assertEqual(stats['input'].count, 1)
+        self.assertEqual(stats['model.input_digit'].count, 1)
+
+    def test_keyboard_and_paste(self):
+        from PyQt6.QtCore import Qt
+        from PyQt6.QtTest import QTest
+        from src.ui.mainwindow import MainWindow
+        window = MainWindow()
+        QTest.keyClicks(window, "12*3")
+        QTest.keyClick(window, Qt.Key.Key_Backspace)
+        QTest.keyClicks(window, "4")
+        QTest.keyClick(window, Qt.Key.Key_Return)
+        self.assertEqual(window.model.get_display(), "48")
+        ctrl = Qt.KeyboardModifier.ControlModifier
+        QTest.keyClick(window, Qt.Key.Key_Z, ctrl)
+        self.assertEqual(window.model.get_display(), "4")
+        QTest.keyClick(window, Qt.Key.Key_Z, ctrl | Qt.KeyboardModifier.ShiftModifier)
+        self.assertEqual(window.model.get_display(), "48")
+
+        updates = []
+        window.display.set_text = updates.append
+        window.paste_text("AC " + "1+" * 50_000 + "0=")
+        while window._paste_steps is not None:
+            self.app.processEvents()
+        self.assertEqual(window.model.get_display(), "50000")
+        self.assertEqual(updates, ["50000"])
+        window.paste_text("not a number")
+        self.assertEqual(window.model.get_display(), "50000")
+
+    def test_history_view_reads_rows_on_demand(self):
+        import tempfile
+        from src.history import HistoryTape
+        from src.ui.mainwindow import MainWindow
+        with tempfile.TemporaryDirectory() as tmp:
+            tape = HistoryTape(os.path.join(tmp, 'history.tape'), capacity=3)
+            window = MainWindow(tape)
+            window.toggle_history()
+            self.assertFalse(window.keypad.isVisibleTo(window))
+            model = window.history_view.model()
+            for _ in range(5):
+                window.paste_text("2×3=")
+            self.assertEqual(model.rowCount(), 3)
+            self.assertEqual(model.data(model.index(2, 1)), "2 × 3")
+            self.assertEqual(model.data(model.index(2, 2)), "6")
+            tape._map[64 + 128 * ((tape.total - 1) % tape.capacity) + 8] = 200  # tear the newest record
+            model._cached = (None, None)
+            self.assertEqual([model.data(model.index(2, c)) for c in range(3)], ["", "unreadable record", ""])
+            window.toggle_history()
+            self.assertTrue(window.keypad.isVisibleTo(window))
+            window.close()
+            tape.close()
+
+    def test_worker_queues_input_and_cancels_on_clear(self):
+        from unittest import mock
+        from PyQt6.QtCore import Qt
+        from PyQt6.QtTest import QTest
+        from src.ui import styles
+        from src.logic import Operation
+        from src.ui.mainwindow import MainWindow
+        window = MainWindow()
+        with mock.patch.object(styles, 'WORKER_MIN_BITS', 0):  # every operation goes to the worker
+            QTest.keyClicks(window, "6*7")
+            QTest.keyClick(window, Qt.Key.Key_Return)
+            self.assertTrue(window.executor.running)
+            QTest.keyClicks(window, "+1=")  # queued behind the running job
+            for _ in range(3000):
+                if not window.executor.running and not window._queued:
+                    break
+                QTest.qWait(10)
+            self.assertEqual(window.model.get_display(), "43")
+
+            window.on_operation(Operation.ADD)
+            self.assertTrue(window.executor.running)
+            job = window.executor._job
+            QTest.keyClick(window, Qt.Key.Key_5)
+            window.on_clear()
+            self.assertFalse(window.executor.running)
+            self.assertEqual(window._queued, [])
+            window.executor._on_result(job, None)  # a late result is dropped
+            self.assertEqual(window.model.get_display(), "0")
+        window.close()
+
+    def test_worker_death_shows_error(self):
+        from unittest import mock
+        from PyQt6.QtTest import QTest
+        from src.ui import styles
+        from src.ui.mainwindow import MainWindow
+        window = MainWindow()
+        with mock.patch.object(styles, 'WORKER_MIN_BITS', 0), mock.patch('sys.stderr'):
+            QTest.keyClicks(window, "6*")
+            self.assertTrue(window.executor.running)
+            window.executor._worker._process.kill()
+            for _ in range(3000):
+                if not window.executor.running:
+                    break
+                QTest.qWait(10)
+            self.assertFalse(window.executor.running)
+            self.assertEqual(window.model.get_display(), "Error")
+            QTest.keyClicks(window, "7")
+            self.assertEqual(window.model.get_display(), "7")
+        window.close()
+
+    def test_sweep_table(self):
+        import tempfile
+        import time
+        from PyQt6.QtCore import Qt
+        from src.vectorized import parse_operands
+        from src.ui.mainwindow import MainWindow
+        window = MainWindow()
+        window.paste_text("1.19×")
+        start = time.perf_counter()
+        window.show_sweep(parse_operands("1:1000000"))
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertFalse(window.keypad.isVisibleTo(window))
+        model = window.sweep_view.model()
+        self.assertEqual(model.rowCount(), 1_000_000)
+        self.assertEqual(model.headerData(1, Qt.Orientation.Horizontal), "1.19 × x")
+        self.assertEqual(model.data(model.index(99, 1)), "119")
+
+        window.paste_text("AC 5÷")
+        window.show_sweep(parse_operands("-1:1"))
+        model = window.sweep_view.model()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'table.csv')
+            model.write_csv(path)
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(f.read().splitlines(), ["x,5 ÷ x", "-1,-5", "0,Error", "1,5"])
+        window.toggle_sweep()
+        self.assertTrue(window.keypad.isVisibleTo(window))
+        window.close()
+
+    def test_display_fits_long_text(self):
+        from src.ui import styles
+        from src.ui.widgets import DisplayLabel
+        display = DisplayLabel()
+        display.resize(340, 180)
+        display.show()
+        available = 340 - 20
+        fitter = display.fitter
+
+        def show(text):
+            display._show_text(text, False)
+            return display.main_label.text(), display.main_label.font().pixelSize()
+
+        self.assertEqual(show("12"), ("12", styles.FONT_SIZE_DISPLAY_MAIN))
+        text, size = show("0.3333333333333333")
+        self.assertEqual(text, "0.3333333333333333")
+        self.assertLess(size, styles.FONT_SIZE_DISPLAY_MAIN)
+        self.assertLessEqual(fitter.width(text, size), available)
+        text, size = show("1" * 300)
+        self.assertTrue(text.startswith("1.1") and text.endswith("e299"), text)
+        self.assertLessEqual(fitter.width(text, size), available)
+        self.assertTrue(show("2/3" + "0" * 200)[0].startswith("6.6"))
+        show("1" * 100000 + "." + "5" * 100000)
+        self.assertLess(max(len(repr(key)) for key in fitter._widths), 200)  # keys hold runs, not text
+        self.assertEqual(show("Error")[0], "Error")
+
+        # Same shape, same size: answered from the width cache
+        size = show("0.3333333333333333")[1]
+        misses = fitter.cache_info().misses
+        self.assertEqual(show("0.1428571428571428")[1], size)
+        self.assertEqual(fitter.cache_info().misses, misses)
+
+        display.resize(200, 180)  # narrower: the shown text is fitted again
+        self.assertLessEqual(fitter.width(display.main_label.text(), display.main_label.font().pixelSize()), 180)
+        display.close()
+
+    def _window(self, keypad, render="quality"):
+        from src.ui import styles
+        from src.ui.mainwindow import MainWindow
+        saved = styles.KEYPAD_MODE, styles.RENDER_MODE
+        styles.KEYPAD_MODE, styles.RENDER_MODE = keypad, render
+        try:
+            window = MainWindow()
+        finally:
+            styles.KEYPAD_MODE, styles.RENDER_MODE = saved
+        window.show()
+        self.app.processEvents()
+        return window
+
+    def test_painted_keypad_matches_buttons(self):
+        from PyQt6.QtCore import QPoint
+        widgets, painted = self._window("widgets"), self._window("painted")
+        self.assertEqual(painted.keypad.geometry(), widgets.keypad.geometry())
+        self.assertEqual(painted.grab().toImage(), widgets.grab().toImage())
+        # The hit grid agrees with CalculatorButton.hitButton on every pixel
+        keypad = painted.keypad
+        buttons = {button: text for text, button in widgets.buttons.items()}
+        for y in range(keypad.height()):
+            for x in range(keypad.width()):
+                button = widgets.keypad.childAt(x, y)
+                expected = None
+                if button is not None and button.hitButton(button.mapFrom(widgets.keypad, QPoint(x, y))):
+                    expected = buttons[button]
+                key = keypad.key_at(x, y)
+                self.assertEqual(key.name if key is not None else None, expected, (x, y))
+        widgets.close()
+        painted.close()
+
+    def test_painted_keypad_clicks_and_repaints_one_key(self):
+        from PyQt6.QtCore import Qt, QPoint
+        from PyQt6.QtTest import QTest
+        from src.ui.repaint_stats import repaint_stats
+        window = self._window("painted", "performance")
+        keypad = window.keypad
+
+        def click(text):
+            key = window.buttons[text]
+            QTest.mouseClick(keypad, Qt.MouseButton.LeftButton, pos=key.rect.center())
+        for text in ("7", "×", "6", "="):
+            click(text)
+        window.display.scheduler.flush()
+        self.assertEqual(window.display.text(), "42")
+        self.assertEqual(window.buttons['AC'].text(), "C")
+        QTest.mouseClick(keypad, Qt.MouseButton.LeftButton, pos=QPoint(80, 10))  # between keys
+        self.assertEqual(window.display.text(), "42")
+
+        keypad.anim.stop()
+        window.display._show_text(window.display.text(), False)  # ends a running fade
+        self.app.processEvents()
+        key = window.buttons['5']
+        keypad._animated = key
+        repaint_stats.reset()
+        for scale in (0.99, 0.98, 0.97):
+            keypad._set_scale(scale)
+            self.app.processEvents()
+        window.close()
+        self.assertNotIn('MainWindow', repaint_stats.events)
+        self.assertEqual(repaint_stats.events['PaintedKeypad'], 3)
+        self.assertLessEqual(repaint_stats.total_pixels(), 3 * (key.rect.width() + 2) * (key.rect.height() + 2))
+
+    def test_session_restored_before_first_paint(self):
+        import tempfile
+        from src.ui.mainwindow import MainWindow
+        from src.session import SessionFile
+        from src.precision import get_engine
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'session')
+            window = MainWindow(session=SessionFile(path))
+            for key in "12×3+4":
+                window.key_handlers[key]()
+            window.move(37, 41)
+            window.close()
+
+            window = MainWindow(session=SessionFile(path))
+            self.assertEqual(window.display.main_label.text(), "4")  # without waiting for a frame
+            self.assertEqual(window.buttons['AC'].text(), "C")
+            self.assertEqual((window.x(), window.y()), (37, 41))
+            window.on_equals()
+            self.assertEqual(window.model.get_display(), "40")
+            window.close()
+
+            # Another engine's numbers are not restored; the position is
+            window = MainWindow(session=SessionFile(path), engine=get_engine('fraction'))
+            self.assertEqual(window.model.get_display(), "0")
+            self.assertEqual(window.buttons['AC'].text(), "AC")
+            self.assertEqual((window.x(), window.y()), (37, 41))
+            window.close()
+
+    def test_window_manager_shares_pool_and_caches(self):
+        import socket
+        import tempfile
+        import threading
+        from src.instance import request_window
+        from PyQt6.QtCore import QPoint
+        from src.ui import styles
+        from src.ui.windows import WindowManager
+        manager = WindowManager()
+        first = manager.open_window()
+        second = manager.open_window()
+        self.assertIsNot(first.model, second.model)
+        self.assertEqual(second.pos() - first.pos(), QPoint(styles.WINDOW_CASCADE, styles.WINDOW_CASCADE))
+        self.assertIs(first.display.fitter, second.display.fitter)
+        self.assertEqual(first.buttons['5'].font(), second.buttons['5'].font())
+        first.key_handlers['7']()
+        self.assertEqual(second.model.get_display(), "0")  # independent calculators
+
+        model = second.model
+        second.close()
+        self.assertEqual(manager.windows, [first])
+        third = manager.open_window()
+        self.assertIs(third.model, model)  # reused, and reset
+        self.assertEqual(third.model.get_display(), "0")
+
+        # A later launch asks the running instance for a window
+        with tempfile.TemporaryDirectory() as tmp:
+            address = os.path.join(tmp, 'calculator.sock')
+            self.assertFalse(request_window(address))
+            self.assertTrue(manager.listen(address))
+            replies = []
+            client = threading.Thread(target=lambda: replies.append(request_window(address, timeout=5)))
+            client.start()
+            while client.is_alive():
+                self.app.processEvents()
+            self.assertEqual(replies, [True])
+            self.assertEqual(len(manager.windows), 3)
+
+            # A second launch racing the first leaves its socket alone
+            racer = WindowManager()
+            self.assertFalse(racer.listen(address))
+            self.assertTrue(os.path.exists(address))
+            racer.close()
+            manager.close()
+            self.assertFalse(os.path.exists(address))
+
+            # A socket file nobody listens on is taken over
+            stale = socket.socket(socket.AF_UNIX)
+            stale.bind(address)
+            stale.close()
+            self.assertTrue(manager.listen(address))
+            manager.close()
+        for window in list(manager.windows):
+            window.close()
+        self.assertEqual(manager.windows, [])
+
+    def test_window_closed_mid_paste_returns_a_fresh_model(self):
+        from src.ui.windows import WindowManager
+        manager = WindowManager()
+        window = manager.open_window()
+        window.paste_text("1+" * 300_000 + "1=")
+        self.assertIsNotNone(window._paste_steps)  # still running
+        model = window.model
+        window.close()
+        for _ in range(20):
+            self.app.processEvents()
+        window = manager.open_window()
+        self.assertIs(window.model, model)
+        self.assertEqual(window.model.get_display(), "0")
+        window.close()
+
+if __name__ == '__main__':
+    unittest.main()